@@ -13,10 +13,30 @@ bl_info = {
 
 import bpy
 import bmesh
+import math
 from bpy.types import Mesh
 from bpy.props import StringProperty
 from . import bp_functions
 from . import bp_modifiers
+from . import bp_cost
+from . import bp_freeze
+from . import bp_cache
+from . import bp_migrate
+from . import bp_autochamfer
+from . import bp_autouv
+from . import bp_panels
+from . import bp_normals
+from . import bp_chains
+from . import bp_spline
+from . import bp_inventory
+from . import bp_stack
+from . import bp_flags
+from . import bp_transfer
+from . import bp_brush
+from . import bp_queue
+from . import bp_macro
+from . import bp_nodegroups
+from . import bp_reorder
 
 # --- globals ---
 _suppress_update = False
@@ -52,6 +72,44 @@ def depsgraph_update(_depsgraph):
             _suppress_update = False
 
 
+# --- depsgraph handler for invalidating cached mesh data ---
+@bpy.app.handlers.persistent
+def depsgraph_update_caches(scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object) and update.is_updated_geometry:
+            bp_cost.invalidate(update.id.original.name)
+            bp_cache.invalidate(update.id.original.name)
+            bp_chains.invalidate(update.id.original.name)
+            bp_brush.invalidate(update.id.original.name)
+
+    bp_freeze.on_depsgraph_update(scene, depsgraph)
+    bp_autouv.on_depsgraph_update(scene, depsgraph)
+    bp_spline.on_depsgraph_update(scene, depsgraph)
+    bp_inventory.on_depsgraph_update(scene, depsgraph)
+    bp_reorder.on_depsgraph_update(scene, depsgraph)
+
+@bpy.app.handlers.persistent
+def load_post_caches(_filepath):
+    bp_cost.invalidate()
+    bp_chains.invalidate()
+    bp_brush.invalidate()
+    bp_freeze.on_load_post()
+    bp_cache.on_load_post(bpy.context.scene)
+    bp_inventory.on_load_post(bpy.context.scene)
+    bp_queue.on_load_post()
+    bp_macro.on_load_post()
+    bp_nodegroups.on_load_post()
+
+@bpy.app.handlers.persistent
+def save_pre_caches(_filepath):
+    bp_inventory.on_save_pre(bpy.context.scene)
+    bp_cache.on_save_pre(bpy.context.scene)
+    bp_nodegroups.on_save_pre()
+
+@bpy.app.handlers.persistent
+def save_post_caches(_filepath):
+    bp_cache.on_save_post(bpy.context.scene)
+
 # --- property update callback factory ---
 def make_update_callback(attr):
     def callback(self, context):
@@ -66,6 +124,17 @@ def make_update_callback(attr):
 
     return callback
 
+def update_edgechamfer_angle(self, context):
+    #Keep the scene key add_mod_edgeChamfer reads in sync, then re-bake live
+    context.scene["BP_settings_edgechamfer_angle"] = math.degrees(self.edgechamfer_angle)
+    bp_autochamfer.rebake_scene(context.scene, self.edgechamfer_angle)
+
+def make_stack_update(setting):
+    def callback(self, context):
+        bp_stack.propagate(context.scene, [setting])
+
+    return callback
+
 # --- PropertyGroup ---
 class EdgeProps(bpy.types.PropertyGroup):
     bevel_weight_edge_slider: bpy.props.FloatProperty(
@@ -78,6 +147,79 @@ class EdgeProps(bpy.types.PropertyGroup):
         min=0.0, soft_max=100.0, default=0.0, precision=2, subtype='PERCENTAGE',
         update=make_update_callback("bp_bevel_fillet_weighted")
     ) # type: ignore
+    edgechamfer_angle: bpy.props.FloatProperty(
+        name="Angle",
+        description="Edges sharper than this get an edge chamfer when auto-chamfer is baked",
+        min=0.0, max=math.pi, default=math.radians(30), subtype='ANGLE',
+        update=update_edgechamfer_angle
+    ) # type: ignore
+    estimate_warn_triangles: bpy.props.IntProperty(
+        name="Warn Above",
+        description="Warn before adding a stack estimated to produce more triangles than this on one object",
+        min=0, default=2000000
+    ) # type: ignore
+
+class CacheProps(bpy.types.PropertyGroup):
+    use_cache: bpy.props.BoolProperty(
+        name="Disk Cache",
+        description="Store evaluated BP geometry on save and show it right away when the file is opened",
+        default=True
+    ) # type: ignore
+    location: bpy.props.EnumProperty(
+        name="Location",
+        items=[
+            ('BLEND', "Next to .blend", "Store entries in a .bp_cache folder next to the .blend file"),
+            ('DIRECTORY', "Directory", "Store entries in a shared cache directory"),
+        ],
+        default='BLEND'
+    ) # type: ignore
+    directory: bpy.props.StringProperty(
+        name="Directory",
+        subtype='DIR_PATH',
+        default=""
+    ) # type: ignore
+    max_size_mb: bpy.props.IntProperty(
+        name="Max Size (MB)",
+        description="Least recently used entries are removed above this size",
+        min=1, default=1024
+    ) # type: ignore
+
+class StackProps(bpy.types.PropertyGroup):
+    edge_chamfer_size: bpy.props.FloatProperty(
+        name="Chamfer Size",
+        min=0.001, soft_max=0.1, default=0.01, subtype='DISTANCE', unit='LENGTH',
+        update=make_stack_update("edge_chamfer_size")
+    ) # type: ignore
+    edge_chamfer_segments: bpy.props.IntProperty(
+        name="Chamfer Segments",
+        min=1, soft_max=4, default=2,
+        update=make_stack_update("edge_chamfer_segments")
+    ) # type: ignore
+    weighted_fillet_size: bpy.props.FloatProperty(
+        name="Fillet Size",
+        min=0.0, soft_max=10.0, default=0.5, subtype='DISTANCE', unit='LENGTH',
+        update=make_stack_update("weighted_fillet_size")
+    ) # type: ignore
+    weighted_fillet_segments: bpy.props.IntProperty(
+        name="Fillet Segments",
+        min=1, soft_max=20, default=6,
+        update=make_stack_update("weighted_fillet_segments")
+    ) # type: ignore
+    constrained_fillet_segments: bpy.props.IntProperty(
+        name="Constrained Segments",
+        min=1, soft_max=20, default=12,
+        update=make_stack_update("constrained_fillet_segments")
+    ) # type: ignore
+    panel_thickness: bpy.props.FloatProperty(
+        name="Panel Thickness",
+        min=0.0, soft_max=0.1, default=0.02, subtype='DISTANCE', unit='LENGTH',
+        update=make_stack_update("panel_thickness")
+    ) # type: ignore
+    subd_levels: bpy.props.IntProperty(
+        name="SubD Levels",
+        min=1, soft_max=4, default=2,
+        update=make_stack_update("subd_levels")
+    ) # type: ignore
 
 # ---------------- Add Modifiers -----------------
 class OBJECT_OT_add_modifiers(bpy.types.Operator):
@@ -171,11 +313,42 @@ class OBJECT_OT_add_modifiers(bpy.types.Operator):
         min=1,
         soft_max=4)# type: ignore
 
+    addSplineFillet: bpy.props.BoolProperty(name="Spline Fillet",
+        description="Sweep tubes along chains of flagged edges, traced once into a cached curve",
+        default=False) # type: ignore
+
+    splineFilletAttribute: bpy.props.EnumProperty(name="Edges",
+        description="Flagged edges the spline fillet follows",
+        items=[(name, label, f"Follow {name} edges") for name, label in bp_chains.CHAIN_ATTRIBUTES.items()],
+        default="bp_bevel_fillet_constrained") # type: ignore
+
+    splineFilletRadius: bpy.props.FloatProperty(name="Radius",
+        description="Spline Fillet Radius",
+        default=0.01,
+        min=0.0,
+        soft_max=0.1,
+        subtype='DISTANCE',
+        unit='LENGTH') # type: ignore
+
+    splineFilletSegments: bpy.props.IntProperty(name="Segments",
+        description="Spline Fillet Corner Segments",
+        default=4,
+        min=1,
+        soft_max=12)# type: ignore
+
+    allowHeavyStack: bpy.props.BoolProperty(name="Allow Heavy Stack",
+        description="Add the stack even if the estimated triangle count is above the warning limit",
+        default=False) # type: ignore
+
 
     def execute(self, context):
-        bp_functions.add_modifiers(self)
-        self.report({'INFO'}, "Added planar modifiers")
-        return {'FINISHED'}
+        #Warn before the new settings blow up the mesh
+        estimated = bp_cost.estimate_planned_triangles(self, context.selected_objects)
+        if estimated > context.scene.edge_props.estimate_warn_triangles and not self.allowHeavyStack:
+            self.report({'WARNING'}, f"Stack estimated at {estimated:,} triangles, enable Allow Heavy Stack to add it")
+            return {'FINISHED'}
+
+        return bp_functions.add_modifiers(self)
     
     def invoke(self, context, event):
         if event.shift:
@@ -183,6 +356,9 @@ class OBJECT_OT_add_modifiers(bpy.types.Operator):
         else:
             self.simplifiedStack = False
 
+        #New stacks start from the scene settings
+        bp_stack.preset_operator(self, context.scene)
+
         return self.execute(context)
     
     def draw(self, context):
@@ -230,8 +406,27 @@ class OBJECT_OT_add_modifiers(bpy.types.Operator):
 
             layout.separator()
 
+            layout.prop(self, "addSplineFillet")
+            col = self.layout.column (align=True)
+            col.enabled = self.addSplineFillet
+            col.prop(self, "splineFilletAttribute")
+            row = col.row (align=True)
+            row.prop(self, "splineFilletRadius", slider=True)
+            row.prop(self, "splineFilletSegments")
+
+            layout.separator()
+
             layout.label(text="Experimental: ")
             layout.prop(self, "addAutoUV")
+
+        layout.separator()
+
+        estimated = bp_cost.estimate_planned_triangles(self, context.selected_objects)
+        row = layout.row()
+        row.alert = estimated > context.scene.edge_props.estimate_warn_triangles
+        row.label(text=f"Estimated: {estimated:,} tris", icon="ERROR" if row.alert else "INFO")
+        if row.alert:
+            layout.prop(self, "allowHeavyStack")
             
 
 # ---------------- Modifier Visibility -----------------  
@@ -242,9 +437,372 @@ class OBJECT_OT_mods_visibility(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        bp_functions.toggle_modifier_visibility(self)
-        return {'FINISHED'}
+        return bp_functions.toggle_modifier_visibility(self)
     
+# ---------------- Batch Queue -----------------
+class OBJECT_OT_cancel_batch(bpy.types.Operator):
+    bl_idname = "bp.cancel_batch"
+    bl_label = "Cancel Batch"
+    bl_description = "Stop the running batch job after its current object and drop the queued ones"
+
+    def execute(self, context):
+        bp_queue.cancel()
+        return {'FINISHED'}
+
+# ---------------- Macros -----------------
+class OBJECT_OT_record_macro(bpy.types.Operator):
+    bl_idname = "bp.record_macro"
+    bl_label = "Record BP Macro"
+    bl_description = "Start recording BP operations, run again to stop and store them as a JSON macro text"
+
+    macroName: bpy.props.StringProperty(name="Macro", default=bp_macro.MACRO_TEXT) # type: ignore
+
+    def execute(self, context):
+        return bp_macro.record_macro(self, context)
+
+class OBJECT_OT_play_macro(bpy.types.Operator):
+    bl_idname = "bp.play_macro"
+    bl_label = "Play BP Macro"
+    bl_description = "Replay a recorded BP macro on every selected object in one batch"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    macroName: bpy.props.StringProperty(name="Macro", description="Text block holding the macro", default=bp_macro.MACRO_TEXT) # type: ignore
+    filepath: bpy.props.StringProperty(name="File", description="Macro JSON file, used instead of the text block when set", subtype='FILE_PATH') # type: ignore
+
+    def execute(self, context):
+        return bp_macro.play_macro_operator(self, context)
+
+# ---------------- Node Group Cleanup -----------------
+class OBJECT_OT_clean_nodegroups(bpy.types.Operator):
+    bl_idname = "bp.clean_nodegroups"
+    bl_label = "Clean BP Node Groups"
+    bl_description = "Remap duplicate and leftover temp BP node groups to one copy each and remove the unused ones"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        return bp_nodegroups.clean_nodegroups(self, context)
+
+# ---------------- Stack Order -----------------
+class OBJECT_OT_optimize_stack(bpy.types.Operator):
+    bl_idname = "bp.optimize_stack"
+    bl_label = "Optimize Stack Order"
+    bl_description = "Time the possible orders of the SubD, fillet and panel stages and keep the fastest one giving the same result, idle stages get folded out"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    maxCandidates: bpy.props.IntProperty(name="Candidates",
+        description="Orders with the lowest estimated triangle count that get evaluated and timed",
+        default=8, min=1, max=24) # type: ignore
+    repeats: bpy.props.IntProperty(name="Repeats",
+        description="Evaluations timed per order, the median is used",
+        default=3, min=1, max=20) # type: ignore
+    tolerance: bpy.props.FloatProperty(name="Tolerance",
+        description="Largest distance between matching vertices for two orders to count as the same result",
+        default=0.0001, min=0.0, precision=5, subtype='DISTANCE') # type: ignore
+    foldStages: bpy.props.BoolProperty(name="Fold Idle Stages",
+        description="Hide stages without flagged edges or SubD levels, they come back once the object gets flags or levels for them",
+        default=True) # type: ignore
+
+    def execute(self, context):
+        return bp_reorder.optimize_stack(self, context)
+
+# ---------------- Triangle Budget -----------------
+class OBJECT_OT_triangle_budget(bpy.types.Operator):
+    bl_idname = "bp.triangle_budget"
+    bl_label = "Triangle Budget"
+    bl_description = "Pick segments and SubD levels per object so the scene fits a triangle or frame-time budget, larger objects get more detail"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    budgetMode: bpy.props.EnumProperty(name="Budget",
+        description="What the budget is measured in",
+        items=[
+            ('TRIANGLES', "Triangles", "Target evaluated triangle count for the scene"),
+            ('FRAME_TIME', "Frame Time", "Target frame time, converted to triangles by the throughput"),
+        ],
+        default='TRIANGLES') # type: ignore
+
+    targetTriangles: bpy.props.IntProperty(name="Triangles",
+        description="Target evaluated triangle count for the scene",
+        default=1000000,
+        min=0) # type: ignore
+
+    targetFrameTime: bpy.props.FloatProperty(name="Frame Time (ms)",
+        description="Target frame time in milliseconds",
+        default=16.6,
+        min=0.1,
+        soft_max=100.0) # type: ignore
+
+    trianglesPerMs: bpy.props.IntProperty(name="Triangles per ms",
+        description="Measured triangle throughput of the target hardware",
+        default=100000,
+        min=1) # type: ignore
+
+    useSelection: bpy.props.BoolProperty(name="Selected Only",
+        description="Only change selected objects, the rest of the scene still counts towards the budget",
+        default=False) # type: ignore
+
+    maxSubdLevels: bpy.props.IntProperty(name="SubD Levels",
+        description="Highest SubD level the solver may pick",
+        default=2,
+        min=1,
+        soft_max=4) # type: ignore
+
+    maxConstrainedSegments: bpy.props.IntProperty(name="Constrained Segments",
+        description="Highest constrained fillet segment count the solver may pick",
+        default=12,
+        min=1,
+        soft_max=20) # type: ignore
+
+    maxWeightedSegments: bpy.props.IntProperty(name="Weighted Segments",
+        description="Highest weighted fillet segment count the solver may pick",
+        default=6,
+        min=1,
+        soft_max=20) # type: ignore
+
+    maxEdgeChamferSegments: bpy.props.IntProperty(name="Chamfer Segments",
+        description="Highest edge chamfer segment count the solver may pick",
+        default=2,
+        min=1,
+        soft_max=4) # type: ignore
+
+    def execute(self, context):
+        return bp_cost.triangle_budget(self, context)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+
+        layout.prop(self, "budgetMode", expand=True)
+        if self.budgetMode == 'FRAME_TIME':
+            layout.prop(self, "targetFrameTime")
+            layout.prop(self, "trianglesPerMs")
+        else:
+            layout.prop(self, "targetTriangles")
+        layout.prop(self, "useSelection")
+
+        layout.separator()
+
+        layout.label(text="Upper limits:")
+        layout.prop(self, "maxSubdLevels")
+        layout.prop(self, "maxConstrainedSegments")
+        layout.prop(self, "maxWeightedSegments")
+        layout.prop(self, "maxEdgeChamferSegments")
+
+# ---------------- Freeze -----------------
+freeze_scope_items = [
+    ('SELECTED', "Selected", "Selected objects"),
+    ('COLLECTION', "Collection", "All objects in the active collection and its children"),
+    ('SCENE', "Scene", "All objects in the scene"),
+]
+
+class OBJECT_OT_freeze(bpy.types.Operator):
+    bl_idname = "bp.freeze"
+    bl_label = "Freeze BP Stack"
+    bl_description = "Replace the BP stack with a cached copy of its evaluated result, editing the object thaws it again"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: bpy.props.EnumProperty(name="Scope",
+        description="Objects to freeze",
+        items=freeze_scope_items,
+        default='SELECTED') # type: ignore
+
+    def execute(self, context):
+        return bp_freeze.freeze_objects(self, context)
+
+class OBJECT_OT_thaw(bpy.types.Operator):
+    bl_idname = "bp.thaw"
+    bl_label = "Thaw BP Stack"
+    bl_description = "Restore the live BP stack on frozen objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    scope: bpy.props.EnumProperty(name="Scope",
+        description="Objects to thaw",
+        items=freeze_scope_items,
+        default='SELECTED') # type: ignore
+
+    def execute(self, context):
+        return bp_freeze.thaw_objects(self, context)
+
+# ---------------- Normals Bake -----------------
+class OBJECT_OT_bake_normals(bpy.types.Operator):
+    bl_idname = "bp.bake_normals"
+    bl_label = "Bake Weighted Normals"
+    bl_description = "Store the weighted normals of the evaluated stack as custom normals, so Weighted Normals stops re-running"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    target: bpy.props.EnumProperty(name="Target",
+        description="Where the baked result goes",
+        items=[
+            ('FREEZE', "Freeze", "Freeze the object to the baked result, thawing brings the live stack back"),
+            ('APPLY', "Apply", "Apply the stack and the baked normals to the mesh"),
+        ],
+        default='FREEZE') # type: ignore
+
+    vectorized: bpy.props.BoolProperty(name="Compute Outside Stack",
+        description="Compute the normals with numpy instead of evaluating the Weighted Normals modifier, for static objects",
+        default=False) # type: ignore
+
+    def execute(self, context):
+        return bp_normals.bake_normals(self, context)
+
+# ---------------- Auto-UV Bake -----------------
+class OBJECT_OT_bake_auto_uv(bpy.types.Operator):
+    bl_idname = "bp.bake_auto_uv"
+    bl_label = "Bake Auto-UV"
+    bl_description = "Store the Auto-UV result in UVMap and bypass the modifier until topology or seams change"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        return bp_autouv.bake_auto_uv(self, context)
+
+class OBJECT_OT_clear_auto_uv(bpy.types.Operator):
+    bl_idname = "bp.clear_auto_uv"
+    bl_label = "Clear Auto-UV Bake"
+    bl_description = "Run Auto-UV live again on selected objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        return bp_autouv.clear_auto_uv(self, context)
+
+# ---------------- Scene Stack Settings -----------------
+class OBJECT_OT_link_stack_settings(bpy.types.Operator):
+    bl_idname = "bp.link_stack_settings"
+    bl_label = "Link Stack Settings"
+    bl_description = "Link selected objects to the scene stack settings, or keep their own settings"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    link: bpy.props.BoolProperty(name="Link", default=True) # type: ignore
+
+    def execute(self, context):
+        return bp_stack.link_objects(self, context)
+
+# ---------------- Inventory -----------------
+class OBJECT_OT_select_inventory(bpy.types.Operator):
+    bl_idname = "bp.select_inventory"
+    bl_label = "Select From Inventory"
+    bl_description = "Select objects by BP stage or flagged edges, straight from the scene inventory"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filter: bpy.props.EnumProperty(name="Filter",
+        items=[
+            ('STAGE', "Stage", "Objects with the given BP stage"),
+            ('FLAG', "Flag", "Objects with edges flagged for the given attribute"),
+            ('MISSING', "No Stack", "Mesh objects without any BP stage"),
+        ],
+        default='STAGE') # type: ignore
+
+    stage: bpy.props.StringProperty(name="Stage", default="SubD") # type: ignore
+    flag: bpy.props.StringProperty(name="Flag", default="bp_panel_edge") # type: ignore
+
+    extend: bpy.props.BoolProperty(name="Extend",
+        description="Add to the current selection",
+        default=False) # type: ignore
+
+    def execute(self, context):
+        return bp_inventory.select_objects(self, context)
+
+class OBJECT_OT_rebuild_inventory(bpy.types.Operator):
+    bl_idname = "bp.rebuild_inventory"
+    bl_label = "Rebuild Inventory"
+    bl_description = "Re-index every mesh object in the scene"
+
+    def execute(self, context):
+        return bp_inventory.rebuild_inventory(self, context)
+
+# ---------------- Flag Sidecars -----------------
+class OBJECT_OT_export_flags(bpy.types.Operator):
+    bl_idname = "bp.export_flags"
+    bl_label = "Export BP Flags"
+    bl_description = "Write the BP edge flags of selected meshes to compact sidecar files"
+
+    directory: bpy.props.StringProperty(name="Directory", subtype='DIR_PATH') # type: ignore
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        return bp_flags.export_flags(self, context)
+
+class OBJECT_OT_import_flags(bpy.types.Operator):
+    bl_idname = "bp.import_flags"
+    bl_label = "Import BP Flags"
+    bl_description = "Restore BP edge flags on selected meshes from sidecar files with the same topology"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    directory: bpy.props.StringProperty(name="Directory", subtype='DIR_PATH') # type: ignore
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        return bp_flags.import_flags(self, context)
+
+# ---------------- Flag Transfer -----------------
+class OBJECT_OT_transfer_flags(bpy.types.Operator):
+    bl_idname = "bp.transfer_flags"
+    bl_label = "Transfer BP Flags"
+    bl_description = "Copy BP edge flags from the active mesh onto matching edges of the selected meshes by position"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    tolerance: bpy.props.FloatProperty(name="Tolerance", default=0.001, min=0.0, subtype='DISTANCE') # type: ignore
+    angleTolerance: bpy.props.FloatProperty(name="Angle Tolerance", default=math.radians(5.0), min=0.0, max=math.radians(90.0), subtype='ANGLE') # type: ignore
+    worldSpace: bpy.props.BoolProperty(name="World Space", default=True) # type: ignore
+
+    def execute(self, context):
+        return bp_transfer.transfer_flags(self, context)
+
+class OBJECT_OT_mirror_flags(bpy.types.Operator):
+    bl_idname = "bp.mirror_flags"
+    bl_label = "Mirror BP Flags"
+    bl_description = "Mirror the BP edge flags of selected meshes onto their matching edges on the other side of an axis"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    axis: bpy.props.EnumProperty(name="Axis",
+        items=[
+            ('X', "X", "Mirror across the X axis"),
+            ('Y', "Y", "Mirror across the Y axis"),
+            ('Z', "Z", "Mirror across the Z axis"),
+        ],
+        default='Y') # type: ignore
+
+    plane: bpy.props.EnumProperty(name="Plane",
+        items=[
+            ('OBJECT', "Object", "Mirror across the object's own origin and axes"),
+            ('HELPER', "SmartMirror Helper", "Mirror across the mirror object of the SmartMirror modifier"),
+        ],
+        default='OBJECT') # type: ignore
+
+    direction: bpy.props.EnumProperty(name="Direction",
+        items=[
+            ('POSITIVE', "+ to -", "Copy the flags of the positive side onto the negative side"),
+            ('NEGATIVE', "- to +", "Copy the flags of the negative side onto the positive side"),
+            ('BOTH', "Both", "Combine the flags of both sides"),
+        ],
+        default='BOTH') # type: ignore
+
+    tolerance: bpy.props.FloatProperty(name="Tolerance", default=0.001, min=0.0, subtype='DISTANCE') # type: ignore
+    angleTolerance: bpy.props.FloatProperty(name="Angle Tolerance", default=math.radians(5.0), min=0.0, max=math.radians(90.0), subtype='ANGLE') # type: ignore
+
+    def execute(self, context):
+        return bp_transfer.mirror_flags(self, context)
+
+# ---------------- Legacy Migration -----------------
+class OBJECT_OT_migrate_bp2(bpy.types.Operator):
+    bl_idname = "bp.migrate_bp2"
+    bl_label = "Migrate BP2 Data"
+    bl_description = "Convert legacy BP2 edge attributes, modifiers and node groups to the current BP stack"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    selectedOnly: bpy.props.BoolProperty(name="Selected Only",
+        description="Only migrate selected objects instead of the whole scene",
+        default=False) # type: ignore
+
+    def execute(self, context):
+        return bp_migrate.migrate_bp2(self, context)
+
 # ---------------- SmartMirror -----------------
 class OBJECT_OT_smart_mirror(bpy.types.Operator):
     bl_idname = "bp.smart_mirror"
@@ -267,9 +825,7 @@ class OBJECT_OT_smart_mirror(bpy.types.Operator):
         default=False) # type: ignore
 
     def execute(self, context):
-        bp_functions.smart_mirror(self)
-        self.report({'INFO'}, "SmartMirrored")
-        return {'FINISHED'}
+        return bp_functions.smart_mirror(self)
     
     def invoke(self, context, event):
         if event.shift:
@@ -407,6 +963,133 @@ class MESH_OT_select_edge_sharp(bpy.types.Operator):
         bp_functions.select_by_edge_attribute(self, attribute_name = "sharp_edge")
         return {'FINISHED'}
 
+# ---------------- Panel Islands -----------------
+class MESH_OT_select_panel_island(bpy.types.Operator):
+    bl_idname = "bp.select_panel_island"
+    bl_label = "Select Panel Island"
+    bl_description = "Selects every face in the panel islands of the selected faces"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        return bp_panels.select_panel_islands(self, context)
+
+class MESH_OT_set_panel_thickness(bpy.types.Operator):
+    bl_idname = "bp.set_panel_thickness"
+    bl_label = "Panel Island Thickness"
+    bl_description = "Sets the Panelize thickness for the panel islands of the selected faces"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    thickness: bpy.props.FloatProperty(name="Thickness",
+        description="Panel thickness of the selected islands",
+        default=0.02, min=0.0, soft_max=0.2, unit='LENGTH') # type: ignore
+
+    def execute(self, context):
+        return bp_panels.set_island_thickness(self, context)
+
+# ---------------- Edge Chains -----------------
+chain_attribute_items = [('ALL', "All", "Chains of every flagged edge attribute")] + [
+    (name, label, f"Chains of {name} edges") for name, label in bp_chains.CHAIN_ATTRIBUTES.items()
+]
+
+class MESH_OT_select_chain(bpy.types.Operator):
+    bl_idname = "bp.select_chain"
+    bl_label = "Select Flagged Chain"
+    bl_description = "Extends the selection to the whole flagged edge chains running through the selected edges"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    attributeName: bpy.props.EnumProperty(name="Attribute",
+        items=chain_attribute_items,
+        default='ALL') # type: ignore
+
+    underCursor: bpy.props.BoolProperty(name="Under Cursor",
+        description="Pick the edge under the mouse first, for use from a shortcut",
+        default=False) # type: ignore
+
+    def invoke(self, context, event):
+        if self.underCursor:
+            bpy.ops.view3d.select(deselect_all=True, location=(event.mouse_region_x, event.mouse_region_y))
+        return self.execute(context)
+
+    def execute(self, context):
+        return bp_chains.select_chains(self, context)
+
+class MESH_OT_set_chain(bpy.types.Operator):
+    bl_idname = "bp.set_chain"
+    bl_label = "Set/Clear Flagged Chain"
+    bl_description = "Sets the flag value on the whole flagged edge chains running through the selected edges, 0 clears them"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    attributeName: bpy.props.EnumProperty(name="Attribute",
+        items=chain_attribute_items,
+        default='ALL') # type: ignore
+
+    value: bpy.props.FloatProperty(name="Value",
+        description="New flag value for the chains, 0 clears them",
+        default=0.0, min=0.0, max=1.0) # type: ignore
+
+    def execute(self, context):
+        return bp_chains.set_chains(self, context)
+
+# ---------------- Edge Brush -----------------
+class MESH_OT_edge_brush(bpy.types.Operator):
+    bl_idname = "bp.edge_brush"
+    bl_label = "Edge Weight Brush"
+    bl_description = "Paint, smooth and erase edge weights under the cursor with falloff"
+    bl_options = {'REGISTER', 'UNDO', 'BLOCKING'}
+
+    attributeName: bpy.props.EnumProperty(name="Attribute",
+        items=[(name, label, f"Paint {name}") for name, label in bp_brush.BRUSH_ATTRIBUTES.items()],
+        default='bp_bevel_fillet_weighted') # type: ignore
+
+    mode: bpy.props.EnumProperty(name="Mode",
+        items=[
+            ('PAINT', "Paint", "Blend the edge weights towards the value"),
+            ('SMOOTH', "Smooth", "Blend the edge weights towards their neighbours, Shift while painting"),
+            ('ERASE', "Erase", "Blend the edge weights towards zero, Ctrl while painting"),
+        ],
+        default='PAINT') # type: ignore
+
+    value: bpy.props.FloatProperty(name="Value", default=1.0, min=0.0, max=1.0) # type: ignore
+    radius: bpy.props.FloatProperty(name="Radius", description="Brush radius in world units", default=0.25, min=0.0001, subtype='DISTANCE') # type: ignore
+    strength: bpy.props.FloatProperty(name="Strength", default=0.5, min=0.0, max=1.0, subtype='FACTOR') # type: ignore
+
+    falloff: bpy.props.EnumProperty(name="Falloff",
+        items=[
+            ('SMOOTH', "Smooth", "Smooth falloff towards the brush edge"),
+            ('LINEAR', "Linear", "Linear falloff towards the brush edge"),
+            ('CONSTANT', "Constant", "Full strength over the whole brush"),
+        ],
+        default='SMOOTH') # type: ignore
+
+    def invoke(self, context, event):
+        return bp_brush.brush_invoke(self, context, event)
+
+    def modal(self, context, event):
+        return bp_brush.brush_modal(self, context, event)
+
+# ---------------- Auto Chamfer -----------------
+class MESH_OT_bake_auto_chamfer(bpy.types.Operator):
+    bl_idname = "bp.bake_auto_chamfer"
+    bl_label = "Bake Auto Chamfer"
+    bl_description = "Flag edges sharper than the angle threshold for edge chamfers once, instead of detecting them on every evaluation"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    skipEdgeDetect: bpy.props.BoolProperty(name="Remove Edge Detect",
+        description="Remove the live EdgeDetect stage, the baked flags replace it",
+        default=True) # type: ignore
+
+    def execute(self, context):
+        return bp_autochamfer.bake_auto_chamfer(self, context)
+
+class MESH_OT_clear_auto_chamfer(bpy.types.Operator):
+    bl_idname = "bp.clear_auto_chamfer"
+    bl_label = "Clear Auto Chamfer"
+    bl_description = "Remove baked auto-chamfer flags and restore live edge detection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        return bp_autochamfer.clear_auto_chamfer(self, context)
+
 # ---------------- Apply -----------------
 class MESH_OT_apply_fillet_constrained(bpy.types.Operator):
     bl_idname = "bp.apply_fillet_constrained"
@@ -509,6 +1192,16 @@ class VIEW3D_PT_bp_panel(bpy.types.Panel):
         obj = context.active_object
         is_edit = bp_functions.isEditMode()
 
+        #BATCH PROGRESS
+        job = bp_queue.current_job()
+        if job is not None:
+            row = self.layout.row (align=True)
+            row.progress(factor=job.index / max(len(job.names), 1), text=f"{job.label} {job.index}/{len(job.names)}")
+            row.operator("bp.cancel_batch", text="", icon="CANCEL")
+        elif bp_queue.last_job is not None and bp_queue.last_job[3] == 'cancelled':
+            label, processed, total, _, _ = bp_queue.last_job
+            self.layout.label(text=f"{label} cancelled at {processed}/{total}", icon="INFO")
+
         #MODIFIERS
         self.layout.label(text="Object Mode:", icon="OBJECT_DATAMODE")
         row = self.layout.row (align=True)
@@ -527,11 +1220,58 @@ class VIEW3D_PT_bp_panel(bpy.types.Panel):
         #Visibility
         row.operator("bp.modifier_visibility", text="", icon="HIDE_OFF")
 
+        #Budget
+        row.operator("bp.triangle_budget", text="", icon="MOD_DECIM")
+        row.operator("bp.optimize_stack", text="", icon="SORTTIME")
+
         #MIRROR TOOLS
         row = self.layout.row (align=True)
         row.enabled != is_edit
         row.operator("bp.smart_mirror", text="SmartMirror", icon="MOD_MIRROR")
 
+        #FREEZE
+        row = self.layout.row (align=True)
+        row.enabled = not is_edit
+        row.operator("bp.freeze", text="Freeze", icon="FREEZE")
+        row.operator("bp.thaw", text="Thaw", icon="MOD_SMOOTH")
+        button = row.operator("bp.freeze", text="", icon="OUTLINER_COLLECTION")
+        button.scope = 'COLLECTION'
+
+        #BAKED NORMALS
+        row = self.layout.row (align=True)
+        row.enabled = not is_edit
+        row.operator("bp.bake_normals", text="Bake Normals", icon="NORMALS_VERTEX_FACE")
+
+        #AUTO-UV
+        row = self.layout.row (align=True)
+        row.enabled = not is_edit
+        row.operator("bp.bake_auto_uv", text="Bake Auto-UV", icon="UV")
+        row.operator("bp.clear_auto_uv", text="", icon="X")
+
+        #MACROS
+        row = self.layout.row (align=True)
+        row.enabled = not is_edit
+        recording = bp_macro.is_recording()
+        row.operator("bp.record_macro", text="Stop Recording" if recording else "Record Macro", icon="PAUSE" if recording else "REC", depress=recording)
+        row.operator("bp.play_macro", text="Play Macro", icon="PLAY")
+
+        #FLAG SIDECARS
+        row = self.layout.row (align=True)
+        row.enabled = not is_edit
+        row.operator("bp.export_flags", text="Export Flags", icon="EXPORT")
+        row.operator("bp.import_flags", text="Import Flags", icon="IMPORT")
+
+        #NODE GROUPS
+        row = self.layout.row (align=True)
+        row.enabled = not is_edit
+        row.operator("bp.clean_nodegroups", text="Clean Node Groups", icon="NODETREE")
+
+        #FLAG TRANSFER
+        row = self.layout.row (align=True)
+        row.enabled = not is_edit
+        row.operator("bp.transfer_flags", text="Transfer Flags", icon="PASTEDOWN")
+        row.operator("bp.mirror_flags", text="Mirror Flags", icon="MOD_MIRROR")
+
         #INSERT HELPER
         #row = self.layout.row (align=True)
         #row.enabled != is_edit
@@ -546,6 +1286,23 @@ class VIEW3D_PT_bp_panel(bpy.types.Panel):
         row.operator("bp.apply_panel", text="", icon="TRIA_DOWN_BAR")
         row.operator("bp.select_edge_panel", text="", icon="RESTRICT_SELECT_OFF");  
 
+        #PANEL ISLANDS
+        row = self.layout.row (align=True)
+        row.enabled = is_edit
+        row.operator("bp.select_panel_island", text="Select Island", icon="FACE_MAPS")
+        row.operator("bp.set_panel_thickness", text="Thickness", icon="MOD_SOLIDIFY")
+
+        #CHAINS
+        row = self.layout.row (align=True)
+        row.enabled = is_edit
+        row.operator("bp.select_chain", text="Select Chain", icon="LINKED")
+        row.operator("bp.set_chain", text="Clear Chain", icon="X")
+
+        #EDGE BRUSH
+        row = self.layout.row (align=True)
+        row.enabled = is_edit
+        row.operator("bp.edge_brush", text="Edge Weight Brush", icon="BRUSH_DATA")
+
         #EDGE CHAMFERS
         row = self.layout.row (align=True)
         row.enabled = is_edit
@@ -560,6 +1317,12 @@ class VIEW3D_PT_bp_panel(bpy.types.Panel):
         row.operator("bp.apply_edge_chamfer", text="", icon="TRIA_DOWN_BAR")
         row.operator("bp.select_edge_chamfer", text="", icon="RESTRICT_SELECT_OFF");   
 
+        #AUTO CHAMFER
+        row = self.layout.row (align=True)
+        row.prop(props, "edgechamfer_angle")
+        row.operator("bp.bake_auto_chamfer", text="", icon="RENDER_STILL")
+        row.operator("bp.clear_auto_chamfer", text="", icon="X")
+
         #FILLET SLIDER
         row = self.layout.row (align=True)
         row.enabled = is_edit
@@ -584,6 +1347,152 @@ class VIEW3D_PT_bp_panel(bpy.types.Panel):
         #UV_DATA
         #Auto-UV
 
+class VIEW3D_PT_bp_cache(bpy.types.Panel):
+    bl_label = "Disk Cache"
+    bl_idname = "VIEW3D_PT_bp_cache"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Blockout Pro"
+    bl_parent_id = "VIEW3D_PT_bp_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        self.layout.prop(context.scene.bp_cache_props, "use_cache", text="")
+
+    def draw(self, context):
+        props = context.scene.bp_cache_props
+        self.layout.enabled = props.use_cache
+        self.layout.prop(props, "location")
+        if props.location == 'DIRECTORY':
+            self.layout.prop(props, "directory", text="")
+        self.layout.prop(props, "max_size_mb")
+
+class VIEW3D_PT_bp_estimate(bpy.types.Panel):
+    bl_label = "Stack Estimate"
+    bl_idname = "VIEW3D_PT_bp_estimate"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Blockout Pro"
+    bl_parent_id = "VIEW3D_PT_bp_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        obj = context.active_object
+        if not obj or not bp_cost.has_bp_stack(obj):
+            self.layout.label(text="No BP stack on active object")
+            return
+
+        #Predicted from flagged edges and stack settings, nothing is evaluated
+        results = bp_cost.estimate_stages(bp_cost.cached_base(obj), bp_cost.read_stack(obj))
+
+        col = self.layout.column(align=True)
+        for name, state in results:
+            row = col.row(align=True)
+            row.label(text=name)
+            row.label(text=f"{state['verts']:,} v")
+            row.label(text=f"{state['faces']:,} f")
+
+        total = bp_cost.triangles(results[-1][1])
+        row = self.layout.row()
+        row.alert = total > context.scene.edge_props.estimate_warn_triangles
+        row.label(text=f"Triangles: {total:,}", icon="ERROR" if row.alert else "MESH_DATA")
+        self.layout.prop(context.scene.edge_props, "estimate_warn_triangles")
+
+class VIEW3D_PT_bp_chains(bpy.types.Panel):
+    bl_label = "Edge Chains"
+    bl_idname = "VIEW3D_PT_bp_chains"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Blockout Pro"
+    bl_parent_id = "VIEW3D_PT_bp_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        obj = context.active_object
+        if not obj or obj.type != 'MESH':
+            self.layout.label(text="No active mesh")
+            return
+
+        #Edit mode changes show up once they are flushed to the mesh
+        col = self.layout.column(align=True)
+        for name, label in bp_chains.CHAIN_ATTRIBUTES.items():
+            stats = bp_chains.chain_stats(obj, name)
+            row = col.row(align=True)
+            row.label(text=label)
+            row.label(text=f"{stats['chains']} ({stats['loops']} loops)")
+            row.label(text=f"{stats['length']:.2f} m")
+
+class VIEW3D_PT_bp_stack(bpy.types.Panel):
+    bl_label = "Scene Stack Settings"
+    bl_idname = "VIEW3D_PT_bp_stack"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Blockout Pro"
+    bl_parent_id = "VIEW3D_PT_bp_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        props = context.scene.bp_stack_props
+
+        col = self.layout.column(align=True)
+        col.prop(props, "edge_chamfer_size")
+        col.prop(props, "edge_chamfer_segments")
+        col = self.layout.column(align=True)
+        col.prop(props, "weighted_fillet_size")
+        col.prop(props, "weighted_fillet_segments")
+        col.prop(props, "constrained_fillet_segments")
+        col = self.layout.column(align=True)
+        col.prop(props, "panel_thickness")
+        col.prop(props, "subd_levels")
+
+        row = self.layout.row(align=True)
+        button = row.operator("bp.link_stack_settings", text="Link", icon="LINKED")
+        button.link = True
+        button = row.operator("bp.link_stack_settings", text="Unlink", icon="UNLINKED")
+        button.link = False
+
+        changed, ms = bp_stack.last_propagation
+        self.layout.label(text=f"Last update: {changed} objects in {ms:.1f} ms")
+
+class VIEW3D_PT_bp_inventory(bpy.types.Panel):
+    bl_label = "Scene Inventory"
+    bl_idname = "VIEW3D_PT_bp_inventory"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Blockout Pro"
+    bl_parent_id = "VIEW3D_PT_bp_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        self.layout.operator("bp.rebuild_inventory", text="", icon="FILE_REFRESH", emboss=False)
+
+    def draw(self, context):
+        #Read from the inventory, no object is visited while drawing
+        summary = bp_inventory.summary(context.scene)
+
+        col = self.layout.column(align=True)
+        col.label(text=f"{summary['objects']} meshes, {summary['triangles']:,} tris")
+        row = col.row(align=True)
+        row.label(text=f"No stack: {summary['missing']}")
+        button = row.operator("bp.select_inventory", text="", icon="RESTRICT_SELECT_OFF")
+        button.filter = 'MISSING'
+
+        col = self.layout.column(align=True)
+        for stage, count in sorted(summary["stages"].items()):
+            row = col.row(align=True)
+            row.label(text=f"{stage}: {count}")
+            button = row.operator("bp.select_inventory", text="", icon="RESTRICT_SELECT_OFF")
+            button.filter = 'STAGE'
+            button.stage = stage
+
+        col = self.layout.column(align=True)
+        for name, label in bp_chains.CHAIN_ATTRIBUTES.items():
+            row = col.row(align=True)
+            row.label(text=f"{label}: {summary['flags'].get(name, 0)}")
+            button = row.operator("bp.select_inventory", text="", icon="RESTRICT_SELECT_OFF")
+            button.filter = 'FLAG'
+            button.flag = name
+
 # ---------------- Specials Menu -----------------
 class VIEW3D_MT_bp_specials_submenu(bpy.types.Menu):
     bl_label = "Blockout Pro"
@@ -611,7 +1520,14 @@ def menu_func(self, context):
 # ---------------- Registration -----------------
 classes = (
     EdgeProps,
+    CacheProps,
+    StackProps,
     VIEW3D_PT_bp_panel,
+    VIEW3D_PT_bp_estimate,
+    VIEW3D_PT_bp_chains,
+    VIEW3D_PT_bp_stack,
+    VIEW3D_PT_bp_inventory,
+    VIEW3D_PT_bp_cache,
     MESH_OT_set_edge_panel,
     MESH_OT_set_edge_chamfer,
     MESH_OT_set_edge_fillet_constrained,
@@ -622,6 +1538,13 @@ classes = (
     MESH_OT_select_edge_fillet_constrained,
     MESH_OT_select_edge_fillet_weighted,
     MESH_OT_select_edge_sharp,
+    MESH_OT_select_panel_island,
+    MESH_OT_set_panel_thickness,
+    MESH_OT_select_chain,
+    MESH_OT_set_chain,
+    MESH_OT_edge_brush,
+    MESH_OT_bake_auto_chamfer,
+    MESH_OT_clear_auto_chamfer,
     MESH_OT_apply_fillet_constrained,
     MESH_OT_apply_fillet_weighted,
     MESH_OT_apply_edge_chamfer,
@@ -629,6 +1552,25 @@ classes = (
     MESH_OT_apply_sharp,
     OBJECT_OT_add_modifiers,
     OBJECT_OT_mods_visibility,
+    OBJECT_OT_cancel_batch,
+    OBJECT_OT_record_macro,
+    OBJECT_OT_play_macro,
+    OBJECT_OT_clean_nodegroups,
+    OBJECT_OT_triangle_budget,
+    OBJECT_OT_optimize_stack,
+    OBJECT_OT_freeze,
+    OBJECT_OT_thaw,
+    OBJECT_OT_bake_normals,
+    OBJECT_OT_bake_auto_uv,
+    OBJECT_OT_clear_auto_uv,
+    OBJECT_OT_link_stack_settings,
+    OBJECT_OT_select_inventory,
+    OBJECT_OT_rebuild_inventory,
+    OBJECT_OT_export_flags,
+    OBJECT_OT_import_flags,
+    OBJECT_OT_transfer_flags,
+    OBJECT_OT_mirror_flags,
+    OBJECT_OT_migrate_bp2,
     OBJECT_OT_smart_mirror,
     VIEW3D_MT_bp_specials_submenu
 )
@@ -645,8 +1587,14 @@ def register():
     bpy.types.VIEW3D_MT_edit_mesh_context_menu.prepend(menu_func)
 
     bpy.types.Scene.edge_props = bpy.props.PointerProperty(type=EdgeProps)
+    bpy.types.Scene.bp_cache_props = bpy.props.PointerProperty(type=CacheProps)
+    bpy.types.Scene.bp_stack_props = bpy.props.PointerProperty(type=StackProps)
     if not _handler_registered:
         bpy.app.handlers.depsgraph_update_post.append(depsgraph_update)
+        bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_caches)
+        bpy.app.handlers.load_post.append(load_post_caches)
+        bpy.app.handlers.save_pre.append(save_pre_caches)
+        bpy.app.handlers.save_post.append(save_post_caches)
         _handler_registered = True
     
     #bp_modifiers.register()
@@ -656,6 +1604,14 @@ def unregister():
     if _handler_registered and depsgraph_update in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update)
         _handler_registered = False
+    if depsgraph_update_caches in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_caches)
+    if load_post_caches in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_post_caches)
+    if save_pre_caches in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(save_pre_caches)
+    if save_post_caches in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.remove(save_post_caches)
 
     for cls in reversed(classes):
         #try:
@@ -668,6 +1624,10 @@ def unregister():
     
     if hasattr(bpy.types.Scene, "edge_props"):
         del bpy.types.Scene.edge_props
+    if hasattr(bpy.types.Scene, "bp_cache_props"):
+        del bpy.types.Scene.bp_cache_props
+    if hasattr(bpy.types.Scene, "bp_stack_props"):
+        del bpy.types.Scene.bp_stack_props
     
     #bp_modifiers.unregister()
 
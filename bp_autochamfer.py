@@ -0,0 +1,118 @@
+import bpy
+import numpy as np
+
+from . import bp_data
+from . import bp_functions
+from . import bp_modifiers
+
+#Baked replacement for the BP_EdgeDetect node group. Sharp edges are found once by
+#dihedral angle and written into bevel_weight_edge and sharp_edge, so static meshes
+#don't redo the detection on every depsgraph evaluation.
+
+#Edges flagged by the last bake, so a re-bake can tell them apart from manual flags
+AUTO_ATTRIBUTE = "bp_autochamfer_edge"
+BAKED_KEY = "bp_autochamfer"
+
+def bake_mesh(mesh, angle_threshold: float):
+    bp_data.ensure_attribute(mesh, "bevel_weight_edge", 'FLOAT')
+    bp_data.ensure_attribute(mesh, "sharp_edge", 'BOOLEAN')
+    bp_data.ensure_attribute(mesh, AUTO_ATTRIBUTE, 'BOOLEAN')
+
+    weights = bp_data.read_attribute(mesh, "bevel_weight_edge", np.float32)
+    sharp = bp_data.read_attribute(mesh, "sharp_edge", np.bool_)
+    previous = bp_data.read_attribute(mesh, AUTO_ATTRIBUTE, np.bool_)
+
+    #Drop what the previous bake flagged, manual flags stay untouched
+    weights[previous] = 0.0
+    sharp[previous] = False
+
+    detected = bp_data.sharp_edge_mask(mesh, angle_threshold)
+    auto = detected & (weights == 0.0)
+    weights[auto] = 1.0
+    sharp[auto] = True
+
+    bp_data.write_attribute(mesh, "bevel_weight_edge", weights)
+    bp_data.write_attribute(mesh, "sharp_edge", sharp)
+    bp_data.write_attribute(mesh, AUTO_ATTRIBUTE, auto)
+    mesh.update()
+
+    return int(np.count_nonzero(auto))
+
+def clear_mesh(mesh):
+    previous = bp_data.read_attribute(mesh, AUTO_ATTRIBUTE, np.bool_)
+    if previous is None:
+        return
+
+    for name in ("bevel_weight_edge", "sharp_edge"):
+        values = bp_data.read_attribute(mesh, name, bp_data.BP_EDGE_ATTRIBUTES[name])
+        if values is not None:
+            values[previous] = 0
+            bp_data.write_attribute(mesh, name, values)
+
+    mesh.attributes.remove(mesh.attributes[AUTO_ATTRIBUTE])
+    mesh.update()
+
+def restore_edge_detect(self, obj):
+    #Live detection goes back right before the chamfer bevel it feeds
+    if obj.modifiers.get(" BP_EdgeChamfer") is None:
+        return
+
+    bp_modifiers.setup_modifier(self, obj, name = "EdgeDetect", modifierType = "NODES", settings = {})
+
+    detect = obj.modifiers.find(" BP_EdgeDetect")
+    chamfer = obj.modifiers.find(" BP_EdgeChamfer")
+    if detect > chamfer:
+        obj.modifiers.move(detect, chamfer)
+
+def bake_auto_chamfer(self, context):
+    objects = bp_functions.getSelectedObjects(self)
+    if not objects:
+        return {'CANCELLED'}
+
+    editMode = context.mode == 'EDIT_MESH'
+    if editMode:
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    angle = context.scene.edge_props.edgechamfer_angle
+    flagged = 0
+    for obj in objects:
+        flagged += bake_mesh(obj.data, angle)
+        obj[BAKED_KEY] = True
+
+        if self.skipEdgeDetect:
+            mod = obj.modifiers.get(" BP_EdgeDetect")
+            if mod is not None:
+                obj.modifiers.remove(mod)
+
+    if editMode:
+        bpy.ops.object.mode_set(mode='EDIT')
+
+    self.report({'INFO'}, f"Baked {flagged} chamfer edges on {len(objects)} objects")
+    return {'FINISHED'}
+
+def clear_auto_chamfer(self, context):
+    objects = bp_functions.getSelectedObjects(self)
+    if not objects:
+        return {'CANCELLED'}
+
+    editMode = context.mode == 'EDIT_MESH'
+    if editMode:
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    for obj in objects:
+        clear_mesh(obj.data)
+        if BAKED_KEY in obj:
+            del obj[BAKED_KEY]
+        restore_edge_detect(self, obj)
+
+    if editMode:
+        bpy.ops.object.mode_set(mode='EDIT')
+
+    self.report({'INFO'}, "Restored live edge detection")
+    return {'FINISHED'}
+
+def rebake_scene(scene, angle_threshold: float):
+    #Live threshold: re-bake every baked object, edit mode data would overwrite the result
+    for obj in scene.objects:
+        if obj.type == 'MESH' and BAKED_KEY in obj and obj.mode != 'EDIT':
+            bake_mesh(obj.data, angle_threshold)
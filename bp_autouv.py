@@ -0,0 +1,138 @@
+import bpy
+import numpy as np
+
+from . import bp_cost
+from . import bp_data
+from . import bp_freeze
+from . import bp_functions
+
+#Baked AutoUV. The BP_AutoUV result is stored in UVMap together with a fingerprint
+#of the topology and seams, and the modifier is bypassed while the fingerprint
+#matches. Topology or seam changes trigger a re-bake from a timer.
+
+FINGERPRINT_KEY = "bp_autouv_fingerprint"
+MODIFIER_NAME = " BP_AutoUV"
+SEAM_ATTRIBUTES = ("uv_seam", "bp_panel_edge")
+
+def uv_fingerprint(mesh):
+    return bp_data.topology_fingerprint(mesh, SEAM_ATTRIBUTES)
+
+def evaluate_autouv(context, obj):
+    #Evaluate AutoUV alone on the base mesh so the corners line up with it
+    mod = obj.modifiers[MODIFIER_NAME]
+    visibility = {m.name: m.show_viewport for m in obj.modifiers}
+    for m in obj.modifiers:
+        m.show_viewport = m == mod
+
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            if len(mesh.loops) != len(obj.data.loops):
+                return None
+
+            uvLayer = mesh.uv_layers.get("UVMap") or mesh.uv_layers.active
+            if uvLayer is None:
+                return None
+
+            uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            uvLayer.data.foreach_get("uv", uvs)
+            return uvs
+        finally:
+            evaluated.to_mesh_clear()
+    finally:
+        for m in obj.modifiers:
+            m.show_viewport = visibility.get(m.name, m.show_viewport)
+
+def bake_object(context, obj):
+    mod = obj.modifiers.get(MODIFIER_NAME)
+    if mod is None:
+        return False
+
+    uvs = evaluate_autouv(context, obj)
+    if uvs is None:
+        print("AutoUV on " + obj.name + " changed the topology, left it live")
+        return False
+
+    mesh = obj.data
+    uvLayer = mesh.uv_layers.get("UVMap") or mesh.uv_layers.new(name="UVMap")
+    uvLayer.data.foreach_set("uv", uvs)
+    mesh.update()
+
+    obj[FINGERPRINT_KEY] = uv_fingerprint(mesh)
+    mod.show_viewport = False
+    mod.show_render = False
+    return True
+
+def clear_object(obj):
+    if FINGERPRINT_KEY in obj:
+        del obj[FINGERPRINT_KEY]
+
+    mod = obj.modifiers.get(MODIFIER_NAME)
+    if mod is not None:
+        mod.show_viewport = True
+        mod.show_render = True
+
+def bake_auto_uv(self, context):
+    objects = [obj for obj in bp_functions.getSelectedObjects(self) if obj.modifiers.get(MODIFIER_NAME)]
+    if not objects:
+        self.report({'WARNING'}, "No selected objects with Auto-UV")
+        return {'CANCELLED'}
+
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    liveTime = 0.0
+    cachedTime = 0.0
+    baked = 0
+    for obj in objects:
+        clear_object(obj)
+        liveTime += bp_cost.time_evaluation(context, obj)
+
+        if bake_object(context, obj):
+            baked += 1
+            cachedTime += bp_cost.time_evaluation(context, obj)
+
+    self.report({'INFO'}, f"Baked Auto-UV on {baked} objects, evaluation {liveTime * 1000:.1f} ms live, {cachedTime * 1000:.1f} ms cached")
+    return {'FINISHED'}
+
+def clear_auto_uv(self, context):
+    for obj in bp_functions.getSelectedObjects(self):
+        clear_object(obj)
+
+    return {'FINISHED'}
+
+# ---------------- Automatic re-bake -----------------
+_pending = set()
+
+def _rebake_pending():
+    names = list(_pending)
+    _pending.clear()
+
+    with bp_freeze.window_override():
+        for name in names:
+            obj = bpy.data.objects.get(name)
+            if obj is None or FINGERPRINT_KEY not in obj or obj.mode == 'EDIT':
+                continue
+
+            if uv_fingerprint(obj.data) != obj[FINGERPRINT_KEY]:
+                print("Topology or seams changed on " + name + ", re-baking Auto-UV")
+                if not bake_object(bpy.context, obj):
+                    clear_object(obj)
+
+    return None
+
+def on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        data = update.id.original
+        if not isinstance(data, bpy.types.Object) or not update.is_updated_geometry:
+            continue
+        if FINGERPRINT_KEY not in data or data.mode == 'EDIT':
+            continue
+
+        #Deferred to a timer, evaluating from inside the handler isn't allowed
+        if not _pending:
+            bpy.app.timers.register(_rebake_pending, first_interval=0.0)
+        _pending.add(data.name)
@@ -0,0 +1,374 @@
+import argparse
+import concurrent.futures
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+#Headless batch processing of .blend blockouts.
+#
+#Launcher, runs in any Python:
+#   python bp_batch.py export assets/ --out exported/ --format fbx --apply
+#   python bp_batch.py migrate legacy_assets/
+#   python bp_batch.py macro parts/ --macro new_part.json
+#
+#Every .blend is handed to its own `blender -b` worker process, the workers run in a
+#local pool sized by the CPU count. Progress is stored in a JSON manifest after every
+#file so an interrupted run picks up where it stopped when started again.
+#
+#Worker, started by the launcher inside Blender:
+#   blender -b file.blend --python bp_batch.py -- worker --task export ...
+
+EXPORT_FORMATS = {
+    "fbx": ".fbx",
+    "gltf": ".glb",
+    "obj": ".obj",
+}
+
+MANIFEST_VERSION = 1
+
+# ---------------- Launcher -----------------
+def find_blendfiles(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, names in os.walk(path):
+                for name in sorted(names):
+                    if name.endswith(".blend"):
+                        files.append(os.path.abspath(os.path.join(root, name)))
+        elif path.endswith(".blend"):
+            files.append(os.path.abspath(path))
+
+    return files
+
+def load_manifest(path):
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+
+    return {"version": MANIFEST_VERSION, "jobs": {}}
+
+def save_manifest(path, manifest):
+    #Write to a temp file first so a killed run never leaves a truncated manifest
+    tempPath = path + ".tmp"
+    with open(tempPath, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(tempPath, path)
+
+def is_job_done(job, blendfile):
+    if not job or job.get("status") != "done":
+        return False
+    if job.get("mtime") != os.path.getmtime(blendfile):
+        return False
+
+    output = job.get("output")
+    return output is None or os.path.exists(output)
+
+def run_worker(args, blendfile, workerArgs, threads):
+    with tempfile.TemporaryDirectory(prefix="bp_batch_") as tempDir:
+        resultPath = os.path.join(tempDir, "result.json")
+        command = [
+            args.blender, "-b", "--factory-startup", "-t", str(threads), blendfile,
+            "--python", os.path.abspath(__file__), "--",
+            "worker", "--result", resultPath,
+        ] + workerArgs
+
+        start = time.perf_counter()
+        process = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+        elapsed = time.perf_counter() - start
+
+        result = {}
+        if os.path.exists(resultPath):
+            with open(resultPath, "r", encoding="utf-8") as file:
+                result = json.load(file)
+
+    result["seconds"] = round(elapsed, 3)
+    if process.returncode != 0 or result.get("status") != "done":
+        result["status"] = "failed"
+        stderr = process.stderr.strip().splitlines()
+        result.setdefault("error", stderr[-1] if stderr else f"exit code {process.returncode}")
+
+    return result
+
+def run_batch(args, workerArgsForFile):
+    files = find_blendfiles(args.inputs)
+    manifestPath = args.manifest or os.path.join(args.out or os.getcwd(), "bp_batch_manifest.json")
+    os.makedirs(os.path.dirname(os.path.abspath(manifestPath)), exist_ok=True)
+    manifest = load_manifest(manifestPath)
+
+    pending = [file for file in files if args.force or not is_job_done(manifest["jobs"].get(file), file)]
+    print(f"{len(files)} files, {len(files) - len(pending)} already done, {len(pending)} to process")
+    if not pending:
+        return 0
+
+    #Blender threads its own evaluation, split the cores between the workers
+    cores = os.cpu_count() or 1
+    jobs = max(1, min(args.jobs or cores, len(pending)))
+    threads = max(1, cores // jobs)
+
+    lock = threading.Lock()
+    failed = 0
+    batchStart = time.perf_counter()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(run_worker, args, file, workerArgsForFile(file), threads): file
+            for file in pending
+        }
+
+        for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+            file = futures[future]
+            try:
+                result = future.result()
+            except subprocess.TimeoutExpired:
+                result = {"status": "failed", "error": "timed out"}
+            except Exception as e:
+                result = {"status": "failed", "error": str(e)}
+
+            result["mtime"] = os.path.getmtime(file)
+
+            with lock:
+                manifest["jobs"][file] = result
+                save_manifest(manifestPath, manifest)
+
+            if result["status"] != "done":
+                failed += 1
+            print(f"[{done}/{len(pending)}] {result['status']} {os.path.basename(file)} "
+                f"{result.get('seconds', 0.0):.2f}s {result.get('error', '')}")
+
+    print(f"Finished in {time.perf_counter() - batchStart:.1f}s with {jobs} workers, {failed} failed")
+    return 1 if failed else 0
+
+def export_command(args):
+    extension = EXPORT_FORMATS[args.format]
+    os.makedirs(args.out, exist_ok=True)
+
+    def worker_args(blendfile):
+        name = os.path.splitext(os.path.basename(blendfile))[0]
+        output = os.path.abspath(os.path.join(args.out, name + extension))
+        workerArgs = ["--task", "export", "--format", args.format, "--output", output]
+        if args.apply:
+            workerArgs.append("--apply")
+        return workerArgs
+
+    return run_batch(args, worker_args)
+
+def migrate_command(args):
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    def worker_args(blendfile):
+        #Migrate in place unless an output directory is given
+        output = blendfile
+        if args.out:
+            output = os.path.abspath(os.path.join(args.out, os.path.basename(blendfile)))
+        return ["--task", "migrate", "--output", output]
+
+    return run_batch(args, worker_args)
+
+def macro_command(args):
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    macroPath = os.path.abspath(args.macro)
+
+    def worker_args(blendfile):
+        #Played in place unless an output directory is given
+        output = blendfile
+        if args.out:
+            output = os.path.abspath(os.path.join(args.out, os.path.basename(blendfile)))
+        return ["--task", "macro", "--macro", macroPath, "--output", output]
+
+    return run_batch(args, worker_args)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="bp_batch", description="Headless batch processing for Blockout Pro files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Apply or evaluate the BP stack and export every file")
+    export.add_argument("inputs", nargs="+", help=".blend files or directories to search")
+    export.add_argument("--out", required=True, help="Output directory")
+    export.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="fbx")
+    export.add_argument("--apply", action="store_true", help="Apply the BP stack before exporting instead of exporting the evaluated result")
+    export.set_defaults(run=export_command)
+
+    migrate = commands.add_parser("migrate", help="Convert legacy BP2 attributes and modifiers to the current stack")
+    migrate.add_argument("inputs", nargs="+", help=".blend files or directories to search")
+    migrate.add_argument("--out", help="Output directory, files are migrated in place when left out")
+    migrate.set_defaults(run=migrate_command)
+
+    macro = commands.add_parser("macro", help="Replay a recorded BP macro on every mesh object of each file")
+    macro.add_argument("inputs", nargs="+", help=".blend files or directories to search")
+    macro.add_argument("--macro", required=True, help="Macro JSON file recorded with bp.record_macro")
+    macro.add_argument("--out", help="Output directory, files are changed in place when left out")
+    macro.set_defaults(run=macro_command)
+
+    for command in commands.choices.values():
+        command.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+        command.add_argument("--jobs", type=int, default=0, help="Worker processes, defaults to the CPU count")
+        command.add_argument("--manifest", help="Job manifest used to resume interrupted runs")
+        command.add_argument("--force", action="store_true", help="Reprocess files already marked done in the manifest")
+        command.add_argument("--timeout", type=float, default=None, help="Seconds before a worker is killed")
+
+    return parser
+
+# ---------------- Worker -----------------
+class WorkerReporter:
+    #Stands in for the operator self the bp_modifiers functions report through
+    def report(self, level, message):
+        print(f"{next(iter(level))}: {message}")
+
+def import_addon():
+    #Import this folder as a package so relative imports inside the addon resolve
+    addonPath = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(addonPath))
+    addon = importlib.import_module(os.path.basename(addonPath))
+    try:
+        addon.register()
+    except ValueError:
+        pass  # Already registered through the user preferences
+
+    return addon
+
+def prepare_objects(addon, reporter):
+    import bpy
+
+    if bpy.context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    #Node groups are shared by every object, import them once per file
+    addon.bp_modifiers.reimport_nodegroups(reporter)
+
+    objects = [obj for obj in bpy.context.scene.objects if addon.bp_cost.has_bp_stack(obj)]
+    for obj in objects:
+        with bpy.context.temp_override(object=obj, active_object=obj,
+                selected_objects=[obj], selected_editable_objects=[obj]):
+            addon.bp_modifiers.verify_attributes_exist(obj)
+
+    return objects
+
+def apply_stack(objects):
+    import bpy
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    for obj in objects:
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = bpy.data.meshes.new_from_object(evaluated, preserve_all_data_layers=True, depsgraph=depsgraph)
+        obj.modifiers.clear()
+        obj.data = mesh
+
+def export_scene(fileFormat, output):
+    import bpy
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    if fileFormat == "fbx":
+        bpy.ops.export_scene.fbx(filepath=output, use_mesh_modifiers=True)
+    elif fileFormat == "gltf":
+        bpy.ops.export_scene.gltf(filepath=output, export_format='GLB', export_apply=True)
+    elif fileFormat == "obj":
+        bpy.ops.wm.obj_export(filepath=output, apply_modifiers=True)
+
+def save_file(output):
+    import bpy
+
+    if os.path.abspath(output) == os.path.abspath(bpy.data.filepath):
+        bpy.ops.wm.save_mainfile()
+    else:
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        bpy.ops.wm.save_as_mainfile(filepath=output, copy=True)
+
+def run_task(args, addon, reporter, timings):
+    if args.task == "migrate":
+        import bpy
+
+        #Legacy objects have no BP stack yet, so prepare_objects wouldn't find them
+        migrated, layers = addon.bp_migrate.migrate_objects(reporter, bpy.context.scene.objects)
+        timings["migrate"] = time.perf_counter()
+
+        #In-place runs only touch files that actually had legacy data
+        if migrated or os.path.abspath(args.output) != os.path.abspath(bpy.data.filepath):
+            save_file(args.output)
+        timings["save"] = time.perf_counter()
+        return {"output": args.output, "objects": migrated, "layers": layers}
+
+    if args.task == "macro":
+        import bpy
+
+        with open(args.macro, "r", encoding="utf-8") as file:
+            steps = addon.bp_macro.load_macro(file.read())
+
+        #Every mesh the view layer can select, setup is shared by the whole file
+        viewLayer = bpy.context.view_layer
+        objects = [obj for obj in viewLayer.objects if obj.type == 'MESH']
+        failed = addon.bp_macro.play_macro(reporter, steps, objects)
+        timings["macro"] = time.perf_counter()
+
+        save_file(args.output)
+        timings["save"] = time.perf_counter()
+        return {"output": args.output, "objects": len(objects), "steps": len(steps), "failed": failed}
+
+    objects = prepare_objects(addon, reporter)
+    timings["setup"] = time.perf_counter()
+
+    if args.task == "export":
+        if args.apply:
+            apply_stack(objects)
+            timings["apply"] = time.perf_counter()
+
+        export_scene(args.format, args.output)
+        timings["export"] = time.perf_counter()
+        return {"output": args.output, "objects": len(objects)}
+
+    raise ValueError(f"Unknown task '{args.task}'")
+
+def worker_main(argv):
+    parser = argparse.ArgumentParser(prog="bp_batch worker")
+    parser.add_argument("--result", required=True)
+    parser.add_argument("--task", required=True)
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS))
+    parser.add_argument("--output")
+    parser.add_argument("--apply", action="store_true")
+    parser.add_argument("--macro")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    timings = {}
+    result = {"status": "failed"}
+
+    try:
+        addon = import_addon()
+        timings["load"] = time.perf_counter()
+        result.update(run_task(args, addon, WorkerReporter(), timings))
+        result["status"] = "done"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    #Store how long each step took, not the absolute timestamps
+    previous = start
+    result["timings"] = {}
+    for step, stamp in timings.items():
+        result["timings"][step] = round(stamp - previous, 3)
+        previous = stamp
+
+    with open(args.result, "w", encoding="utf-8") as file:
+        json.dump(result, file)
+
+def main(argv):
+    #Inside Blender our arguments follow the "--" separator
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+
+    if argv and argv[0] == "worker":
+        worker_main(argv[1:])
+        return 0
+
+    args = build_parser().parse_args(argv)
+    return args.run(args)
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:] if "--" not in sys.argv else sys.argv))
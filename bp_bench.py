@@ -0,0 +1,83 @@
+import argparse
+import importlib
+import os
+import sys
+import time
+import types
+
+#Micro-benchmarks of the flag and modifier logic on bp_fake meshes. Runs as plain
+#Python from the addon folder, python bp_bench.py --size 700 (about 1M edges), or
+#from Blender's console through run().
+
+PACKAGE = "blockout_pro"
+
+def addon_module(name: str):
+    #Relative to the addon inside Blender, a bare package around this folder when run
+    #as a script, so __init__ and bpy are never imported
+    package = __package__
+    if not package:
+        package = PACKAGE
+        if package not in sys.modules:
+            shim = types.ModuleType(package)
+            shim.__path__ = [os.path.dirname(os.path.abspath(__file__))]
+            sys.modules[package] = shim
+    return importlib.import_module(f"{package}.{name}")
+
+def measure(function, repeat: int):
+    #Best of the runs in milliseconds, the least disturbed one
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+def cases(size: int):
+    bp_data = addon_module("bp_data")
+    bp_edges = addon_module("bp_edges")
+    bp_fake = addon_module("bp_fake")
+
+    obj = bp_fake.grid_object(size)
+    mesh = obj.data
+    bp_fake.flag_edges(mesh, "bp_bevel_fillet_weighted", 0.1)
+    bp_fake.flag_edges(mesh, "bp_panel_edge", 0.05, seed=1)
+    bp_fake.select_edges(mesh, 0.2, seed=2)
+
+    for name in ("SubD", "Bevel_Constrained", "Bevel_Weighted", "Panelize", "EdgeChamfer"):
+        obj.modifiers.new("BP_" + name, 'BEVEL')
+
+    def take_weights():
+        #Restores the weights it clears so every run does the same work
+        values = bp_data.read_attribute(mesh, "bp_bevel_fillet_weighted")
+        selected = bp_data.read_edge_select(mesh)
+        bp_edges.take_selected_weights(mesh, "bp_bevel_fillet_weighted")
+        bp_data.write_attribute(mesh, "bp_bevel_fillet_weighted", values)
+        mesh.edges.foreach_set("select", selected)
+
+    return len(mesh.edges), [
+        ("set_selected_edges toggle", lambda: bp_edges.set_selected_edges(mesh, "bp_panel_edge")),
+        ("set_selected_edges value", lambda: bp_edges.set_selected_edges(mesh, "bp_bevel_fillet_weighted", 0.5, False)),
+        ("select_flagged_edges", lambda: bp_edges.select_flagged_edges(mesh, "bp_panel_edge")),
+        ("take_selected_weights", take_weights),
+        ("toggle_bp_modifiers", lambda: bp_edges.toggle_bp_modifiers(obj.modifiers)),
+        ("configure_modifier", lambda: bp_edges.configure_modifier(obj.modifiers[0], " BP_SubD", {"segments": 2, "width": 0.1})),
+        ("flagged_edge_counts", lambda: bp_data.flagged_edge_counts(mesh)),
+        ("topology_fingerprint", lambda: bp_data.topology_fingerprint(mesh)),
+    ]
+
+def run(size: int = 300, repeat: int = 5):
+    edgeCount, benchmarks = cases(size)
+    results = [(name, measure(function, repeat)) for name, function in benchmarks]
+
+    print(f"{edgeCount} edges, best of {repeat}")
+    width = max(len(name) for name, _ in results)
+    for name, milliseconds in results:
+        print(f"  {name:<{width}}  {milliseconds:9.3f} ms")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BP flag and modifier logic on fake meshes")
+    parser.add_argument("--size", type=int, default=300, help="Grid faces per side, edges are about 2 * size^2")
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    run(arguments.size, arguments.repeat)
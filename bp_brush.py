@@ -0,0 +1,214 @@
+import bmesh
+
+from bpy_extras import view3d_utils
+from mathutils.bvhtree import BVHTree
+from mathutils.kdtree import KDTree
+
+from . import bp_data
+
+#Edge weight brush. Paints, smooths and erases float edge flags under the cursor
+#straight into the edit mode layers, no selection rounds or mode switches. Hits are
+#found with a BVH ray cast and a KD-tree of edge midpoints, both built once per
+#object and kept until its geometry changes, so a dab only touches the edges it covers.
+
+BRUSH_ATTRIBUTES = {
+    "bp_bevel_fillet_weighted": "Weighted Fillet",
+    "bevel_weight_edge": "Edge Chamfer",
+}
+
+#View navigation events passed on while the brush runs, anything else could undo or
+#leave edit mode under the cached BMesh
+NAVIGATION_EVENTS = {
+    'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE', 'WHEELINMOUSE', 'WHEELOUTMOUSE',
+    'TRACKPADPAN', 'TRACKPADZOOM', 'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE',
+    'NUMPAD_0', 'NUMPAD_1', 'NUMPAD_2', 'NUMPAD_3', 'NUMPAD_4', 'NUMPAD_5', 'NUMPAD_6',
+    'NUMPAD_7', 'NUMPAD_8', 'NUMPAD_9', 'NUMPAD_PERIOD', 'NUMPAD_PLUS', 'NUMPAD_MINUS',
+    'NUMPAD_SLASH', 'NUMPAD_ASTERIX',
+}
+
+#Object name -> edge count, midpoint KD-tree and face BVH
+_index = {}
+
+#Objects being painted, their own layer writes don't invalidate the index
+_painting = set()
+
+def invalidate(name: str = None):
+    if name is None:
+        _index.clear()
+    elif name not in _painting:
+        _index.pop(name, None)
+
+def build_index(obj, bm):
+    #Midpoints read in bulk from the flushed mesh, edge order matches the bmesh
+    obj.update_from_editmode()
+    midpoints, _ = bp_data.edge_midpoints(obj.data)
+
+    tree = KDTree(len(midpoints))
+    for i, co in enumerate(midpoints.tolist()):
+        tree.insert(co, i)
+    tree.balance()
+
+    return {
+        "edges": len(bm.edges),
+        "kdtree": tree,
+        "bvh": BVHTree.FromBMesh(bm),
+    }
+
+def edge_index(obj, bm):
+    cached = _index.get(obj.name)
+    if cached is None or cached["edges"] != len(bm.edges):
+        cached = build_index(obj, bm)
+        _index[obj.name] = cached
+    return cached
+
+def falloff(distance: float, radius: float, curve: str):
+    t = min(distance / radius, 1.0) if radius > 0.0 else 0.0
+    if curve == 'CONSTANT':
+        return 1.0
+    if curve == 'LINEAR':
+        return 1.0 - t
+    return 1.0 - t * t * (3.0 - 2.0 * t)
+
+def edge_layer(bm, attribute_name: str):
+    layer = bm.edges.layers.float.get(attribute_name)
+    if layer is None:
+        layer = bm.edges.layers.float.new(attribute_name)
+    return layer
+
+def linked_layer(bm, attribute_name: str):
+    linkedName = bp_data.LINKED_ATTRIBUTES.get(attribute_name)
+    if linkedName is None:
+        return None
+    layer = bm.edges.layers.bool.get(linkedName)
+    if layer is None:
+        layer = bm.edges.layers.bool.new(linkedName)
+    return layer
+
+# ---------------- Painting -----------------
+def hit_location(self, context, event):
+    #Cursor ray into object space, cast against the cached BVH
+    region = context.region
+    regionData = context.region_data
+    coord = (event.mouse_region_x, event.mouse_region_y)
+    origin = view3d_utils.region_2d_to_origin_3d(region, regionData, coord)
+    direction = view3d_utils.region_2d_to_vector_3d(region, regionData, coord)
+
+    inverse = self.obj.matrix_world.inverted()
+    localOrigin = inverse @ origin
+    localDirection = (inverse.to_3x3() @ direction).normalized()
+    location, _, _, _ = self.index["bvh"].ray_cast(localOrigin, localDirection)
+    return location
+
+def dab(self, context, event):
+    location = hit_location(self, context, event)
+    if location is None:
+        return 0
+
+    #Radius is set in world units, the index is in object space
+    radius = self.radius / max(max(abs(s) for s in self.obj.matrix_world.to_scale()), 1e-9)
+    hits = self.index["kdtree"].find_range(location, radius)
+    if not hits:
+        return 0
+
+    edges = self.bm.edges
+    layer = self.layer
+    mode = self.activeMode
+    for _, i, distance in hits:
+        edge = edges[i]
+        if edge.hide:
+            continue
+
+        old = edge[layer]
+        if i not in self.original:
+            self.original[i] = old
+
+        weight = self.strength * falloff(distance, radius, self.falloff)
+        if mode == 'ERASE':
+            new = old * (1.0 - weight)
+        elif mode == 'SMOOTH':
+            neighbours = [linked[layer] for vert in edge.verts for linked in vert.link_edges if linked is not edge]
+            target = sum(neighbours) / len(neighbours) if neighbours else old
+            new = old + (target - old) * weight
+        else:
+            new = old + (self.value - old) * weight
+
+        edge[layer] = new
+        if self.linked is not None:
+            edge[self.linked] = new > 0.0
+
+    bmesh.update_edit_mesh(self.obj.data, loop_triangles=False, destructive=False)
+    return len(hits)
+
+def header_text(self):
+    label = BRUSH_ATTRIBUTES[self.attributeName]
+    return f"{label} brush: {self.activeMode.title()}, radius {self.radius:.3f}, strength {self.strength:.2f}  |  LMB paint, Shift smooth, Ctrl erase, [ ] radius, RMB/Enter finish, Esc cancel"
+
+def finish(self, context):
+    _painting.discard(self.obj.name)
+    context.area.header_text_set(None)
+    context.window.cursor_modal_restore()
+
+# ---------------- Operators -----------------
+def brush_invoke(self, context, event):
+    obj = context.edit_object
+    if obj is None or obj.type != 'MESH' or context.area.type != 'VIEW_3D':
+        self.report({'WARNING'}, "Edge brush needs a mesh in edit mode in the 3D view")
+        return {'CANCELLED'}
+
+    self.obj = obj
+    self.bm = bmesh.from_edit_mesh(obj.data)
+    self.bm.edges.ensure_lookup_table()
+    self.layer = edge_layer(self.bm, self.attributeName)
+    self.linked = linked_layer(self.bm, self.attributeName)
+    self.index = edge_index(obj, self.bm)
+    self.original = {}
+    self.stroke = False
+    self.activeMode = self.mode
+
+    _painting.add(obj.name)
+    context.window.cursor_modal_set('PAINT_BRUSH')
+    context.area.header_text_set(header_text(self))
+    context.window_manager.modal_handler_add(self)
+    return {'RUNNING_MODAL'}
+
+def brush_modal(self, context, event):
+    #The BMesh is gone once the object left edit mode some other way, nothing to restore
+    if context.edit_object is not self.obj or not self.bm.is_valid:
+        finish(self, context)
+        return {'CANCELLED'}
+
+    if event.type in {'RIGHTMOUSE', 'RET', 'NUMPAD_ENTER'} and event.value == 'PRESS':
+        finish(self, context)
+        return {'FINISHED'}
+
+    if event.type == 'ESC' and event.value == 'PRESS':
+        edges = self.bm.edges
+        for i, old in self.original.items():
+            edges[i][self.layer] = old
+            if self.linked is not None:
+                edges[i][self.linked] = old > 0.0
+        bmesh.update_edit_mesh(self.obj.data, loop_triangles=False, destructive=False)
+        finish(self, context)
+        return {'CANCELLED'}
+
+    if event.type in {'LEFT_BRACKET', 'RIGHT_BRACKET'} and event.value == 'PRESS':
+        self.radius *= 1.0 / 1.15 if event.type == 'LEFT_BRACKET' else 1.15
+        context.area.header_text_set(header_text(self))
+        return {'RUNNING_MODAL'}
+
+    if event.type == 'LEFTMOUSE':
+        self.stroke = event.value == 'PRESS'
+        if self.stroke:
+            self.activeMode = 'ERASE' if event.ctrl else 'SMOOTH' if event.shift else self.mode
+            context.area.header_text_set(header_text(self))
+            dab(self, context, event)
+        return {'RUNNING_MODAL'}
+
+    if event.type in {'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE'} and self.stroke:
+        dab(self, context, event)
+        return {'RUNNING_MODAL'}
+
+    #Navigation keeps working while the brush is active, other hotkeys wait for it to end
+    if event.type in NAVIGATION_EVENTS or event.type.startswith("NDOF_"):
+        return {'PASS_THROUGH'}
+    return {'RUNNING_MODAL'}
@@ -0,0 +1,264 @@
+import bpy
+import os
+import struct
+import zlib
+import numpy as np
+
+from . import bp_data
+from . import bp_freeze
+
+#Disk cache of evaluated BP geometry. Entries are keyed by the freeze fingerprint
+#(mesh data, BP edge attributes and BP modifier settings) and written on save.
+#On load, objects with a matching entry are frozen to the cached geometry right away
+#and thawed back to the live stack one by one from a timer.
+
+MAGIC = b"BPC1"
+EXTENSION = ".bpc"
+
+#magic, vertex count, corner count, face count, layer bits
+HEADER = struct.Struct("<4sIIII")
+
+LAYER_UV = 1
+LAYER_SHARP_FACE = 2
+LAYER_NORMALS = 4
+LAYER_MATERIALS = 8
+
+THAW_INTERVAL = 0.05
+
+#Object name -> cache key, dropped when the depsgraph reports a geometry update
+_known_keys = {}
+_thaw_queue = []
+
+def cache_directory(scene):
+    props = scene.bp_cache_props
+    if props.location == 'DIRECTORY' and props.directory:
+        return bpy.path.abspath(props.directory)
+    if bpy.data.filepath:
+        return os.path.join(os.path.dirname(bpy.data.filepath), ".bp_cache")
+    return None
+
+def object_key(obj):
+    key = _known_keys.get(obj.name)
+    if key is None:
+        key = bp_freeze.freeze_fingerprint(obj, obj.data)
+        _known_keys[obj.name] = key
+    return key
+
+def invalidate(name=None):
+    if name is None:
+        _known_keys.clear()
+    else:
+        _known_keys.pop(name, None)
+
+# ---------------- File format -----------------
+def encode_mesh(mesh):
+    positions = bp_data.read_positions(mesh)
+    loopVertices = bp_data.read_loop_vertices(mesh)
+    loopStarts = bp_data.read_loop_starts(mesh)
+
+    layers = 0
+    chunks = [positions.tobytes(), loopVertices.tobytes(), loopStarts.tobytes()]
+
+    uvLayer = mesh.uv_layers.active
+    if uvLayer is not None:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uvLayer.data.foreach_get("uv", uvs)
+        chunks.append(uvs.tobytes())
+        layers |= LAYER_UV
+
+    sharpFaces = bp_data.read_attribute(mesh, "sharp_face", np.bool_)
+    if sharpFaces is not None:
+        chunks.append(np.packbits(sharpFaces).tobytes())
+        layers |= LAYER_SHARP_FACE
+
+    #Half floats are plenty for unit normals and halve the entry size
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    mesh.corner_normals.foreach_get("vector", normals)
+    chunks.append(normals.astype(np.float16).tobytes())
+    layers |= LAYER_NORMALS
+
+    materials = bp_data.read_attribute(mesh, "material_index", np.int32)
+    if materials is not None:
+        chunks.append(materials.astype(np.int16).tobytes())
+        layers |= LAYER_MATERIALS
+
+    header = HEADER.pack(MAGIC, len(mesh.vertices), len(mesh.loops), len(mesh.polygons), layers)
+    return header + zlib.compress(b"".join(chunks), 1)
+
+def decode_mesh(data, name, materials=()):
+    magic, vertCount, loopCount, faceCount, layers = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a BP cache entry")
+
+    payload = zlib.decompress(data[HEADER.size:])
+    offset = 0
+
+    def take(dtype, count):
+        nonlocal offset
+        array = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array
+
+    positions = take(np.float32, vertCount * 3)
+    loopVertices = take(np.int32, loopCount)
+    loopStarts = take(np.int32, faceCount)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(vertCount)
+    mesh.vertices.foreach_set("co", positions)
+    mesh.loops.add(loopCount)
+    mesh.loops.foreach_set("vertex_index", loopVertices)
+    mesh.polygons.add(faceCount)
+    mesh.polygons.foreach_set("loop_start", loopStarts)
+    mesh.update(calc_edges=True)
+
+    for material in materials:
+        mesh.materials.append(material)
+
+    if layers & LAYER_UV:
+        uvs = take(np.float32, loopCount * 2)
+        mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", uvs)
+
+    if layers & LAYER_SHARP_FACE:
+        packed = take(np.uint8, (faceCount + 7) // 8)
+        sharpFaces = np.unpackbits(packed, count=faceCount).astype(np.bool_)
+        mesh.attributes.new("sharp_face", 'BOOLEAN', 'FACE').data.foreach_set("value", sharpFaces)
+
+    if layers & LAYER_NORMALS:
+        normals = take(np.float16, loopCount * 3).astype(np.float32)
+        mesh.normals_split_custom_set(normals.reshape(-1, 3))
+
+    if layers & LAYER_MATERIALS:
+        indices = take(np.int16, faceCount).astype(np.int32)
+        mesh.attributes.new("material_index", 'INT', 'FACE').data.foreach_set("value", indices)
+
+    return mesh
+
+# ---------------- Storage -----------------
+def entry_path(directory, key):
+    return os.path.join(directory, key + EXTENSION)
+
+def read_entry(directory, key):
+    path = entry_path(directory, key)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    #Touch the entry so eviction sees it as recently used
+    os.utime(path)
+    return data
+
+def write_entry(directory, key, data):
+    os.makedirs(directory, exist_ok=True)
+    tempPath = entry_path(directory, key) + ".tmp"
+    with open(tempPath, "wb") as file:
+        file.write(data)
+    os.replace(tempPath, entry_path(directory, key))
+
+def evict(directory, maxBytes):
+    #Least recently used entries go first until the cache fits the cap
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(EXTENSION):
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= maxBytes:
+            break
+        os.remove(path)
+        total -= size
+
+# ---------------- Handlers -----------------
+def _cacheable(obj):
+    return obj.type == 'MESH' and any("BP" in mod.name for mod in obj.modifiers) and not bp_freeze.is_frozen(obj)
+
+def _cache_frozen(obj):
+    #Frozen to a cache hit on load and still waiting for its thaw
+    return bp_freeze.is_frozen(obj) and obj[bp_freeze.FREEZE_KEY].get("cached", False)
+
+def thaw_cached(objects):
+    for obj in objects:
+        if _cache_frozen(obj):
+            bp_freeze.thaw_object(obj)
+
+def on_save_pre(scene):
+    #Cached geometry only stands in until the thaw, it must never end up in the file
+    thaw_cached(scene.objects)
+
+def on_save_post(scene):
+    props = scene.bp_cache_props
+    directory = cache_directory(scene)
+    if not props.use_cache or directory is None:
+        return
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    written = False
+    for obj in scene.objects:
+        if not _cacheable(obj):
+            continue
+
+        key = object_key(obj)
+        if os.path.exists(entry_path(directory, key)):
+            continue
+
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            write_entry(directory, key, encode_mesh(mesh))
+            written = True
+        finally:
+            evaluated.to_mesh_clear()
+
+    if written:
+        evict(directory, props.max_size_mb * 1024 * 1024)
+
+def on_load_post(scene):
+    invalidate()
+    _thaw_queue.clear()
+
+    #Files saved before their thaw came around, put the live stack back first so the
+    #objects are looked up in the cache like any other
+    thaw_cached(scene.objects)
+
+    props = scene.bp_cache_props
+    directory = cache_directory(scene)
+    if not props.use_cache or directory is None or not os.path.isdir(directory):
+        return
+
+    for obj in scene.objects:
+        if not _cacheable(obj):
+            continue
+
+        key = object_key(obj)
+        data = read_entry(directory, key)
+        if data is None:
+            continue
+
+        try:
+            mesh = decode_mesh(data, obj.data.name, obj.data.materials)
+        except (ValueError, zlib.error) as e:
+            print("Skipped broken BP cache entry " + key + ": " + str(e))
+            continue
+
+        #Show the cached result now, bring the live stack back later
+        bp_freeze.freeze_object(obj, None, frozenMesh=mesh, fingerprint=key)
+        obj[bp_freeze.FREEZE_KEY]["cached"] = True
+        _thaw_queue.append(obj.name)
+
+    if _thaw_queue and not bpy.app.timers.is_registered(_thaw_next):
+        bpy.app.timers.register(_thaw_next, first_interval=THAW_INTERVAL)
+
+def _thaw_next():
+    #One object per tick keeps the UI responsive while the stacks re-evaluate
+    while _thaw_queue:
+        obj = bpy.data.objects.get(_thaw_queue.pop(0))
+        if obj is not None and bp_freeze.is_frozen(obj) and obj[bp_freeze.FREEZE_KEY].get("cached"):
+            bp_freeze.thaw_object(obj)
+            return THAW_INTERVAL
+
+    return None
@@ -0,0 +1,150 @@
+import bpy
+import numpy as np
+
+from . import bp_data
+from . import bp_panels
+from . import bp_region
+
+#Chain index of flagged edges. Flagged edges meeting at a vertex with exactly two
+#flagged edges belong to the same chain, junctions and open ends split chains, and a
+#chain without ends is a loop. Indexes are cached per object until the depsgraph
+#reports a geometry update.
+
+#Attribute -> sidebar label
+CHAIN_ATTRIBUTES = {
+    "bp_panel_edge": "Panels",
+    "bevel_weight_edge": "Chamfers",
+    "bp_bevel_fillet_constrained": "Constrained",
+    "bp_bevel_fillet_weighted": "Weighted",
+    "sharp_edge": "Sharp",
+}
+
+#Object name -> {attribute name: chain index}
+_chain_cache = {}
+
+def build_index(mesh, attribute_name: str):
+    values = bp_data.read_attribute(mesh, attribute_name, np.float32)
+    edges = np.empty(0, dtype=np.int32) if values is None else np.flatnonzero(values > 0).astype(np.int32)
+
+    edgeVerts = bp_data.read_edge_vertices(mesh)[edges]
+    verts = edgeVerts.reshape(-1)
+    owners = np.repeat(np.arange(len(edges), dtype=np.int32), 2)
+    degree = np.bincount(verts, minlength=len(mesh.vertices))
+
+    #Both flagged edges of a degree two vertex sit next to each other once sorted
+    order = np.argsort(verts, kind='stable')
+    sortedVerts = verts[order]
+    same = np.flatnonzero(sortedVerts[1:] == sortedVerts[:-1])
+    same = same[degree[sortedVerts[same]] == 2]
+    chains = bp_data.connected_components(len(edges), owners[order[same]], owners[order[same + 1]])
+    chainCount = int(chains.max()) + 1 if len(chains) else 0
+
+    ends = np.bincount(chains[owners], weights=(degree[verts] != 2).astype(np.float64), minlength=chainCount)
+
+    positions = bp_data.read_positions(mesh)
+    edgeLengths = np.linalg.norm(positions[edgeVerts[:, 0]] - positions[edgeVerts[:, 1]], axis=1)
+
+    return {
+        "edges": edges,
+        "chains": chains,
+        "count": chainCount,
+        "loops": ends == 0,
+        "lengths": np.bincount(chains, weights=edgeLengths, minlength=chainCount),
+    }
+
+def chain_index(obj, attribute_name: str):
+    indexes = _chain_cache.setdefault(obj.name, {})
+    index = indexes.get(attribute_name)
+    if index is None:
+        index = build_index(obj.data, attribute_name)
+        indexes[attribute_name] = index
+    return index
+
+def invalidate(name=None):
+    if name is None:
+        _chain_cache.clear()
+    else:
+        _chain_cache.pop(name, None)
+
+def chain_stats(obj, attribute_name: str):
+    index = chain_index(obj, attribute_name)
+    lengths = index["lengths"]
+    return {
+        "chains": index["count"],
+        "loops": int(np.count_nonzero(index["loops"])),
+        "length": float(lengths.sum()),
+        "longest": float(lengths.max()) if len(lengths) else 0.0,
+    }
+
+def selected_chain_edges(obj, attribute_name: str, edgeSelect):
+    #Every edge of the chains running through the selected edges
+    index = chain_index(obj, attribute_name)
+    edges = index["edges"]
+    chains = index["chains"]
+    touched = np.unique(chains[edgeSelect[edges]])
+    return edges[np.isin(chains, touched)]
+
+def attribute_names(attribute_name: str):
+    return list(CHAIN_ATTRIBUTES) if attribute_name == 'ALL' else [attribute_name]
+
+# ---------------- Operators -----------------
+def select_chains(self, context):
+    obj = context.active_object
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    mesh = obj.data
+    edgeSelect = bp_data.read_edge_select(mesh)
+    vertSelect = np.empty(len(mesh.vertices), dtype=np.bool_)
+    mesh.vertices.foreach_get("select", vertSelect)
+
+    selected = 0
+    for attribute_name in attribute_names(self.attributeName):
+        chainEdges = selected_chain_edges(obj, attribute_name, edgeSelect)
+        selected += len(chainEdges)
+        edgeSelect[chainEdges] = True
+        vertSelect[bp_data.read_edge_vertices(mesh)[chainEdges].reshape(-1)] = True
+
+    mesh.edges.foreach_set("select", edgeSelect)
+    mesh.vertices.foreach_set("select", vertSelect)
+
+    bpy.ops.object.mode_set(mode='EDIT')
+    self.report({'INFO'}, f"Selected {selected} chain edges")
+    return {'FINISHED'}
+
+def set_chains(self, context):
+    obj = context.active_object
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    mesh = obj.data
+    edgeSelect = bp_data.read_edge_select(mesh)
+
+    #Collect first, writing one attribute must not change the chains of the next
+    changes = [(name, selected_chain_edges(obj, name, edgeSelect)) for name in attribute_names(self.attributeName)]
+
+    changed = 0
+    for attribute_name, chainEdges in changes:
+        if len(chainEdges) == 0:
+            continue
+
+        values = bp_data.read_attribute(mesh, attribute_name, bp_data.BP_EDGE_ATTRIBUTES[attribute_name])
+        values[chainEdges] = self.value
+        bp_data.write_attribute(mesh, attribute_name, values)
+
+        linkedName = bp_data.LINKED_ATTRIBUTES.get(attribute_name)
+        if linkedName is not None and linkedName in mesh.attributes:
+            linked = bp_data.read_attribute(mesh, linkedName, np.bool_)
+            linked[chainEdges] = self.value > 0
+            bp_data.write_attribute(mesh, linkedName, linked)
+
+        changed += len(chainEdges)
+
+    mesh.update()
+    invalidate(obj.name)
+    if any(name == "bp_panel_edge" and len(chainEdges) for name, chainEdges in changes):
+        bp_panels.update_islands(mesh)
+    if any(name in bp_region.REGION_ATTRIBUTES and len(chainEdges) for name, chainEdges in changes):
+        bp_region.update_region(obj)
+
+    bpy.ops.object.mode_set(mode='EDIT')
+    self.report({'INFO'}, f"Set {changed} chain edges to {self.value:g}")
+    return {'FINISHED'}
@@ -0,0 +1,337 @@
+import heapq
+import math
+import time
+
+from . import bp_data
+
+#Scene-wide triangle budget solver for BP segment counts and SubD levels.
+#Costs are predicted analytically from the flagged-edge counts and the stack
+#settings, so the solver never has to let Blender evaluate the stack.
+
+#Bases are cached per object until the depsgraph reports a geometry update
+_base_cache = {}
+
+#Modifier name -> operator property holding the highest allowed value
+BUDGET_KNOBS = {
+    " BP_SubD": "maxSubdLevels",
+    " BP_Bevel_Constrained": "maxConstrainedSegments",
+    " BP_Bevel_Weighted": "maxWeightedSegments",
+    " BP_EdgeChamfer": "maxEdgeChamferSegments",
+}
+
+def has_bp_stack(obj):
+    return obj.type == 'MESH' and any("BP" in mod.name for mod in obj.modifiers)
+
+def read_base(obj, sync_edit: bool = True):
+    #Edit mode data lives in the bmesh until flushed, can't flush from draw code
+    if sync_edit and obj.mode == 'EDIT':
+        obj.update_from_editmode()
+
+    mesh = obj.data
+    base = bp_data.mesh_counts(mesh)
+    base["boundary"] = bp_data.boundary_edge_count(mesh)
+    base["flags"] = bp_data.flagged_edge_counts(mesh)
+    return base
+
+def cached_base(obj):
+    base = _base_cache.get(obj.name)
+    if base is None:
+        base = read_base(obj, sync_edit=False)
+        _base_cache[obj.name] = base
+    return base
+
+def invalidate(name=None):
+    if name is None:
+        _base_cache.clear()
+    else:
+        _base_cache.pop(name, None)
+
+def read_stack(obj):
+    #Describe each visible BP modifier as a stage the estimator understands
+    stages = []
+    for mod in obj.modifiers:
+        if "BP" not in mod.name or not mod.show_viewport:
+            continue
+
+        if mod.type == 'NODES' and mod.name == " BP_SubD":
+            stages.append({"name": mod.name, "kind": "SUBD", "value": int(mod.get("Socket_4", 1))})
+        elif mod.type == 'NODES' and mod.name == " BP_PanelSplit":
+            stages.append({"name": mod.name, "kind": "SPLIT", "attribute": "bp_panel_edge"})
+        elif mod.type == 'BEVEL' and mod.limit_method == 'WEIGHT':
+            attribute = mod.edge_weight if mod.edge_weight else "bevel_weight_edge"
+            stages.append({"name": mod.name, "kind": "BEVEL", "attribute": attribute, "value": mod.segments})
+        elif mod.type == 'SOLIDIFY' and mod.use_rim_only:
+            stages.append({"name": mod.name, "kind": "RIM"})
+        elif mod.type == 'MIRROR':
+            stages.append({"name": mod.name, "kind": "MIRROR", "value": sum(bool(axis) for axis in mod.use_axis)})
+
+    return stages
+
+def _scale(state, factor):
+    for key in ("verts", "edges", "faces", "corners", "boundary"):
+        state[key] *= factor
+    for name in state["flags"]:
+        state["flags"][name] *= factor
+
+def _add(state, verts, faces, corners):
+    #Edges follow from Euler's formula, the topology genus is unchanged
+    state["verts"] += verts
+    state["faces"] += faces
+    state["edges"] += verts + faces
+    state["corners"] += corners
+
+def apply_stage(state, stage, value=None):
+    kind = stage["kind"]
+    value = stage.get("value") if value is None else value
+
+    if kind == "SUBD":
+        #Catmull-Clark: every corner becomes a quad, every edge splits in two
+        for _ in range(value):
+            verts, edges, faces, corners = state["verts"], state["edges"], state["faces"], state["corners"]
+            state["verts"] = verts + edges + faces
+            state["edges"] = 2 * edges + corners
+            state["faces"] = corners
+            state["corners"] = 4 * corners
+            state["boundary"] *= 2
+            for name in state["flags"]:
+                state["flags"][name] *= 2
+
+    elif kind == "BEVEL":
+        #Each beveled edge turns into a strip of quads, one per segment
+        added = state["flags"].get(stage["attribute"], 0) * value
+        _add(state, verts=added, faces=added, corners=4 * added)
+        state["flags"][stage["attribute"]] = 0
+
+    elif kind == "SPLIT":
+        #Splitting a panel edge duplicates it and its vertices into a new boundary
+        split = state["flags"].get(stage["attribute"], 0)
+        state["verts"] += split
+        state["edges"] += split
+        state["boundary"] += 2 * split
+
+    elif kind == "RIM":
+        #Rim-only solidify adds one quad per boundary edge
+        rim = state["boundary"]
+        _add(state, verts=rim, faces=rim, corners=4 * rim)
+
+    elif kind == "MIRROR":
+        _scale(state, 2 ** value)
+
+    return state
+
+def planned_stack(self, obj):
+    #Stack OBJECT_OT_add_modifiers would produce, existing modifiers are kept as is
+    #and new ones get appended in the order bp_functions.add_modifiers adds them
+    stages = read_stack(obj)
+    full = not self.simplifiedStack
+
+    planned = []
+    if self.addSubD:
+        planned.append({"name": " BP_SubD", "kind": "SUBD", "value": self.subdLevels})
+    if self.addFilletConstrained and full:
+        planned.append({"name": " BP_Bevel_Constrained", "kind": "BEVEL",
+            "attribute": "bp_bevel_fillet_constrained", "value": self.constrainedFilletSegments})
+    if self.addFilletWeighted and full:
+        planned.append({"name": " BP_Bevel_Weighted", "kind": "BEVEL",
+            "attribute": "bp_bevel_fillet_weighted", "value": self.weightedFilletSegments})
+    if self.addPanelling:
+        planned.append({"name": " BP_PanelSplit", "kind": "SPLIT", "attribute": "bp_panel_edge"})
+        planned.append({"name": " BP_Panelize", "kind": "RIM"})
+    if self.addEdgeChamfer:
+        planned.append({"name": " BP_EdgeChamfer", "kind": "BEVEL",
+            "attribute": "bevel_weight_edge", "value": self.edgeChamferSegments})
+
+    for stage in planned:
+        if obj.modifiers.get(stage["name"]) is None:
+            stages.append(stage)
+
+    return stages
+
+def estimate_stages(base, stages):
+    #Running totals after each stage, for the per-stage breakdown
+    state = dict(base)
+    state["flags"] = dict(base["flags"])
+
+    results = [("Base", dict(state))]
+    for stage in stages:
+        apply_stage(state, stage)
+        results.append((stage["name"].strip(), dict(state)))
+
+    return results
+
+def estimate_planned_triangles(self, objects):
+    #Heaviest object the add_modifiers settings would produce
+    heaviest = 0
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        heaviest = max(heaviest, triangles(estimate(cached_base(obj), planned_stack(self, obj))))
+
+    return heaviest
+
+def estimate(base, stages, overrides=None):
+    state = dict(base)
+    state["flags"] = dict(base["flags"])
+    overrides = overrides or {}
+
+    for stage in stages:
+        apply_stage(state, stage, overrides.get(stage["name"]))
+
+    return state
+
+def triangles(state):
+    #An n-gon fans into n-2 triangles
+    return state["corners"] - 2 * state["faces"]
+
+def estimate_triangles(obj):
+    return triangles(estimate(read_base(obj), read_stack(obj)))
+
+def time_evaluation(context, obj, repeats: int = 3):
+    #Median wall time of re-evaluating one object's stack
+    depsgraph = context.evaluated_depsgraph_get()
+    timings = []
+    for _ in range(repeats):
+        obj.update_tag()
+        start = time.perf_counter()
+        depsgraph.update()
+        timings.append(time.perf_counter() - start)
+
+    return sorted(timings)[len(timings) // 2]
+
+def _mesh_triangles(obj):
+    mesh = obj.data
+    return len(mesh.loops) - 2 * len(mesh.polygons)
+
+def solve_budget(entries, budget):
+    #Greedy marginal analysis: start every knob at 1, then keep raising the one
+    #buying the most importance per added triangle until the budget is spent.
+    #entries: list of dicts with base, stages, importance and knobs {name: cap}
+    values = []
+    totals = []
+    for entry in entries:
+        entryValues = {name: 1 for name in entry["knobs"]}
+        values.append(entryValues)
+        totals.append(triangles(estimate(entry["base"], entry["stages"], entryValues)))
+
+    spent = sum(totals)
+    versions = [0] * len(entries)
+    heap = []
+
+    def push_candidates(index):
+        entry = entries[index]
+        for name, cap in entry["knobs"].items():
+            current = values[index][name]
+            if current >= cap:
+                continue
+
+            trial = dict(values[index])
+            trial[name] = current + 1
+            cost = triangles(estimate(entry["base"], entry["stages"], trial)) - totals[index]
+            gain = entry["importance"] * (math.log2(current + 2) - math.log2(current + 1))
+            heapq.heappush(heap, (-gain / max(cost, 1), index, name, versions[index], cost))
+
+    for index in range(len(entries)):
+        push_candidates(index)
+
+    while heap:
+        _, index, name, version, cost = heapq.heappop(heap)
+        if version != versions[index]:
+            continue
+        if spent + cost > budget:
+            continue
+
+        values[index][name] += 1
+        totals[index] += cost
+        spent += cost
+
+        #Raising one knob changes the cost of the others (SubD multiplies bevels)
+        versions[index] += 1
+        push_candidates(index)
+
+    return values, spent
+
+def write_settings(objects, values):
+    #Single batched pass, only touching modifiers whose value actually changes
+    changed = 0
+    for obj, objValues in zip(objects, values):
+        objChanged = False
+        for name, value in objValues.items():
+            mod = obj.modifiers.get(name)
+            if mod is None:
+                continue
+
+            if mod.type == 'NODES':
+                if mod.get("Socket_4") != value:
+                    mod["Socket_4"] = value
+                    objChanged = True
+            elif mod.segments != value:
+                mod.segments = value
+                objChanged = True
+
+        if objChanged:
+            #Socket values set as ID properties don't tag the object by themselves
+            obj.update_tag()
+            changed += 1
+
+    return changed
+
+def triangle_budget(self, context):
+    if self.budgetMode == 'FRAME_TIME':
+        budget = int(self.targetFrameTime * self.trianglesPerMs)
+    else:
+        budget = self.targetTriangles
+
+    if self.useSelection:
+        scope = set(obj.name for obj in context.selected_objects)
+    else:
+        scope = None
+
+    objects = []
+    entries = []
+    fixed = 0
+
+    for obj in context.visible_objects:
+        if obj.type != 'MESH':
+            continue
+
+        inScope = scope is None or obj.name in scope
+        if not has_bp_stack(obj) or not inScope:
+            #Objects outside the solve still take their share of the budget
+            fixed += estimate_triangles(obj) if has_bp_stack(obj) else _mesh_triangles(obj)
+            continue
+
+        base = read_base(obj)
+        stages = read_stack(obj)
+
+        #Only solve knobs that actually produce geometry on this object
+        knobs = {}
+        for stage in stages:
+            prop = BUDGET_KNOBS.get(stage["name"])
+            if prop is None:
+                continue
+            if stage["kind"] == "BEVEL" and base["flags"].get(stage["attribute"], 0) == 0:
+                continue
+            knobs[stage["name"]] = getattr(self, prop)
+
+        objects.append(obj)
+        entries.append({
+            "base": base,
+            "stages": stages,
+            "importance": max(obj.dimensions.length, 1e-6),
+            "knobs": knobs,
+        })
+
+    if not entries:
+        self.report({'WARNING'}, "No objects with BP modifiers to solve")
+        return {'CANCELLED'}
+
+    values, spent = solve_budget(entries, budget - fixed)
+    changed = write_settings(objects, values)
+
+    total = spent + fixed
+    if total > budget:
+        self.report({'WARNING'}, f"Budget of {budget:,} triangles can't be met, lowest settings give {total:,}")
+    else:
+        self.report({'INFO'}, f"Estimated {total:,} / {budget:,} triangles, updated {changed} objects")
+
+    return {'FINISHED'}
@@ -0,0 +1,303 @@
+import hashlib
+import os
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+
+#Edge attributes driving the BP stack and the dtype used for bulk reads
+BP_EDGE_ATTRIBUTES = {
+    "bp_bevel_fillet_constrained": np.bool_,
+    "bp_bevel_fillet_weighted": np.float32,
+    "bp_panel_edge": np.bool_,
+    "bevel_weight_edge": np.float32,
+    "sharp_edge": np.bool_,
+}
+
+#Attribute data type for each BP edge attribute
+BP_EDGE_ATTRIBUTE_TYPES = {
+    "bp_bevel_fillet_constrained": 'BOOLEAN',
+    "bp_bevel_fillet_weighted": 'FLOAT',
+    "bp_panel_edge": 'BOOLEAN',
+    "bevel_weight_edge": 'FLOAT',
+    "sharp_edge": 'BOOLEAN',
+}
+
+#Flags mirrored into native edge layers, same as set_edge_attribute does
+LINKED_ATTRIBUTES = {
+    "bp_panel_edge": "uv_seam",
+    "bp_bevel_fillet_weighted": "freestyle_edge",
+    "bp_bevel_fillet_constrained": "freestyle_edge",
+}
+
+#Buffer dtype foreach_get expects for each single-value attribute type
+VALUE_DTYPES = {
+    'BOOLEAN': np.bool_,
+    'FLOAT': np.float32,
+    'INT': np.int32,
+    'INT8': np.int8,
+}
+
+def read_attribute(mesh, attribute_name: str, dtype=np.float32):
+    #Bulk read a single-value attribute, returns None if missing
+    attribute = mesh.attributes.get(attribute_name)
+    if attribute is None:
+        return None
+
+    values = np.empty(len(attribute.data), dtype=VALUE_DTYPES.get(attribute.data_type, dtype))
+    attribute.data.foreach_get("value", values)
+    return values.astype(dtype, copy=False)
+
+def write_attribute(mesh, attribute_name: str, values):
+    attribute = mesh.attributes[attribute_name]
+    dtype = VALUE_DTYPES.get(attribute.data_type, np.float32)
+    attribute.data.foreach_set("value", np.ascontiguousarray(values, dtype=dtype))
+
+def ensure_attribute(mesh, attribute_name: str, data_type: str, domain: str = 'EDGE'):
+    attribute = mesh.attributes.get(attribute_name)
+    if attribute is None:
+        attribute = mesh.attributes.new(name=attribute_name, type=data_type, domain=domain)
+    return attribute
+
+def read_edge_vertices(mesh):
+    edge_vertices = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_vertices)
+    return edge_vertices.reshape(-1, 2)
+
+def read_loop_edges(mesh):
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+    return loop_edges
+
+def read_edge_select(mesh):
+    edge_select = np.empty(len(mesh.edges), dtype=np.bool_)
+    mesh.edges.foreach_get("select", edge_select)
+    return edge_select
+
+def write_edge_select(mesh, edge_select):
+    #Vertices follow their edges so the selection survives entering edit mode
+    vert_select = np.zeros(len(mesh.vertices), dtype=np.bool_)
+    vert_select[read_edge_vertices(mesh)[edge_select].reshape(-1)] = True
+    mesh.edges.foreach_set("select", np.ascontiguousarray(edge_select, dtype=np.bool_))
+    mesh.vertices.foreach_set("select", vert_select)
+
+def mesh_counts(mesh):
+    return {
+        "verts": len(mesh.vertices),
+        "edges": len(mesh.edges),
+        "faces": len(mesh.polygons),
+        "corners": len(mesh.loops),
+    }
+
+def flagged_edge_counts(mesh):
+    #Count edges with a non-zero value for every BP edge attribute
+    counts = {}
+    for attribute_name, dtype in BP_EDGE_ATTRIBUTES.items():
+        values = read_attribute(mesh, attribute_name, dtype)
+        counts[attribute_name] = 0 if values is None else int(np.count_nonzero(values))
+
+    return counts
+
+def boundary_edge_count(mesh):
+    #Edges used by exactly one face corner are open boundaries
+    if len(mesh.edges) == 0:
+        return 0
+
+    face_users = np.bincount(read_loop_edges(mesh), minlength=len(mesh.edges))
+    return int(np.count_nonzero(face_users == 1))
+
+def read_positions(mesh):
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    return positions.reshape(-1, 3)
+
+def read_loop_vertices(mesh):
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    return loop_vertices
+
+def read_loop_starts(mesh):
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    return loop_starts
+
+def mesh_fingerprint(mesh):
+    #Hash of positions, topology and BP edge flags
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(read_positions(mesh).tobytes())
+    digest.update(read_edge_vertices(mesh).tobytes())
+    digest.update(read_loop_vertices(mesh).tobytes())
+    digest.update(read_loop_starts(mesh).tobytes())
+
+    for attribute_name, dtype in BP_EDGE_ATTRIBUTES.items():
+        values = read_attribute(mesh, attribute_name, dtype)
+        digest.update(attribute_name.encode())
+        digest.update(b"-" if values is None else values.tobytes())
+
+    return digest.hexdigest()
+
+def topology_fingerprint(mesh, attribute_names=()):
+    #Hash of connectivity and the given edge flags, vertex positions left out
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(read_edge_vertices(mesh).tobytes())
+    digest.update(read_loop_vertices(mesh).tobytes())
+    digest.update(read_loop_starts(mesh).tobytes())
+
+    for attribute_name in attribute_names:
+        values = read_attribute(mesh, attribute_name, np.bool_)
+        digest.update(attribute_name.encode())
+        digest.update(b"-" if values is None else values.tobytes())
+
+    return digest.hexdigest()
+
+def read_loop_totals(mesh):
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return loop_totals
+
+def read_face_normals(mesh):
+    normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+    mesh.polygons.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+def loop_faces(loop_totals):
+    #Face index of every corner
+    return np.repeat(np.arange(len(loop_totals), dtype=np.int32), loop_totals)
+
+def manifold_edge_faces(edge_count: int, loop_edges, loop_face_indices):
+    #Edges shared by exactly two faces, with those two faces
+    order = np.argsort(loop_edges, kind='stable')
+    counts = np.bincount(loop_edges, minlength=edge_count)
+    starts = np.cumsum(counts) - counts
+
+    edges = np.flatnonzero(counts == 2)
+    first = loop_face_indices[order[starts[edges]]]
+    second = loop_face_indices[order[starts[edges] + 1]]
+    return edges, first, second
+
+def edge_face_pairs(loop_edges, loop_face_indices):
+    #Pairs of faces sharing an edge, faces around non-manifold edges are chained
+    order = np.argsort(loop_edges, kind='stable')
+    sorted_edges = loop_edges[order]
+    same = np.flatnonzero(sorted_edges[1:] == sorted_edges[:-1])
+    return sorted_edges[same], loop_face_indices[order[same]], loop_face_indices[order[same + 1]]
+
+def connected_components(count: int, first, second):
+    #Vectorized union-find: every pair hooks the larger root onto the smaller one,
+    #then pointer jumping flattens the trees, until no pair joins two roots anymore.
+    #Returns compact labels numbered in order of each component's lowest index
+    parent = np.arange(count, dtype=np.int32)
+    while True:
+        a = parent[first]
+        b = parent[second]
+        joining = a != b
+        if not joining.any():
+            break
+
+        np.minimum.at(parent, np.maximum(a, b)[joining], np.minimum(a, b)[joining])
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+    _, labels = np.unique(parent, return_inverse=True)
+    return labels.astype(np.int32).reshape(-1)
+
+#Odd multipliers for hashing grid cells, collisions only add candidates
+CELL_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+
+def cell_hash(cells):
+    return (cells * CELL_PRIMES).sum(axis=1)
+
+def match_points(source, target, tolerance: float, source_dirs=None, target_dirs=None, min_dot: float = 0.0):
+    #Nearest source point within tolerance of every target point, -1 if none.
+    #Points are hashed into cells twice the tolerance wide, so anything in range sits
+    #in one of the 8 cells on the target's side of its own cell, and the whole match is
+    #a handful of sorted array lookups. With directions given, candidates must also
+    #be parallel (either way) within min_dot
+    best = np.full(len(target), -1, dtype=np.int64)
+    if len(source) == 0 or len(target) == 0:
+        return best
+
+    bestDistance = np.full(len(target), np.inf)
+    cellSize = max(tolerance, 1e-9) * 2.0
+    sourceHash = cell_hash(np.floor(source / cellSize).astype(np.int64))
+    order = np.argsort(sourceHash, kind='stable')
+    sortedHash = sourceHash[order]
+
+    scaled = target / cellSize
+    targetCells = np.floor(scaled).astype(np.int64)
+    towards = np.where(scaled - targetCells < 0.5, -1, 1)
+
+    for offset in np.stack(np.meshgrid([0, 1], [0, 1], [0, 1]), axis=-1).reshape(-1, 3):
+        #Sorted queries keep searchsorted cache friendly, several times faster
+        keys = cell_hash(targetCells + towards * offset)
+        queryOrder = np.argsort(keys)
+        sortedKeys = keys[queryOrder]
+        low = np.empty(len(keys), dtype=np.int64)
+        counts = np.empty(len(keys), dtype=np.int64)
+        low[queryOrder] = np.searchsorted(sortedHash, sortedKeys, side='left')
+        counts[queryOrder] = np.searchsorted(sortedHash, sortedKeys, side='right') - low[queryOrder]
+
+        #Cells hold a few points at most, walk them in lockstep
+        for slot in range(int(counts.max())):
+            targets = np.flatnonzero(counts > slot)
+            candidates = order[low[targets] + slot]
+            distance = np.linalg.norm(source[candidates] - target[targets], axis=1)
+            better = (distance <= tolerance) & (distance < bestDistance[targets])
+            if source_dirs is not None:
+                dots = np.abs(np.einsum("ij,ij->i", source_dirs[candidates], target_dirs[targets]))
+                better &= dots >= min_dot
+
+            best[targets[better]] = candidates[better]
+            bestDistance[targets[better]] = distance[better]
+
+    return best
+
+def edge_midpoints(mesh, matrix=None):
+    #Midpoints and unit directions of every edge, optionally transformed
+    positions = read_positions(mesh).astype(np.float64)
+    if matrix is not None:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+
+    edgeVerts = read_edge_vertices(mesh)
+    start = positions[edgeVerts[:, 0]]
+    end = positions[edgeVerts[:, 1]]
+    directions = end - start
+    lengths = np.linalg.norm(directions, axis=1)
+    directions[lengths > 0] /= lengths[lengths > 0, None]
+    return (start + end) * 0.5, directions
+
+def dihedral_angles(face_normals, first, second, chunk_size: int = 1 << 18, threads: int = None):
+    #Angle between the normals of each face pair, numpy releases the GIL on
+    #these chunks so they spread over the cores on million-edge meshes
+    angles = np.empty(len(first), dtype=np.float32)
+
+    def work(start):
+        stop = min(start + chunk_size, len(first))
+        dots = np.einsum("ij,ij->i", face_normals[first[start:stop]], face_normals[second[start:stop]])
+        np.arccos(np.clip(dots, -1.0, 1.0), out=angles[start:stop])
+
+    starts = range(0, len(first), chunk_size)
+    if len(starts) <= 1:
+        for start in starts:
+            work(start)
+    else:
+        with ThreadPoolExecutor(max_workers=threads or os.cpu_count()) as pool:
+            list(pool.map(work, starts))
+
+    return angles
+
+def sharp_edge_mask(mesh, angle_threshold: float):
+    #Manifold edges whose faces meet at more than angle_threshold (radians)
+    mask = np.zeros(len(mesh.edges), dtype=np.bool_)
+    if len(mesh.polygons) == 0:
+        return mask
+
+    faces = loop_faces(read_loop_totals(mesh))
+    edges, first, second = manifold_edge_faces(len(mesh.edges), read_loop_edges(mesh), faces)
+    angles = dihedral_angles(read_face_normals(mesh), first, second)
+
+    mask[edges[angles > angle_threshold]] = True
+    return mask
@@ -0,0 +1,98 @@
+import numpy as np
+
+from . import bp_data
+
+#Mesh and modifier logic behind the edit operators, without bpy. Everything here goes
+#through bp_data's bulk accessors and plain modifier attributes, so it runs the same on
+#Blender data and on the bp_fake stand-ins used for benchmarks.
+
+#Generic properties every BP modifier is created with
+MODIFIER_DEFAULTS = {
+    "show_expanded": False,
+    "show_in_editmode": True,
+    "show_viewport": True,
+    "show_render": True,
+}
+
+# ---------------- Edge flags -----------------
+def set_selected_edges(mesh, attribute_name: str, value: float = 0.0, toggle: bool = True):
+    selected = bp_data.read_edge_select(mesh)
+    if not selected.any():
+        raise RuntimeError("No edges selected.")
+
+    values = bp_data.read_attribute(mesh, attribute_name, np.float32)
+    if values is None or len(values) != len(selected):
+        raise RuntimeError("Attribute data size does not match number of edges.")
+
+    #Toggle on unless most of the selection is flagged already
+    if toggle == True:
+        value = np.count_nonzero(values[selected]) / np.count_nonzero(selected) < 0.5
+
+    values[selected] = float(value)
+    bp_data.write_attribute(mesh, attribute_name, values)
+
+    linkedName = bp_data.LINKED_ATTRIBUTES.get(attribute_name)
+    if linkedName is not None and linkedName in mesh.attributes:
+        linked = bp_data.read_attribute(mesh, linkedName, np.bool_)
+        linked[selected] = bool(value)
+        bp_data.write_attribute(mesh, linkedName, linked)
+
+    return value
+
+def select_flagged_edges(mesh, attribute_name: str):
+    values = bp_data.read_attribute(mesh, attribute_name, np.float32)
+    if values is None:
+        return 0
+
+    flagged = values > 0.0
+    bp_data.write_edge_select(mesh, flagged)
+    return int(np.count_nonzero(flagged))
+
+def take_selected_weights(mesh, attribute_name: str):
+    #Narrow the selection to flagged edges and return their average weight.
+    #Float weights are cleared since the bevel applied next replaces them
+    attribute = mesh.attributes.get(attribute_name)
+    selected = bp_data.read_edge_select(mesh)
+    values = bp_data.read_attribute(mesh, attribute_name, np.float32)
+
+    flagged = selected & (values > 0.0)
+    edgeCount = int(np.count_nonzero(flagged))
+    averageWeight = float(values[flagged].mean()) if edgeCount else 0.0
+
+    if attribute.data_type == 'FLOAT':
+        values[flagged] = 0.0
+        bp_data.write_attribute(mesh, attribute_name, values)
+
+    mesh.edges.foreach_set("select", flagged)
+    return averageWeight, edgeCount
+
+# ---------------- Modifiers -----------------
+def is_bp_modifier(mod):
+    return "BP" in mod.name
+
+def toggle_bp_modifiers(modifiers):
+    #Show all unless most are visible already, None if there is no BP stack
+    bpModifiers = [mod for mod in modifiers if is_bp_modifier(mod)]
+    if not bpModifiers:
+        return None
+
+    visible = sum(1 for mod in bpModifiers if mod.show_viewport)
+    visibility = visible / len(bpModifiers) < 0.5
+    for mod in bpModifiers:
+        mod.show_viewport = visibility
+    return visibility
+
+def configure_modifier(mod, name: str, settings: dict):
+    mod.name = name
+    for key, value in MODIFIER_DEFAULTS.items():
+        setattr(mod, key, value)
+
+    #Apply properties from dictionary
+    for key, value in settings.items():
+        try:
+            setattr(mod, key, value)
+        except AttributeError:
+            print("Error on modifier: " + name + " attribute " + key)
+            mod[key] = value  # fallback for custom props like sockets
+
+    return mod
@@ -0,0 +1,208 @@
+import numpy as np
+
+from . import bp_data
+
+#NumPy-backed stand-ins for the bits of Blender mesh, object and modifier data that
+#bp_data and bp_edges touch. Enough to run the flag and modifier logic as plain Python
+#for benchmarks and quick checks, without launching Blender.
+
+#Attribute data type -> value dtype
+DATA_TYPES = {
+    'BOOLEAN': np.bool_,
+    'FLOAT': np.float32,
+    'INT': np.int32,
+    'INT8': np.int8,
+}
+
+class FakeCollection:
+    #A bpy collection seen through foreach_get/foreach_set only
+    def __init__(self, count: int, **arrays):
+        self.count = count
+        self.arrays = arrays
+
+    def __len__(self):
+        return self.count
+
+    def foreach_get(self, name: str, values):
+        values[...] = self.arrays[name].reshape(values.shape)
+
+    def foreach_set(self, name: str, values):
+        array = self.arrays[name]
+        array[...] = np.asarray(values).reshape(array.shape)
+
+class FakeAttribute:
+    def __init__(self, name: str, data_type: str, domain: str, count: int):
+        self.name = name
+        self.data_type = data_type
+        self.domain = domain
+        self.data = FakeCollection(count, value=np.zeros(count, dtype=DATA_TYPES[data_type]))
+
+class FakeAttributes:
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.items = {}
+
+    def __contains__(self, name: str):
+        return name in self.items
+
+    def __getitem__(self, name: str):
+        return self.items[name]
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, name: str, default=None):
+        return self.items.get(name, default)
+
+    def new(self, name: str, type: str, domain: str):
+        attribute = FakeAttribute(name, type, domain, self.mesh.domain_size(domain))
+        self.items[name] = attribute
+        return attribute
+
+    def remove(self, attribute):
+        del self.items[attribute.name]
+
+class FakeMesh:
+    def __init__(self, name: str, positions, edges, loopVertices, loopEdges, loopStarts, loopTotals, normals):
+        self.name = name
+        self.vertices = FakeCollection(len(positions), co=np.asarray(positions, dtype=np.float32), select=np.zeros(len(positions), dtype=np.bool_))
+        self.edges = FakeCollection(len(edges), vertices=np.asarray(edges, dtype=np.int32), select=np.zeros(len(edges), dtype=np.bool_))
+        self.loops = FakeCollection(len(loopVertices), vertex_index=np.asarray(loopVertices, dtype=np.int32), edge_index=np.asarray(loopEdges, dtype=np.int32))
+        self.polygons = FakeCollection(len(loopStarts), loop_start=np.asarray(loopStarts, dtype=np.int32), loop_total=np.asarray(loopTotals, dtype=np.int32), normal=np.asarray(normals, dtype=np.float32))
+        self.attributes = FakeAttributes(self)
+        self.updates = 0
+
+    def domain_size(self, domain: str):
+        return {
+            'POINT': len(self.vertices),
+            'EDGE': len(self.edges),
+            'FACE': len(self.polygons),
+            'CORNER': len(self.loops),
+        }[domain]
+
+    def update(self):
+        self.updates += 1
+
+class FakeModifier:
+    def __init__(self, name: str, type: str):
+        self.name = name
+        self.type = type
+        self.show_expanded = True
+        self.show_in_editmode = False
+        self.show_viewport = True
+        self.show_render = True
+        self.properties = {}
+
+    #Geometry node sockets are ID properties on the modifier
+    def __getitem__(self, key: str):
+        return self.properties[key]
+
+    def __setitem__(self, key: str, value):
+        self.properties[key] = value
+
+    def get(self, key: str, default=None):
+        return self.properties.get(key, default)
+
+    def keys(self):
+        return self.properties.keys()
+
+class FakeModifiers:
+    def __init__(self):
+        self.items = []
+
+    def __contains__(self, name: str):
+        return any(mod.name == name for mod in self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self.items[key]
+        mod = self.get(key)
+        if mod is None:
+            raise KeyError(key)
+        return mod
+
+    def get(self, name: str, default=None):
+        return next((mod for mod in self.items if mod.name == name), default)
+
+    def new(self, name: str, type: str):
+        mod = FakeModifier(name, type)
+        self.items.append(mod)
+        return mod
+
+    def remove(self, mod):
+        self.items.remove(mod)
+
+class FakeObject:
+    def __init__(self, name: str, data):
+        self.name = name
+        self.type = 'MESH'
+        self.mode = 'OBJECT'
+        self.data = data
+        self.modifiers = FakeModifiers()
+        self.matrix_world = np.identity(4)
+
+# ---------------- Builders -----------------
+def grid_mesh(size: int, name: str = "Grid"):
+    #Flat quad grid of size x size faces, about 2 * size^2 edges
+    row = size + 1
+    i, j = np.meshgrid(np.arange(row), np.arange(row))
+    positions = np.stack((i.reshape(-1), j.reshape(-1), np.zeros(row * row)), axis=1) / size
+
+    #Horizontal edges first, then vertical ones
+    horizontalCount = size * row
+    hi, hj = np.meshgrid(np.arange(size), np.arange(row))
+    vi, vj = np.meshgrid(np.arange(row), np.arange(size))
+    horizontal = np.stack((hj * row + hi, hj * row + hi + 1), axis=-1).reshape(-1, 2)
+    vertical = np.stack((vj * row + vi, (vj + 1) * row + vi), axis=-1).reshape(-1, 2)
+    edges = np.concatenate((horizontal, vertical))
+
+    #Corners run counter-clockwise: bottom, right, top, left
+    fi, fj = (a.reshape(-1) for a in np.meshgrid(np.arange(size), np.arange(size)))
+    loopVertices = np.stack((fj * row + fi, fj * row + fi + 1, (fj + 1) * row + fi + 1, (fj + 1) * row + fi), axis=1).reshape(-1)
+    loopEdges = np.stack((
+        fj * size + fi,
+        horizontalCount + fj * row + fi + 1,
+        (fj + 1) * size + fi,
+        horizontalCount + fj * row + fi,
+    ), axis=1).reshape(-1)
+
+    faceCount = size * size
+    normals = np.zeros((faceCount, 3))
+    normals[:, 2] = 1.0
+    return FakeMesh(name, positions, edges, loopVertices, loopEdges, np.arange(faceCount) * 4, np.full(faceCount, 4), normals)
+
+def add_bp_attributes(mesh):
+    #Same edge layers verify_attributes_exist adds
+    for attribute_name, dataType in bp_data.BP_EDGE_ATTRIBUTE_TYPES.items():
+        bp_data.ensure_attribute(mesh, attribute_name, dataType)
+    for linkedName in set(bp_data.LINKED_ATTRIBUTES.values()):
+        bp_data.ensure_attribute(mesh, linkedName, 'BOOLEAN')
+    return mesh
+
+def random_edges(mesh, fraction: float, seed: int = 0):
+    return np.random.default_rng(seed).random(len(mesh.edges)) < fraction
+
+def flag_edges(mesh, attribute_name: str, fraction: float, seed: int = 0):
+    flagged = random_edges(mesh, fraction, seed)
+    values = flagged.astype(np.float32)
+    if mesh.attributes[attribute_name].data_type == 'FLOAT':
+        values *= np.random.default_rng(seed + 1).random(len(values)).astype(np.float32)
+    bp_data.write_attribute(mesh, attribute_name, values)
+    return flagged
+
+def select_edges(mesh, fraction: float, seed: int = 0):
+    selected = random_edges(mesh, fraction, seed)
+    mesh.edges.foreach_set("select", selected)
+    return selected
+
+def grid_object(size: int, name: str = "Grid"):
+    return FakeObject(name, add_bp_attributes(grid_mesh(size, name)))
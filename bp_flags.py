@@ -0,0 +1,225 @@
+import bpy
+import os
+import struct
+import zlib
+import numpy as np
+
+from . import bp_data
+from . import bp_panels
+from . import bp_region
+
+#Sidecar files for BP edge flags. One file per mesh, keyed by a topology fingerprint
+#so flags only ever go back onto the exact same edge layout. Boolean flags are
+#bit-packed, weights quantized to 8 bits against their own maximum, and the body is
+#zlib compressed, so a file is a few bytes per thousand edges.
+
+MAGIC = b"BPF1"
+EXTENSION = ".bpf"
+
+#magic, edge count, topology fingerprint, attribute count
+HEADER = struct.Struct("<4sI16sI")
+
+#name length, kind, scale, payload size
+ATTRIBUTE = struct.Struct("<BBfI")
+
+KIND_BITS = 0
+KIND_QUANTIZED = 1
+
+#Native layers the flags are mirrored into, stored too so a restore matches the export
+LINKED_LAYERS = sorted(set(bp_data.LINKED_ATTRIBUTES.values()))
+
+def flags_fingerprint(mesh):
+    return bytes.fromhex(bp_data.topology_fingerprint(mesh))
+
+# ---------------- File format -----------------
+def encode_flags(mesh):
+    records = []
+    count = 0
+    layers = list(bp_data.BP_EDGE_ATTRIBUTES.items()) + [(name, np.bool_) for name in LINKED_LAYERS]
+    for attribute_name, dtype in layers:
+        values = bp_data.read_attribute(mesh, attribute_name, dtype)
+        if values is None:
+            continue
+
+        if dtype == np.bool_:
+            kind = KIND_BITS
+            scale = 1.0
+            payload = np.packbits(values).tobytes()
+        else:
+            #8 bits against the layer's own maximum, plenty for bevel weights
+            kind = KIND_QUANTIZED
+            scale = float(values.max()) if len(values) else 0.0
+            quantized = np.zeros(len(values), dtype=np.uint8) if scale <= 0.0 else np.rint(np.clip(values / scale, 0.0, 1.0) * 255.0).astype(np.uint8)
+            payload = quantized.tobytes()
+
+        name = attribute_name.encode()
+        records.append(ATTRIBUTE.pack(len(name), kind, scale, len(payload)) + name + payload)
+        count += 1
+
+    header = HEADER.pack(MAGIC, len(mesh.edges), flags_fingerprint(mesh), count)
+    return header + zlib.compress(b"".join(records), 6)
+
+def read_header(data):
+    magic, edgeCount, fingerprint, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a BP flags file")
+    return edgeCount, fingerprint, count
+
+def decode_flags(data):
+    edgeCount, fingerprint, count = read_header(data)
+    body = zlib.decompress(data[HEADER.size:])
+
+    layers = {}
+    offset = 0
+    for _ in range(count):
+        nameLength, kind, scale, size = ATTRIBUTE.unpack_from(body, offset)
+        offset += ATTRIBUTE.size
+        attribute_name = body[offset:offset + nameLength].decode()
+        offset += nameLength
+        payload = np.frombuffer(body, dtype=np.uint8, count=size, offset=offset)
+        offset += size
+
+        if kind == KIND_BITS:
+            layers[attribute_name] = np.unpackbits(payload, count=edgeCount).astype(np.bool_)
+        else:
+            layers[attribute_name] = payload.astype(np.float32) * (scale / 255.0)
+
+    return fingerprint, layers
+
+def apply_flags(mesh, layers):
+    linkedLayers = {}
+    for attribute_name, values in layers.items():
+        dataType = bp_data.BP_EDGE_ATTRIBUTE_TYPES.get(attribute_name)
+        if dataType is None:
+            continue
+
+        bp_data.ensure_attribute(mesh, attribute_name, dataType)
+        bp_data.write_attribute(mesh, attribute_name, values)
+
+        linkedName = bp_data.LINKED_ATTRIBUTES.get(attribute_name)
+        if linkedName is not None:
+            linkedLayers[linkedName] = linkedLayers.get(linkedName, False) | (values > 0)
+
+    #Replaced rather than merged, so seams of edges no longer flagged go away. Stored
+    #layers win, files written without them rebuild the layers from the flags alone
+    for linkedName in LINKED_LAYERS:
+        values = layers.get(linkedName, linkedLayers.get(linkedName))
+        if values is None:
+            continue
+        bp_data.ensure_attribute(mesh, linkedName, 'BOOLEAN')
+        bp_data.write_attribute(mesh, linkedName, values)
+
+    mesh.update()
+
+# ---------------- Storage -----------------
+def flags_path(directory, mesh):
+    return os.path.join(directory, bpy.path.clean_name(mesh.name) + EXTENSION)
+
+def write_flags(path, data):
+    tempPath = path + ".tmp"
+    with open(tempPath, "wb") as file:
+        file.write(data)
+    os.replace(tempPath, path)
+
+def read_fingerprint(path):
+    #Only the header is read, None for anything that isn't a flags file
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+    try:
+        _, fingerprint, _ = read_header(header)
+    except (ValueError, struct.error):
+        return None
+    return fingerprint
+
+def scan_directory(directory):
+    #Fingerprint -> paths, duplicated parts share their topology and so their fingerprint
+    found = {}
+    for name in os.listdir(directory):
+        if not name.endswith(EXTENSION):
+            continue
+
+        path = os.path.join(directory, name)
+        fingerprint = read_fingerprint(path)
+        if fingerprint is not None:
+            found.setdefault(fingerprint, []).append(path)
+
+    return found
+
+def find_flags(directory, mesh, files):
+    #The file named after the mesh if its topology still fits, else the only file with
+    #this topology. Returns the path and whether several files were candidates
+    fingerprint = flags_fingerprint(mesh)
+    path = flags_path(directory, mesh)
+    if os.path.exists(path) and read_fingerprint(path) == fingerprint:
+        return path, False
+
+    candidates = files.get(fingerprint, [])
+    if len(candidates) == 1:
+        return candidates[0], False
+    return None, len(candidates) > 1
+
+# ---------------- Operators -----------------
+def get_meshes(context):
+    #Each mesh once, objects sharing data share the file
+    meshes = {}
+    for obj in context.selected_objects:
+        if obj.type == 'MESH':
+            meshes.setdefault(obj.data.name, obj)
+    return list(meshes.values())
+
+def export_flags(self, context):
+    directory = bpy.path.abspath(self.directory)
+    if not directory:
+        self.report({'WARNING'}, "No directory set")
+        return {'CANCELLED'}
+
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    os.makedirs(directory, exist_ok=True)
+    written = 0
+    size = 0
+    for obj in get_meshes(context):
+        data = encode_flags(obj.data)
+        write_flags(flags_path(directory, obj.data), data)
+        written += 1
+        size += len(data)
+
+    self.report({'INFO'}, f"Exported flags of {written} meshes, {size / 1024:.1f} KB")
+    return {'FINISHED'}
+
+def import_flags(self, context):
+    directory = bpy.path.abspath(self.directory)
+    if not directory or not os.path.isdir(directory):
+        self.report({'WARNING'}, "Flags directory not found")
+        return {'CANCELLED'}
+
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    #Matched by name first, by topology for renamed meshes
+    files = scan_directory(directory)
+    restored = 0
+    unmatched = 0
+    ambiguous = []
+    for obj in get_meshes(context):
+        path, isAmbiguous = find_flags(directory, obj.data, files)
+        if path is None:
+            if isAmbiguous:
+                ambiguous.append(obj.data.name)
+            else:
+                unmatched += 1
+            continue
+
+        with open(path, "rb") as file:
+            _, layers = decode_flags(file.read())
+        apply_flags(obj.data, layers)
+
+        bp_panels.update_islands(obj.data)
+        bp_region.update_region(obj)
+        restored += 1
+
+    if ambiguous:
+        self.report({'WARNING'}, f"Several flag files match the topology of {', '.join(ambiguous)}, skipped")
+    self.report({'INFO'}, f"Restored flags on {restored} meshes, {unmatched} without a matching file, {len(ambiguous)} ambiguous")
+    return {'FINISHED'}
@@ -0,0 +1,188 @@
+import bpy
+import hashlib
+
+from . import bp_data
+from . import bp_modifiers
+
+#Freezing stores the evaluated result of an object's stack as a plain mesh and
+#displays that instead, with every modifier hidden, so finished parts drop out of
+#depsgraph evaluation. The source mesh is kept with a fake user and swapped back
+#in when the object is thawed, edited or its fingerprint no longer matches.
+
+FREEZE_KEY = "bp_freeze"
+FROZEN_SUFFIX = "_bp_frozen"
+
+def is_frozen(obj):
+    return obj.type == 'MESH' and FREEZE_KEY in obj
+
+def freeze_fingerprint(obj, mesh):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(bp_data.mesh_fingerprint(mesh).encode())
+    digest.update(bp_modifiers.stack_signature(obj).encode())
+    return digest.hexdigest()
+
+def freeze_object(obj, depsgraph, frozenMesh=None, fingerprint=None):
+    #frozenMesh lets callers swap in geometry they already have, like a disk cache hit
+    if is_frozen(obj) or obj.type != 'MESH':
+        return False
+
+    source = obj.data
+    if fingerprint is None:
+        fingerprint = freeze_fingerprint(obj, source)
+    stack = bp_modifiers.stack_signature(obj)
+
+    if frozenMesh is None:
+        evaluated = obj.evaluated_get(depsgraph)
+        frozenMesh = bpy.data.meshes.new_from_object(evaluated, preserve_all_data_layers=True, depsgraph=depsgraph)
+    frozenMesh.name = source.name + FROZEN_SUFFIX
+
+    #Remember which modifiers were on so thawing restores the exact state
+    visibility = {}
+    for mod in obj.modifiers:
+        visibility[mod.name] = int(mod.show_viewport) | int(mod.show_render) << 1
+        mod.show_viewport = False
+        mod.show_render = False
+
+    obj[FREEZE_KEY] = {
+        "source": source.name,
+        "fingerprint": fingerprint,
+        "stack": stack,
+        "visibility": visibility,
+    }
+
+    #Keep the source alive while no object uses it
+    source.use_fake_user = True
+    obj.data = frozenMesh
+    return True
+
+def thaw_object(obj):
+    if not is_frozen(obj):
+        return False
+
+    info = obj[FREEZE_KEY]
+    source = bpy.data.meshes.get(info["source"])
+    frozenMesh = obj.data
+
+    if source is not None:
+        obj.data = source
+        source.use_fake_user = False
+
+    visibility = info.get("visibility", {})
+    for mod in obj.modifiers:
+        state = visibility.get(mod.name, 3)
+        mod.show_viewport = bool(state & 1)
+        mod.show_render = bool(state & 2)
+
+    del obj[FREEZE_KEY]
+
+    if frozenMesh is not obj.data and frozenMesh.users == 0:
+        bpy.data.meshes.remove(frozenMesh)
+    return True
+
+def is_stale(obj):
+    #Source mesh or stack settings changed since the object was frozen
+    info = obj[FREEZE_KEY]
+    source = bpy.data.meshes.get(info["source"])
+    if source is None:
+        return True
+
+    return freeze_fingerprint(obj, source) != info["fingerprint"]
+
+def get_objects(context, scope):
+    if scope == 'COLLECTION':
+        objects = context.collection.all_objects
+    elif scope == 'SCENE':
+        objects = context.scene.objects
+    else:
+        objects = context.selected_objects
+
+    return [obj for obj in objects if obj.type == 'MESH']
+
+def freeze_objects(self, context):
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    #One evaluated depsgraph for the whole batch
+    depsgraph = context.evaluated_depsgraph_get()
+    frozen = 0
+    for obj in get_objects(context, self.scope):
+        if any("BP" in mod.name for mod in obj.modifiers) and freeze_object(obj, depsgraph):
+            frozen += 1
+
+    self.report({'INFO'}, f"Froze {frozen} objects")
+    return {'FINISHED'}
+
+def thaw_objects(self, context):
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    thawed = 0
+    for obj in get_objects(context, self.scope):
+        if thaw_object(obj):
+            thawed += 1
+
+    self.report({'INFO'}, f"Thawed {thawed} objects")
+    return {'FINISHED'}
+
+# ---------------- Automatic thawing -----------------
+#Object name -> True when the source mesh has to be re-hashed as well
+_pending_checks = {}
+
+def window_override():
+    #Timers run without a window in context, operators like mode_set need one
+    windows = bpy.context.window_manager.windows
+    return bpy.context.temp_override(window=windows[0]) if windows else bpy.context.temp_override()
+
+def _thaw_pending():
+    checks = dict(_pending_checks)
+    _pending_checks.clear()
+
+    with window_override():
+        for name, full in checks.items():
+            obj = bpy.data.objects.get(name)
+            if obj is None or not is_frozen(obj):
+                continue
+
+            if obj.mode == 'EDIT':
+                #Entered edit mode on the frozen mesh, swap the source back in underneath
+                bpy.ops.object.mode_set(mode='OBJECT')
+                thaw_object(obj)
+                bpy.ops.object.mode_set(mode='EDIT')
+            elif bp_modifiers.stack_signature(obj) != obj[FREEZE_KEY].get("stack"):
+                thaw_object(obj)
+            elif full and is_stale(obj):
+                thaw_object(obj)
+
+    return None
+
+def check_frozen(obj_name, full: bool = False):
+    #Deferred to a timer, data can't be swapped from inside a depsgraph handler
+    if not _pending_checks:
+        bpy.app.timers.register(_thaw_pending, first_interval=0.0)
+    _pending_checks[obj_name] = _pending_checks.get(obj_name, False) or full
+
+def on_depsgraph_update(scene, depsgraph):
+    frozenSources = None
+    for update in depsgraph.updates:
+        data = update.id.original
+
+        if isinstance(data, bpy.types.Object) and is_frozen(data):
+            #Transform-only updates can't change the frozen result
+            if update.is_updated_geometry or data.mode == 'EDIT':
+                check_frozen(data.name)
+
+        elif isinstance(data, bpy.types.Mesh) and update.is_updated_geometry:
+            #A mesh shared with a frozen object was edited through another user
+            if frozenSources is None:
+                frozenSources = {}
+                for obj in scene.objects:
+                    if is_frozen(obj):
+                        frozenSources.setdefault(obj[FREEZE_KEY]["source"], []).append(obj.name)
+
+            for name in frozenSources.get(data.name, []):
+                check_frozen(name, full=True)
+
+def on_load_post():
+    for obj in bpy.data.objects:
+        if is_frozen(obj):
+            check_frozen(obj.name, full=True)
@@ -1,6 +1,10 @@
 import bpy
 import bmesh
+from . import bp_edges
 from . import bp_modifiers
+from . import bp_panels
+from . import bp_queue
+from . import bp_region
 
 #from bpy.props import StringProperty
 
@@ -36,6 +40,14 @@ def getSelectedObjects(self, MeshesOnly: bool = True):
     return filteredObjects
     
 
+def prepare_add_modifiers(self):
+    #Node groups are shared by every object, import them once per batch
+    bp_modifiers.reimport_nodegroups(self)
+
+def add_modifiers_object(self, obj):
+    bp_modifiers.verify_attributes_exist(obj)
+    bp_modifiers.add_stack(self, obj)
+
 def add_modifiers(self):
     #for obj in bpy.context.selected_objects:
     objects  = getSelectedObjects(self)
@@ -43,33 +55,47 @@ def add_modifiers(self):
     if not objects:
         return {'CANCELLED'} 
 
+    #Big selections go to the batch queue with a copy of the settings
+    if bp_queue.should_queue(objects):
+        bp_queue.queue_job("Add Modifiers", objects, add_modifiers_object, bp_modifiers.snapshot_settings(self), setup=prepare_add_modifiers)
+        self.report({'INFO'}, f"Adding modifiers to {len(objects)} objects in the background")
+        #Nothing to undo or redo yet, the job pushes its own undo step once it ends
+        return {'CANCELLED'}
+
+    prepare_add_modifiers(self)
     for obj in objects:
-        bp_modifiers.verify_attributes_exist(obj)
+        add_modifiers_object(self, obj)
 
-        bp_modifiers.reimport_nodegroups(self)
-        
-        if self.addSubD == True:
-            bp_modifiers.add_mod_subD(self, obj)
-        
-        if self.addFilletConstrained == True and self.simplifiedStack == False:
-            bp_modifiers.add_mod_constrainedFillets(self, obj)
-        
-        if self.addFilletWeighted == True and self.simplifiedStack == False:    
-            bp_modifiers.add_mod_weightedFillets(self, obj)
-        
-        if self.addShrinkwrap == True and self.simplifiedStack == False: 
-            bp_modifiers.add_mod_shrinkwrap(self, obj)
+    self.report({'INFO'}, "Added planar modifiers")
+    return {'FINISHED'} 
 
-        if self.addPanelling == True: 
-            bp_modifiers.add_mod_panelize(self, obj)
-        
-        if self.addAutoUV == True and self.simplifiedStack == False:
-            bp_modifiers.add_mod_autoUV(self, obj)
+def smart_mirror_object(self, obj):
+    #FIND PARENT HELPER
+    parentObj = obj
+    while parentObj.parent is not None:
+        parentObj = parentObj.parent
+        if self.mirrorByRoot == False and parentObj.type == "EMPTY":
+            break
+
+    #DETERMINE WHICH AXIS IF ANY NEEDS TO BE FLIPPED
+    flipBisectAxis = [False, False, False]
+    #if isEditMode == False:
+    flipBisectAxis[0] = (obj.location.x - parentObj.location.x) < 0
+    flipBisectAxis[1] = (obj.location.y - parentObj.location.y) < 0
+    flipBisectAxis[2] = (obj.location.z - parentObj.location.z) < 0
+    #else:
 
-        if self.addEdgeChamfer == True:
-            bp_modifiers.add_mod_edgeChamfer(self, obj)
+    #DETERMINE WHICH AXIS NEED TO BE MIRRORED - Y AS DEFAULT
+    #mirrorAxis = [False, True, False]
+    mirrorAxis = [self.mirrorX, self.mirrorY, self.mirrorZ]
 
-    return {'FINISHED'} 
+    #Special case if no parent exists
+    parentObjName = parentObj.name
+    if obj.name == parentObjName:
+        parentObjName = ""
+
+    #ADD MODIFIER
+    bp_modifiers.add_mod_mirror(self, obj, mirrorAxis, flipBisectAxis, parentObjName)
 
 def smart_mirror(self):
     #Find root object
@@ -85,38 +111,21 @@ def smart_mirror(self):
     if not objects:
         return {'CANCELLED'} 
 
-    for obj in objects:
-        #FIND PARENT HELPER
-        parentObj = obj
-        while parentObj.parent is not None:
-            parentObj = parentObj.parent
-            if self.mirrorByRoot == False and parentObj.type == "EMPTY":
-                break
-        
+    if bp_queue.should_queue(objects):
+        bp_queue.queue_job("SmartMirror", objects, smart_mirror_object, bp_modifiers.snapshot_settings(self))
+        self.report({'INFO'}, f"SmartMirroring {len(objects)} objects in the background")
+        #Nothing to undo or redo yet, the job pushes its own undo step once it ends
+        return {'CANCELLED'}
 
-        
-        #DETERMINE WHICH AXIS IF ANY NEEDS TO BE FLIPPED
-        flipBisectAxis = [False, False, False]
-        #if isEditMode == False:
-        flipBisectAxis[0] = (obj.location.x - parentObj.location.x) < 0
-        flipBisectAxis[1] = (obj.location.y - parentObj.location.y) < 0
-        flipBisectAxis[2] = (obj.location.z - parentObj.location.z) < 0
-        #else:
-
-        #DETERMINE WHICH AXIS NEED TO BE MIRRORED - Y AS DEFAULT
-        #mirrorAxis = [False, True, False]
-        mirrorAxis = [self.mirrorX, self.mirrorY, self.mirrorZ]
-
-        #Special case if no parent exists
-        parentObjName = parentObj.name
-        if obj.name == parentObjName:
-            parentObjName = ""
-
-        #ADD MODIFIER
-        bp_modifiers.add_mod_mirror(self, obj, mirrorAxis, flipBisectAxis, parentObjName)
+    for obj in objects:
+        smart_mirror_object(self, obj)
 
+    self.report({'INFO'}, "SmartMirrored")
     return {'FINISHED'} 
 
+def toggle_modifier_visibility_object(self, obj):
+    bp_edges.toggle_bp_modifiers(obj.modifiers)
+
 def toggle_modifier_visibility(self):
 
     #obj = bpy.context.object
@@ -130,22 +139,14 @@ def toggle_modifier_visibility(self):
     if not objects:
         return {'CANCELLED'} 
 
+    if bp_queue.should_queue(objects):
+        bp_queue.queue_job("Toggle Visibility", objects, toggle_modifier_visibility_object, bp_modifiers.snapshot_settings(self))
+        self.report({'INFO'}, f"Toggling visibility of {len(objects)} objects in the background")
+        #Nothing to undo or redo yet, the job pushes its own undo step once it ends
+        return {'CANCELLED'}
+
     for obj in objects:
-        total_mods = 0.0
-        visible_mods = 0.0
-        #Count modifiers and visible modifiers
-        for mod in obj.modifiers:
-            if str(mod.name).find("BP") != -1:
-                total_mods += 1.0
-                if mod.show_viewport == True:
-                    visible_mods += 1.0
-        
-        visibility_status = visible_mods/total_mods < 0.5
-        
-        #Toggle visibility for mods
-        for mod in obj.modifiers:
-            if str(mod.name).find("BP") != -1:
-                mod.show_viewport = visibility_status
+        toggle_modifier_visibility_object(self, obj)
     
     self.report({'INFO'}, "Toggled visibility for BP modifiers")
     return {'FINISHED'} 
@@ -159,17 +160,9 @@ def select_by_edge_attribute(self, attribute_name):
             # Find attribute
             if attribute_name not in obj.data.attributes:
                 bp_modifiers.verify_attributes_exist(obj)
-            else:
-                attribute = obj.data.attributes[attribute_name]
 
-            #Deselect all edges
-            for edge in obj.data.edges:
-                edge.select = False
-
-            # Select edges if attribute is not False or 0
-            for i, edge in enumerate(obj.data.edges):
-                if float(attribute.data[i].value) > 0.0:
-                    edge.select = True
+            # Select edges if attribute is not False or 0, deselect the rest
+            bp_edges.select_flagged_edges(obj.data, attribute_name)
 
     #Force back to edit mode
     bpy.ops.object.mode_set(mode='EDIT')
@@ -191,38 +184,17 @@ def set_edge_attribute(self, attribute_name, value: float = 0.0, toggle: bool =
     #Force object mode
     bpy.ops.object.mode_set(mode='OBJECT')
 
-    #selected_edges = []
-    selected_edges = [e.index for e in obj.data.edges if e.select]
-
-    if not selected_edges:
-        raise RuntimeError("No edges selected.")
-
     # Ensure attributes exist
     bp_modifiers.verify_attributes_exist(obj)
 
-    # Access the target attribute
-    attributes = obj.data.attributes
-    if len(attributes[attribute_name].data) != len(obj.data.edges):
-        raise RuntimeError("Attribute data size does not match number of edges.")
-
-    # Toggle property on/off
-    if toggle == True:
-        flaggedEdgesTotal = 0
-        for edge_index in selected_edges:
-            if (float)(attributes[attribute_name].data[edge_index].value) != 0:
-                flaggedEdgesTotal += 1
+    # Toggle property on/off and mirror it into the linked native layer
+    bp_edges.set_selected_edges(obj.data, attribute_name, value, toggle)
 
-        value = flaggedEdgesTotal / len(selected_edges) < 0.5       
-
-    # Set new attribute value
-    for edge_index in selected_edges:
-        attributes[attribute_name].data[edge_index].value = value
-    
-        #Special case for marking each property
-        if (attribute_name == "bp_panel_edge"):
-            attributes["uv_seam"].data[edge_index].value = bool(value)
-        elif (attribute_name == "bp_bevel_fillet_weighted" or attribute_name == "bp_bevel_fillet_constrained"):
-            attributes["freestyle_edge"].data[edge_index].value = bool(value)
+    #Re-label the panel islands next to the changed edges
+    if attribute_name == "bp_panel_edge":
+        bp_panels.update_islands(obj.data)
+    if attribute_name in bp_region.REGION_ATTRIBUTES:
+        bp_region.update_region(obj)
 
     #Force back into edit mode
     bpy.ops.object.mode_set(mode='EDIT')
@@ -238,33 +210,10 @@ def apply_attribute(self, attribute_name, bevel_segments: int = 10, bevel_width:
         print(f"Attribute '{attribute_name}' not found")
         return
 
-    
-    averageBevelWeight = 0.0
-    edgeCount = 0
 
     #Deselect all selected edges without attribute
     #Unflag attrbutes if found 
-    for edge, value in zip(mesh.edges, attribute.data):
-        if edge.select:
-            if attribute.data_type == 'BOOLEAN':
-                if value.value == False:
-                    edge.select = False
-                else:
-                    value.value == False
-                    edgeCount += 1
-
-            elif attribute.data_type == 'FLOAT':
-                if value.value <= 0.0:
-                    edge.select = False
-                else:
-                    averageBevelWeight += value.value 
-                    edgeCount += 1
-                    value.value = 0.0
-    
-    if edgeCount != 0:
-        averageBevelWeight = averageBevelWeight / float(edgeCount)
-    #else:
-    #    averageBevelWeight  = 1.0
+    averageBevelWeight, edgeCount = bp_edges.take_selected_weights(mesh, attribute_name)
 
     bpy.ops.object.mode_set(mode='EDIT')
 
@@ -0,0 +1,261 @@
+import argparse
+import importlib
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+#Golden geometry regression harness. Builds reference meshes, adds every BP stack
+#configuration to them and stores the evaluated positions, topology and normals, then
+#later runs compare against those goldens within a tolerance and time the evaluation
+#in the same pass, so a speedup is only taken once the output is known to be the same.
+#
+#Runs inside Blender:
+#   blender -b --factory-startup --python bp_golden.py -- record
+#   blender -b --factory-startup --python bp_golden.py -- check --tolerance 1e-5
+
+GOLDEN_VERSION = 1
+INDEX_NAME = "goldens.json"
+
+#Stack configurations, OBJECT_OT_add_modifiers settings that differ from the defaults
+CONFIGURATIONS = {
+    "default": {},
+    "simplified": {"simplifiedStack": True},
+    "subd": {"addSubD": True},
+    "autouv": {"addAutoUV": True},
+    "spline": {"addSplineFillet": True},
+    "dense": {"addSubD": True, "subdLevels": 3, "constrainedFilletSegments": 20, "weightedFilletSegments": 12, "edgeChamferSegments": 4},
+}
+
+# ---------------- Reference meshes -----------------
+def edge_centers(bm):
+    return np.array([[(a + b) / 2.0 for a, b in zip(edge.verts[0].co, edge.verts[1].co)] for edge in bm.edges])
+
+def edge_heights(bm):
+    #Lowest and highest vertex of every edge
+    heights = np.array([[edge.verts[0].co.z, edge.verts[1].co.z] for edge in bm.edges])
+    return heights.min(axis=1), heights.max(axis=1)
+
+def build_cube(bm, bmesh):
+    bmesh.ops.create_cube(bm, size=2.0)
+    low, high = edge_heights(bm)
+    return {
+        "bp_bevel_fillet_constrained": low > 0.99,
+        "bp_bevel_fillet_weighted": np.where((low < -0.99) & (high > 0.99), 0.5, 0.0),
+        "bevel_weight_edge": np.where(high < -0.99, 1.0, 0.0),
+    }
+
+def build_panel_box(bm, bmesh):
+    bmesh.ops.create_cube(bm, size=2.0)
+    bmesh.ops.subdivide_edges(bm, edges=bm.edges[:], cuts=1, use_grid_fill=True)
+    low, high = edge_heights(bm)
+    centers = edge_centers(bm)
+    return {
+        "bp_panel_edge": (np.abs(low) < 1e-4) & (np.abs(high) < 1e-4),
+        #Edges along the box's corners lie on two of its sides
+        "bevel_weight_edge": np.where((np.abs(centers) > 0.99).sum(axis=1) >= 2, 0.3, 0.0),
+    }
+
+def build_cylinder(bm, bmesh):
+    bmesh.ops.create_cone(bm, cap_ends=True, segments=16, radius1=1.0, radius2=1.0, depth=2.0)
+    low, high = edge_heights(bm)
+    radius = np.linalg.norm(edge_centers(bm)[:, :2], axis=1)
+    return {
+        "bp_bevel_fillet_constrained": (low > 0.99) & (radius > 0.9),
+        "bevel_weight_edge": np.where((high < -0.99) & (radius > 0.9), 1.0, 0.0),
+    }
+
+REFERENCE_MESHES = {
+    "cube": build_cube,
+    "panel_box": build_panel_box,
+    "cylinder": build_cylinder,
+}
+
+def create_reference(addon, name: str):
+    import bpy
+    import bmesh
+
+    bm = bmesh.new()
+    flags = REFERENCE_MESHES[name](bm, bmesh)
+    mesh = bpy.data.meshes.new("golden_" + name)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    obj = bpy.data.objects.new(mesh.name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    with bpy.context.temp_override(object=obj, active_object=obj, selected_objects=[obj], selected_editable_objects=[obj]):
+        addon.bp_modifiers.verify_attributes_exist(obj)
+
+    bp_data = addon.bp_data
+    for attribute_name, values in flags.items():
+        bp_data.write_attribute(mesh, attribute_name, values)
+        linkedName = bp_data.LINKED_ATTRIBUTES.get(attribute_name)
+        if linkedName is not None:
+            bp_data.write_attribute(mesh, linkedName, bp_data.read_attribute(mesh, linkedName, np.bool_) | (values > 0))
+    mesh.update()
+
+    return obj
+
+def remove_reference(addon, obj):
+    import bpy
+
+    mesh = obj.data
+    curveObj = bpy.data.objects.get(obj.name + addon.bp_spline.CURVE_SUFFIX)
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+    if curveObj is not None:
+        curve = curveObj.data
+        bpy.data.objects.remove(curveObj)
+        bpy.data.curves.remove(curve)
+
+# ---------------- Fingerprints -----------------
+def evaluated_geometry(addon, obj):
+    import bpy
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", normals)
+        return {
+            "counts": addon.bp_data.mesh_counts(mesh),
+            "topology": addon.bp_data.topology_fingerprint(mesh),
+            "positions": addon.bp_data.read_positions(mesh),
+            "normals": normals.reshape(-1, 3),
+        }
+    finally:
+        evaluated.to_mesh_clear()
+
+def run_case(addon, meshName: str, configName: str, repeats: int):
+    import bpy
+
+    obj = create_reference(addon, meshName)
+    try:
+        settings = addon.bp_modifiers.StackSettings(**CONFIGURATIONS[configName])
+        addon.bp_modifiers.add_stack(settings, obj)
+
+        geometry = evaluated_geometry(addon, obj)
+        geometry["seconds"] = addon.bp_cost.time_evaluation(bpy.context, obj, repeats)
+        return geometry
+    finally:
+        remove_reference(addon, obj)
+
+def compare(golden, arrays, geometry, tolerance: float, normalAngle: float):
+    #First difference found, None if the case matches
+    if golden["topology"] != geometry["topology"]:
+        return f"topology changed {golden['counts']} -> {geometry['counts']}"
+
+    offset = np.abs(arrays["positions"] - geometry["positions"]).max(initial=0.0)
+    if offset > tolerance:
+        return f"positions off by {offset:.3g}"
+
+    dots = np.einsum("ij,ij->i", arrays["normals"], geometry["normals"])
+    if len(dots) and dots.min() < math.cos(normalAngle):
+        return f"normals off by {math.degrees(math.acos(np.clip(dots.min(), -1.0, 1.0))):.3g} degrees"
+
+    return None
+
+# ---------------- Storage -----------------
+def case_key(meshName: str, configName: str):
+    return f"{meshName}-{configName}"
+
+def load_index(directory):
+    path = os.path.join(directory, INDEX_NAME)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+        if index.get("version") == GOLDEN_VERSION:
+            return index
+
+    return {"version": GOLDEN_VERSION, "cases": {}}
+
+def save_index(directory, index):
+    path = os.path.join(directory, INDEX_NAME)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(index, file, indent=1, sort_keys=True)
+
+def save_arrays(directory, key: str, geometry):
+    np.savez_compressed(os.path.join(directory, key + ".npz"), positions=geometry["positions"], normals=geometry["normals"])
+
+def load_arrays(directory, key: str):
+    with np.load(os.path.join(directory, key + ".npz")) as arrays:
+        return {"positions": arrays["positions"], "normals": arrays["normals"]}
+
+# ---------------- Runner -----------------
+def import_addon():
+    #bp_batch already knows how to load this folder as the addon package
+    addonPath = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(addonPath))
+    bp_batch = importlib.import_module(os.path.basename(addonPath) + ".bp_batch")
+    return bp_batch.import_addon()
+
+def selected_cases(args):
+    meshes = args.mesh or list(REFERENCE_MESHES)
+    configs = args.config or list(CONFIGURATIONS)
+    return [(meshName, configName) for meshName in meshes for configName in configs]
+
+def run(args):
+    addon = import_addon()
+    directory = os.path.abspath(args.goldens)
+    os.makedirs(directory, exist_ok=True)
+    index = load_index(directory)
+
+    #Node groups are shared by every case, import them once
+    addon.bp_modifiers.reimport_nodegroups(addon.bp_modifiers.StackSettings())
+
+    failed = 0
+    start = time.perf_counter()
+    for meshName, configName in selected_cases(args):
+        key = case_key(meshName, configName)
+        geometry = run_case(addon, meshName, configName, args.repeats)
+        milliseconds = geometry["seconds"] * 1000.0
+        golden = index["cases"].get(key)
+
+        if args.command == "record":
+            save_arrays(directory, key, geometry)
+            index["cases"][key] = {
+                "counts": geometry["counts"],
+                "topology": geometry["topology"],
+                "seconds": geometry["seconds"],
+            }
+            print(f"recorded {key:<24} {milliseconds:8.2f} ms {geometry['counts']}")
+            continue
+
+        if golden is None:
+            failed += 1
+            print(f"missing  {key:<24} {milliseconds:8.2f} ms, no golden recorded")
+            continue
+
+        problem = compare(golden, load_arrays(directory, key), geometry, args.tolerance, math.radians(args.normal_angle))
+        speedup = golden["seconds"] / geometry["seconds"] if geometry["seconds"] > 0.0 else float("inf")
+        if problem is not None:
+            failed += 1
+            print(f"FAILED   {key:<24} {milliseconds:8.2f} ms, {problem}")
+        else:
+            print(f"ok       {key:<24} {milliseconds:8.2f} ms, {speedup:.2f}x golden")
+
+    if args.command == "record":
+        save_index(directory, index)
+
+    print(f"{len(selected_cases(args))} cases in {time.perf_counter() - start:.1f}s, {failed} failed")
+    return 1 if failed else 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="bp_golden", description="Golden geometry regression checks for the BP stack")
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument("--goldens", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "goldens"), help="Directory holding the golden files")
+    parser.add_argument("--mesh", action="append", choices=sorted(REFERENCE_MESHES), help="Only these reference meshes, repeatable")
+    parser.add_argument("--config", action="append", choices=sorted(CONFIGURATIONS), help="Only these stack configurations, repeatable")
+    parser.add_argument("--tolerance", type=float, default=1e-5, help="Largest allowed vertex offset")
+    parser.add_argument("--normal-angle", type=float, default=0.5, help="Largest allowed corner normal deviation in degrees")
+    parser.add_argument("--repeats", type=int, default=3, help="Evaluations timed per case, the median is kept")
+    return parser
+
+if __name__ == "__main__":
+    #Our arguments follow Blender's "--" separator
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    sys.exit(run(build_parser().parse_args(argv)))
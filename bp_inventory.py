@@ -0,0 +1,155 @@
+import bpy
+
+from . import bp_data
+from . import bp_freeze
+
+#Scene-wide BP inventory. One entry per mesh object with its BP stages, flagged edge
+#counts and last evaluated triangle count, kept up to date from depsgraph updates so
+#scene queries never have to walk every object, modifier and attribute. Persisted
+#in the scene's custom properties on save.
+
+INVENTORY_KEY = "bp_inventory"
+
+#Object name -> {"stages": [...], "flags": {attribute: count}, "triangles": int, "frozen": bool}
+_inventory = {}
+
+def stage_name(mod):
+    return mod.name.strip().replace("BP_", "", 1)
+
+def read_stages(obj):
+    return [stage_name(mod) for mod in obj.modifiers if "BP" in mod.name]
+
+def read_entry(obj, evaluated=None):
+    entry = _inventory.get(obj.name, {"flags": {}, "triangles": 0})
+    entry["stages"] = read_stages(obj)
+    entry["frozen"] = bp_freeze.is_frozen(obj)
+
+    #Edit mode flags live in the bmesh, they are counted once flushed
+    if obj.mode != 'EDIT':
+        entry["flags"] = bp_data.flagged_edge_counts(obj.data)
+
+    if evaluated is not None:
+        mesh = evaluated.data
+        entry["triangles"] = len(mesh.loops) - 2 * len(mesh.polygons)
+
+    _inventory[obj.name] = entry
+    return entry
+
+def rebuild(scene, depsgraph=None):
+    _inventory.clear()
+    for obj in scene.objects:
+        if obj.type == 'MESH':
+            read_entry(obj, obj.evaluated_get(depsgraph) if depsgraph is not None else None)
+
+def ensure(scene):
+    #Index the scene once if nothing was loaded, like right after enabling the addon
+    if not _inventory:
+        rebuild(scene)
+
+def entries(scene):
+    #Index lookups for the scene's objects, index entries of deleted objects are skipped
+    for name, entry in _inventory.items():
+        obj = scene.objects.get(name)
+        if obj is not None:
+            yield obj, entry
+
+def find_objects(scene, stage: str = None, flag: str = None, missingStack: bool = False):
+    found = []
+    for obj, entry in entries(scene):
+        if stage is not None and stage not in entry["stages"]:
+            continue
+        if flag is not None and entry["flags"].get(flag, 0) == 0:
+            continue
+        if missingStack and entry["stages"]:
+            continue
+        found.append(obj)
+    return found
+
+def summary(scene):
+    stages = {}
+    flags = {}
+    objects = 0
+    missing = 0
+    triangles = 0
+    for obj, entry in entries(scene):
+        objects += 1
+        missing += not entry["stages"]
+        triangles += entry["triangles"]
+        for stage in entry["stages"]:
+            stages[stage] = stages.get(stage, 0) + 1
+        for name, count in entry["flags"].items():
+            if count:
+                flags[name] = flags.get(name, 0) + 1
+
+    return {"objects": objects, "missing": missing, "triangles": triangles, "stages": stages, "flags": flags}
+
+# ---------------- Persistence -----------------
+def save(scene):
+    #ID properties don't hold lists of strings, stages are stored joined
+    stored = {}
+    for obj, entry in entries(scene):
+        stored[obj.name] = {
+            "stages": ",".join(entry["stages"]),
+            "flags": dict(entry["flags"]),
+            "triangles": entry["triangles"],
+            "frozen": entry["frozen"],
+        }
+    scene[INVENTORY_KEY] = stored
+
+def load(scene):
+    _inventory.clear()
+    stored = scene.get(INVENTORY_KEY, {})
+    for name, entry in stored.items():
+        _inventory[name] = {
+            "stages": [stage for stage in entry["stages"].split(",") if stage],
+            "flags": {attribute: int(count) for attribute, count in entry["flags"].items()},
+            "triangles": int(entry["triangles"]),
+            "frozen": bool(entry["frozen"]),
+        }
+
+    #Objects added outside the addon since the last save, sizes follow on the next update
+    for obj in scene.objects:
+        if obj.type == 'MESH' and obj.name not in _inventory:
+            read_entry(obj)
+
+# ---------------- Handlers -----------------
+def on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        if not isinstance(update.id, bpy.types.Object) or update.id.type != 'MESH':
+            continue
+
+        #Modifier changes come in as geometry updates as well, transforms don't matter here
+        if update.is_updated_geometry or update.id.original.name not in _inventory:
+            read_entry(update.id.original, update.id)
+
+def on_save_pre(scene):
+    save(scene)
+
+def on_load_post(scene):
+    load(scene)
+
+# ---------------- Operators -----------------
+def select_objects(self, context):
+    stage = self.stage if self.filter == 'STAGE' else None
+    flag = self.flag if self.filter == 'FLAG' else None
+    objects = find_objects(context.scene, stage=stage, flag=flag, missingStack=self.filter == 'MISSING')
+
+    if not self.extend:
+        for obj in context.selected_objects:
+            obj.select_set(False)
+
+    viewLayer = context.view_layer
+    selected = [obj for obj in objects if obj.visible_get(view_layer=viewLayer)]
+    for obj in selected:
+        obj.select_set(True)
+
+    if selected and (viewLayer.objects.active is None or not self.extend):
+        viewLayer.objects.active = selected[0]
+
+    self.report({'INFO'}, f"Selected {len(selected)} objects")
+    return {'FINISHED'}
+
+def rebuild_inventory(self, context):
+    rebuild(context.scene, context.evaluated_depsgraph_get())
+    self.report({'INFO'}, f"Indexed {len(_inventory)} objects")
+    return {'FINISHED'}
@@ -0,0 +1,244 @@
+import bpy
+import json
+
+from . import bp_modifiers
+from . import bp_queue
+
+#Recordable BP operation macros. While recording, every finished bp.* operator and
+#the properties it ran with are picked up from the window manager's operator history
+#into a JSON macro stored as a text block. Replaying runs the steps over many objects
+#in one batch: object steps once over the whole selection, mesh steps per object,
+#with node group imports and attribute checks done once for the batch.
+
+MACRO_VERSION = 1
+MACRO_TEXT = "BP_Macro"
+
+#Operators that drive macros or the UI themselves, never recorded
+SKIPPED_OPERATORS = {"bp.record_macro", "bp.play_macro", "bp.cancel_batch", "bp.edge_brush"}
+
+#Steps recorded so far, None while not recording
+_recording = None
+
+#Operator history as of the last poll, (pointer, step) with step None when not recorded
+_history = []
+
+# ---------------- Recording -----------------
+def operator_name(idname: str):
+    #BP_OT_add_modifiers -> bp.add_modifiers
+    prefix, _, name = idname.partition("_OT_")
+    return f"{prefix.lower()}.{name}"
+
+def plain_value(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return list(value)
+    return value
+
+def default_value(prop):
+    if getattr(prop, "is_array", False):
+        return list(prop.default_array)
+    if prop.type == 'ENUM':
+        return sorted(prop.default_flag) if prop.is_enum_flag else prop.default
+    return prop.default
+
+def operator_properties(op):
+    #Only values that differ from the defaults, keeps macros short and readable
+    properties = {}
+    for prop in op.bl_rna.properties:
+        if prop.identifier == "rna_type" or prop.type in {'POINTER', 'COLLECTION'}:
+            continue
+        value = plain_value(getattr(op.properties, prop.identifier))
+        if value != default_value(prop):
+            properties[prop.identifier] = value
+    return properties
+
+def is_recording():
+    return _recording is not None
+
+def history_offset(pointers):
+    #Old entries drop off the front of the history and new ones come in at the end,
+    #so the known entries still around lead the current list. A pointer alone isn't
+    #enough, a freed entry's address can come back for a new operator
+    known = [pointer for pointer, _ in _history]
+    for offset in range(len(known)):
+        if pointers[:len(known) - offset] == known[offset:]:
+            return offset
+    return len(known)
+
+def _poll_operators():
+    if _recording is None:
+        return None
+
+    operators = list(bpy.context.window_manager.operators)
+    pointers = [op.as_pointer() for op in operators]
+    history = _history[history_offset(pointers):]
+
+    #Redo panel tweaks run the same history entry again, keep its latest properties
+    for op, (_, step) in zip(operators, history):
+        if step is not None:
+            step["properties"] = operator_properties(op)
+
+    for op, pointer in zip(operators[len(history):], pointers[len(history):]):
+        step = None
+        name = operator_name(op.bl_idname)
+        if name.startswith("bp.") and name not in SKIPPED_OPERATORS:
+            step = {"operator": name, "properties": operator_properties(op)}
+            _recording.append(step)
+        history.append((pointer, step))
+
+    _history[:] = history
+    return 0.2
+
+def start_recording():
+    global _recording
+    _recording = []
+
+    #Operators that ran before the recording started stay out of it
+    _history[:] = [(op.as_pointer(), None) for op in bpy.context.window_manager.operators]
+    bpy.app.timers.register(_poll_operators, first_interval=0.2)
+
+def on_load_post():
+    #The history and the recording belong to the file that was closed
+    global _recording
+    _recording = None
+    _history.clear()
+
+def stop_recording(textName: str):
+    global _recording
+    _poll_operators()
+    steps = _recording
+    _recording = None
+    _history.clear()
+
+    text = bpy.data.texts.get(textName) or bpy.data.texts.new(textName)
+    text.from_string(json.dumps({"version": MACRO_VERSION, "steps": steps}, indent=1))
+    return steps
+
+# ---------------- Replay -----------------
+def load_macro(data: str):
+    macro = json.loads(data)
+    if macro.get("version") != MACRO_VERSION:
+        raise ValueError(f"Unsupported macro version {macro.get('version')}")
+    return macro["steps"]
+
+def step_scope(step):
+    #Mesh operators work on the active object, object operators on the selection
+    prefix, name = step["operator"].split(".")
+    cls = bpy.types.Operator.bl_rna_get_subclass_py(f"{prefix.upper()}_OT_{name}")
+    return 'OBJECT' if cls is None or cls.__name__.startswith("OBJECT_OT_") else 'MESH'
+
+def group_steps(steps):
+    #Consecutive steps of the same scope run together
+    groups = []
+    for step in steps:
+        scope = step_scope(step)
+        if groups and groups[-1][0] == scope:
+            groups[-1][1].append(step)
+        else:
+            groups.append((scope, [step]))
+    return groups
+
+def call_step(step):
+    module, name = step["operator"].split(".")
+    operator = getattr(getattr(bpy.ops, module), name)
+    return operator('EXEC_DEFAULT', **step["properties"])
+
+def select_objects(viewLayer, previous, objects, active):
+    keep = set(objects)
+    for obj in previous:
+        if obj not in keep:
+            obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    viewLayer.objects.active = active
+    return objects
+
+def ensure_object_mode():
+    if bpy.context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+def play_macro(self, steps, objects):
+    if not objects or not steps:
+        return 0
+
+    viewLayer = bpy.context.view_layer
+    selection = list(bpy.context.selected_objects)
+    activeObj = viewLayer.objects.active
+    failed = 0
+
+    ensure_object_mode()
+    bp_modifiers.begin_batch()
+    bp_queue.inline = True
+    try:
+        #Shared setup once for every object and step
+        bp_modifiers.reimport_nodegroups(self)
+        for obj in objects:
+            bp_modifiers.verify_attributes_exist(obj)
+
+        selected = select_objects(viewLayer, selection, objects, objects[0])
+        for scope, groupSteps in group_steps(steps):
+            if scope == 'OBJECT':
+                selected = select_objects(viewLayer, selected, objects, objects[0])
+                for step in groupSteps:
+                    try:
+                        call_step(step)
+                    except (RuntimeError, TypeError) as e:
+                        failed += 1
+                        self.report({'WARNING'}, f"{step['operator']}: {e}")
+                continue
+
+            for obj in objects:
+                selected = select_objects(viewLayer, selected, [obj], obj)
+                for step in groupSteps:
+                    try:
+                        call_step(step)
+                    except (RuntimeError, TypeError) as e:
+                        failed += 1
+                        self.report({'WARNING'}, f"{step['operator']} on {obj.name}: {e}")
+                #Next object can only become active from object mode
+                ensure_object_mode()
+    finally:
+        bp_queue.inline = False
+        bp_modifiers.end_batch()
+
+    ensure_object_mode()
+    select_objects(viewLayer, selected, selection, activeObj)
+    return failed
+
+# ---------------- Operators -----------------
+def record_macro(self, context):
+    if not is_recording():
+        start_recording()
+        self.report({'INFO'}, "Recording BP operations")
+        return {'FINISHED'}
+
+    steps = stop_recording(self.macroName)
+    self.report({'INFO'}, f"Recorded {len(steps)} steps into text '{self.macroName}'")
+    return {'FINISHED'}
+
+def play_macro_operator(self, context):
+    try:
+        if self.filepath:
+            with open(bpy.path.abspath(self.filepath), "r", encoding="utf-8") as file:
+                steps = load_macro(file.read())
+        else:
+            text = bpy.data.texts.get(self.macroName)
+            if text is None:
+                self.report({'WARNING'}, f"No macro text '{self.macroName}'")
+                return {'CANCELLED'}
+            steps = load_macro(text.as_string())
+    except (OSError, ValueError, KeyError) as e:
+        self.report({'WARNING'}, f"Failed to read macro: {e}")
+        return {'CANCELLED'}
+
+    objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+    if not objects:
+        self.report({'WARNING'}, "No selected objects")
+        return {'CANCELLED'}
+
+    failed = play_macro(self, steps, objects)
+    self.report({'INFO'}, f"Played {len(steps)} steps on {len(objects)} objects, {failed} failed")
+    return {'FINISHED'}
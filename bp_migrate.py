@@ -0,0 +1,144 @@
+import bpy
+import numpy as np
+
+from . import bp_data
+from . import bp_modifiers
+
+#Migration of files made with the legacy bp2_modifiers/bp2_functions path.
+#Legacy edge layers are merged into their bp_* counterparts with bulk array reads
+#and writes, the BP2_* modifiers are replaced by an equivalent bp_modifiers stack
+#and the old layers and node groups are dropped.
+
+#Legacy attribute -> current attribute
+LEGACY_ATTRIBUTES = {
+    "bevel_fillet_weighted": "bp_bevel_fillet_weighted",
+    "bevel_fillet_constrained": "bp_bevel_fillet_constrained",
+    "panel_edge": "bp_panel_edge",
+    "sharps_edge": "sharp_edge",
+}
+
+def is_legacy_modifier(mod):
+    return "BP2" in mod.name
+
+def needs_migration(obj):
+    if obj.type != 'MESH':
+        return False
+
+    attributes = obj.data.attributes
+    return any(is_legacy_modifier(mod) for mod in obj.modifiers) or any(name in attributes for name in LEGACY_ATTRIBUTES)
+
+def migrate_attributes(mesh):
+    migrated = 0
+    for legacyName, name in LEGACY_ATTRIBUTES.items():
+        legacy = mesh.attributes.get(legacyName)
+        if legacy is None:
+            continue
+
+        if legacy.domain != 'EDGE':
+            print("Skipped legacy attribute " + legacyName + " on " + mesh.name + ", not an edge attribute")
+            continue
+
+        dataType = bp_data.BP_EDGE_ATTRIBUTE_TYPES[name]
+        dtype = bp_data.BP_EDGE_ATTRIBUTES[name]
+        bp_data.ensure_attribute(mesh, name, dataType)
+
+        #Keep flags already set on the new layer, the strongest value wins
+        values = np.maximum(bp_data.read_attribute(mesh, legacyName, dtype), bp_data.read_attribute(mesh, name, dtype))
+        bp_data.write_attribute(mesh, name, values)
+
+        linkedName = bp_data.LINKED_ATTRIBUTES.get(name)
+        if linkedName is not None:
+            bp_data.ensure_attribute(mesh, linkedName, 'BOOLEAN')
+            linked = bp_data.read_attribute(mesh, linkedName, np.bool_) | (values > 0)
+            bp_data.write_attribute(mesh, linkedName, linked)
+
+        #Lookup again, adding attributes can invalidate the old reference
+        mesh.attributes.remove(mesh.attributes[legacyName])
+        migrated += 1
+
+    return migrated
+
+def legacy_stack_settings(obj):
+    #Translate the BP2_* modifiers into add_modifiers settings
+    settings = bp_modifiers.StackSettings(
+        addSubD=False,
+        addFilletConstrained=False,
+        addFilletWeighted=False,
+        addPanelling=False,
+        addEdgeChamfer=False,
+        addAutoUV=False,
+    )
+
+    for mod in obj.modifiers:
+        if not is_legacy_modifier(mod):
+            continue
+
+        if "SubD" in mod.name:
+            settings.addSubD = True
+            settings.subdLevels = int(mod.get("Socket_4", settings.subdLevels))
+        elif "Bevel_Constrained" in mod.name:
+            settings.addFilletConstrained = True
+            settings.constrainedFilletSegments = mod.segments
+        elif "Bevel_Weighted" in mod.name:
+            settings.addFilletWeighted = True
+            settings.weightedFilletSegments = mod.segments
+            settings.weightedFilletSize = mod.width
+        elif "Panelize" in mod.name:
+            settings.addPanelling = True
+            settings.panelThickness = mod.thickness
+        elif "PanelSplit" in mod.name:
+            settings.addPanelling = True
+        elif "EdgeChamfer" in mod.name:
+            settings.addEdgeChamfer = True
+            settings.edgeChamferSegments = mod.segments
+            settings.edgeChamferSize = mod.width
+        elif "AutoUV" in mod.name:
+            settings.addAutoUV = True
+
+    return settings
+
+def migrate_stack(obj):
+    legacyModifiers = [mod for mod in obj.modifiers if is_legacy_modifier(mod)]
+    if not legacyModifiers:
+        return False
+
+    settings = legacy_stack_settings(obj)
+    for mod in legacyModifiers:
+        obj.modifiers.remove(mod)
+
+    bp_modifiers.add_stack(settings, obj)
+    return True
+
+def remove_legacy_nodegroups():
+    legacy = [group for group in bpy.data.node_groups if group.name.startswith("BP2_") and group.users == 0]
+    bpy.data.batch_remove(legacy)
+    return len(legacy)
+
+def migrate_objects(reporter, objects):
+    objects = [obj for obj in objects if needs_migration(obj)]
+    if not objects:
+        return 0, 0
+
+    #Node groups are shared, import the current ones once for the whole batch
+    bp_modifiers.reimport_nodegroups(reporter)
+
+    layers = 0
+    for obj in objects:
+        layers += migrate_attributes(obj.data)
+        migrate_stack(obj)
+
+    remove_legacy_nodegroups()
+    return len(objects), layers
+
+def migrate_bp2(self, context):
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    objects = context.selected_objects if self.selectedOnly else context.scene.objects
+    migrated, layers = migrate_objects(self, objects)
+
+    if migrated == 0:
+        self.report({'INFO'}, "No legacy BP2 data found")
+    else:
+        self.report({'INFO'}, f"Migrated {migrated} objects, {layers} legacy layers")
+    return {'FINISHED'}
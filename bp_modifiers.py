@@ -1,8 +1,13 @@
 import bpy
+import hashlib
 import math
 import os
 
 from bpy.types import Mesh
+from . import bp_edges
+from . import bp_panels
+from . import bp_region
+from . import bp_spline
 
 #from . import bp_helpers as BP
 
@@ -55,7 +60,7 @@ def depsgraph_modifier_update_handler(scene, depsgraph):
 
 def reimport_nodegroup(self, node_name: str , force_reimport: bool = False, report=None):
     addon_path = os.path.dirname(__file__)
-    blendfile_path = os.path.join(addon_path, "BP_nodes.blend")
+    blendfile_path = os.path.join(addon_path, "bp_nodes.blend")
 
     try:
         edit_mode = bpy.context.mode == 'EDIT_MESH'
@@ -97,7 +102,24 @@ def reimport_nodegroup(self, node_name: str , force_reimport: bool = False, repo
 
     return True
 
+#Shared setup already done by the running batch, None outside of one
+_batch = None
+
+def begin_batch():
+    global _batch
+    _batch = {"nodegroups": False, "verified": set()}
+
+def end_batch():
+    global _batch
+    _batch = None
+
 def reimport_nodegroups(self, force_reimport: bool = False):
+    #Once per batch instead of once per replayed call
+    if _batch is not None:
+        if _batch["nodegroups"]:
+            return {'FINISHED'}
+        _batch["nodegroups"] = True
+
     reimport_nodegroup(self, "BP_SubD")
     reimport_nodegroup(self, "BP_PanelSplit")
     reimport_nodegroup(self, "BP_AutoUV")
@@ -107,15 +129,20 @@ def reimport_nodegroups(self, force_reimport: bool = False):
     return {'FINISHED'}
 
 def verify_attributes_exist(obj: Mesh):
-    
+    #Objects checked earlier in the running batch keep their attributes
+    if _batch is not None:
+        if obj.name in _batch["verified"]:
+            return {'FINISHED'}
+        _batch["verified"].add(obj.name)
+
     #Force Object Mode
     toggledObjectMode = False
     if bpy.context.mode != 'OBJECT':
         bpy.ops.object.mode_set(mode='OBJECT')
         toggledObjectMode = True
 
-    #obj.shade_flat()
-    bpy.ops.object.shade_flat()
+    #Per mesh, the operator would shade the whole selection on every call
+    obj.data.shade_flat()
 
 
     attributes: bpy.types.Attribute = obj.data.attributes
@@ -206,6 +233,42 @@ def verify_attributes_exist(obj: Mesh):
 
     return {'FINISHED'} 
 
+def _signature_value(value):
+    #Plain, address-free representation of a modifier setting
+    if isinstance(value, bpy.types.Object):
+        return (value.name, tuple(value.matrix_world.translation))
+    if isinstance(value, bpy.types.ID):
+        return value.name
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if hasattr(value, "to_list"):
+        return tuple(value.to_list())
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return tuple(value)
+    return value
+
+def stack_signature(obj):
+    #Hash of every BP modifier setting, visibility toggles are left out
+    digest = hashlib.blake2b(digest_size=16)
+
+    for mod in obj.modifiers:
+        if "BP" not in mod.name:
+            continue
+
+        digest.update(mod.name.encode())
+        for prop in mod.bl_rna.properties:
+            if prop.is_readonly or prop.type == 'COLLECTION' or prop.identifier.startswith("show_"):
+                continue
+            if prop.identifier in ("name", "is_active", "is_override_data_local", "use_pin_to_last"):
+                continue
+            digest.update(repr((prop.identifier, _signature_value(getattr(mod, prop.identifier)))).encode())
+
+        #Geometry node sockets are stored as ID properties
+        for key in mod.keys():
+            digest.update(repr((key, _signature_value(mod[key]))).encode())
+
+    return digest.hexdigest()
+
 def setup_modifier(self, obj, name: str, modifierType: str, settings: dict):
     sortingPrefix = " "
     namePrefix = "BP_"
@@ -227,21 +290,8 @@ def setup_modifier(self, obj, name: str, modifierType: str, settings: dict):
         else:
             mod = obj.modifiers.new(name, modifierType)
 
-        #Default generic modifier properties
-        setattr(mod, "name", sortingPrefix + name)
-        setattr(mod, "show_expanded", False)
-        setattr(mod, "show_in_editmode", True)
-        setattr(mod, "show_viewport", True)
-        setattr(mod, "show_render", True)
-
-        #Apply properties from dictionary
-        for key, value in settings.items():
-            try:
-                setattr(mod, key, value)
-            except AttributeError:
-                print("Error on modifier: " + name + " attribute " + key)
-                mod[key] = value  # fallback for custom props like sockets
-            #setattr(mod, key, value)
+        #Default generic modifier properties, then the ones from the dictionary
+        bp_edges.configure_modifier(mod, sortingPrefix + name, settings)
 
         print("Added modifier: " + name)
     else:
@@ -249,6 +299,67 @@ def setup_modifier(self, obj, name: str, modifierType: str, settings: dict):
 
     return mod
 
+class StackSettings:
+    #Plain stand-in for OBJECT_OT_add_modifiers, for building stacks outside the operator
+    simplifiedStack = False
+    addSubD = False
+    addFilletConstrained = True
+    addFilletWeighted = True
+    addPanelling = True
+    addEdgeChamfer = True
+    addAutoUV = False
+    addShrinkwrap = False
+    edgeChamferSize = 0.01
+    edgeChamferSegments = 2
+    panelThickness = 0.02
+    constrainedFilletSegments = 12
+    weightedFilletSize = 0.5
+    weightedFilletSegments = 6
+    subdLevels = 2
+    addSplineFillet = False
+    splineFilletAttribute = "bp_bevel_fillet_constrained"
+    splineFilletRadius = 0.01
+    splineFilletSegments = 4
+
+    def __init__(self, **settings):
+        for key, value in settings.items():
+            setattr(self, key, value)
+
+    def report(self, level, message):
+        print(f"{next(iter(level))}: {message}")
+
+def snapshot_settings(operator):
+    #Operator properties copied into plain settings, queued jobs outlive the operator
+    return StackSettings(**{prop.identifier: getattr(operator, prop.identifier) for prop in operator.bl_rna.properties if prop.identifier != "rna_type"})
+
+def add_stack(self, obj):
+    #Stage order of the BP stack
+    if self.addSubD == True:
+        add_mod_subD(self, obj)
+    
+    if self.addFilletConstrained == True and self.simplifiedStack == False:
+        add_mod_constrainedFillets(self, obj)
+    
+    if self.addFilletWeighted == True and self.simplifiedStack == False:    
+        add_mod_weightedFillets(self, obj)
+    
+    if self.addShrinkwrap == True and self.simplifiedStack == False: 
+        add_mod_shrinkwrap(self, obj)
+
+    if self.addPanelling == True: 
+        add_mod_panelize(self, obj)
+    
+    if self.addAutoUV == True and self.simplifiedStack == False:
+        add_mod_autoUV(self, obj)
+
+    if self.addEdgeChamfer == True:
+        add_mod_edgeChamfer(self, obj)
+
+    if self.addSplineFillet == True and self.simplifiedStack == False:
+        add_mod_splineFillet(self, obj)
+
+    return {'FINISHED'}
+
 def add_mod_subD(self, obj):
     subd_level = self.subdLevels
     setup_modifier(self, obj, name = "SubD", modifierType = "NODES", settings = {
@@ -270,11 +381,13 @@ def add_mod_constrainedFillets(self, obj):
         "edge_weight": "bp_bevel_fillet_constrained"
     })
 
+    #Only the vertices around flagged edges can end up overlapping after the bevel
     setup_modifier(self, obj, "Weld", modifierType = "WELD", settings = {
         "mode": "CONNECTED",
-        "merge_threshold": 0.0001
-
+        "merge_threshold": 0.0001,
+        "vertex_group": bp_region.REGION_GROUP,
     })
+    bp_region.update_region(obj)
 
     return {"FINISHED"}
 
@@ -303,15 +416,22 @@ def add_mod_panelize(self, obj):
         "thickness": self.panelThickness,
     }) 
 
+    #Island IDs for the panel stages, edit mode data would overwrite them
+    if obj.mode != 'EDIT':
+        bp_panels.update_islands(obj.data)
+
     return {'FINISHED'}
 
 def add_mod_edgeChamfer(self, obj):
     angle_threshold = bpy.context.scene.get("BP_settings_edgechamfer_angle", 30) #Default angle threshold of 30 degrees
     radian_threshold = math.radians(angle_threshold) #Convert to radians
-    setup_modifier(self, obj, name = "EdgeDetect", modifierType = "NODES", settings = {
-        #"Socket_4": radian_threshold,
-        #"Angle threshold": radian_threshold,
-    }) 
+
+    #Objects with baked auto-chamfer flags don't need live detection
+    if not obj.get("bp_autochamfer"):
+        setup_modifier(self, obj, name = "EdgeDetect", modifierType = "NODES", settings = {
+            #"Socket_4": radian_threshold,
+            #"Angle threshold": radian_threshold,
+        }) 
 
     setup_modifier(self, obj, name = "EdgeChamfer", modifierType = "BEVEL", settings = {
         "limit_method": 'WEIGHT',
@@ -333,6 +453,16 @@ def add_mod_edgeChamfer(self, obj):
 
     return {'FINISHED'}
 
+def add_mod_splineFillet(self, obj):
+    #Built here instead of imported, it reads the traced curves from an object socket
+    bp_spline.ensure_nodegroup()
+    setup_modifier(self, obj, name = "SplineFilletCurves", modifierType = "NODES", settings = {})
+
+    bp_spline.configure_modifier(obj, obj.modifiers[bp_spline.MODIFIER_NAME],
+        self.splineFilletAttribute, self.splineFilletRadius, self.splineFilletSegments)
+
+    return {'FINISHED'}
+
 def add_mod_autoUV(self, obj):
     setup_modifier(self, obj, name = "AutoUV", modifierType = "NODES", settings = {}
         #"show_viewport", False,}
@@ -0,0 +1,95 @@
+import bpy
+import re
+
+from . import bp_spline
+
+#Node group garbage collector. Failed or colliding reimports leave "_temp_" groups and
+#"BP_SubD.001" style copies behind. Every group the addon brings is reduced to its base
+#name, all users of the copies are remapped onto one canonical group per name and the
+#copies and addon groups nobody uses any more are purged. Runs after load and before
+#save. Groups with a fake user are the user's to keep and are never touched.
+
+#Groups imported from bp_nodes.blend or built by the addon, nothing else is collected
+ADDON_NODEGROUPS = {"BP_SubD", "BP_PanelSplit", "BP_AutoUV", "BP_EdgeDetect", "BP_SplineFillet", bp_spline.NODEGROUP_NAME}
+TEMP_SUFFIX = "_temp_"
+NUMBER_SUFFIX = re.compile(r"\.\d{3,}$")
+
+def base_name(name: str):
+    #Strip copy numbers and temp suffixes in any order, "BP_SubD.001_temp_" -> "BP_SubD"
+    while True:
+        if name.endswith(TEMP_SUFFIX):
+            name = name[:-len(TEMP_SUFFIX)]
+        elif NUMBER_SUFFIX.search(name):
+            name = NUMBER_SUFFIX.sub("", name)
+        else:
+            return name
+
+def bp_nodegroups():
+    #Base name -> local addon groups sharing it, linked library data is left alone
+    groups = {}
+    for group in bpy.data.node_groups:
+        if group.library is not None or group.use_fake_user:
+            continue
+        name = base_name(group.name)
+        if name in ADDON_NODEGROUPS:
+            groups.setdefault(name, []).append(group)
+    return groups
+
+def canonical_group(name: str, groups):
+    #The group already holding the plain name, else the most used one that isn't a temp
+    return max(groups, key=lambda group: (group.name == name, not group.name.endswith(TEMP_SUFFIX), group.users))
+
+def remap_duplicates(groups):
+    #One pass over every base name, each copy hands its users to the canonical group
+    duplicates = []
+    renames = []
+    for name, candidates in groups.items():
+        canonical = canonical_group(name, candidates)
+        for group in candidates:
+            if group is not canonical:
+                group.user_remap(canonical)
+                duplicates.append(group)
+        if canonical.name != name:
+            renames.append((canonical, name))
+
+    bpy.data.batch_remove(duplicates)
+
+    #Only once the copies are gone, the plain name would be taken otherwise. A protected
+    #group keeping the name keeps it
+    for group, name in renames:
+        if bpy.data.node_groups.get(name) is None:
+            group.name = name
+
+    return len(duplicates)
+
+def orphaned_groups():
+    return [group for groups in bp_nodegroups().values() for group in groups if group.users == 0]
+
+def purge_orphans():
+    #Nested groups only become orphans once their parents are removed
+    purged = 0
+    orphans = orphaned_groups()
+    while orphans:
+        bpy.data.batch_remove(orphans)
+        purged += len(orphans)
+        orphans = orphaned_groups()
+    return purged
+
+def collect_garbage():
+    remapped = remap_duplicates(bp_nodegroups())
+    return remapped, purge_orphans()
+
+# ---------------- Handlers -----------------
+def on_load_post():
+    remapped, purged = collect_garbage()
+    if remapped or purged:
+        print(f"BP node groups: remapped {remapped} duplicates, purged {purged} orphans")
+
+def on_save_pre():
+    collect_garbage()
+
+# ---------------- Operators -----------------
+def clean_nodegroups(self, context):
+    remapped, purged = collect_garbage()
+    self.report({'INFO'}, f"Remapped {remapped} duplicate node groups, purged {purged} unused ones")
+    return {'FINISHED'}
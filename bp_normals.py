@@ -0,0 +1,201 @@
+import bpy
+import numpy as np
+
+from . import bp_data
+from . import bp_freeze
+
+#Baked weighted normals. The stack is evaluated once and its face-weighted normals are
+#stored as custom split normals, either on a frozen copy (thawing brings the live
+#modifier back) or on the applied mesh, so BP_WeightedNormals stops re-running on
+#every upstream change.
+
+MODIFIER_NAME = " BP_WeightedNormals"
+
+#Face strength layer the Bevel modifier writes for Weighted Normal's face influence
+FACE_STRENGTH_ATTRIBUTE = "__mod_weightednormals_faceweight"
+
+def next_corners(mesh):
+    #Next corner around each face
+    loopStarts = bp_data.read_loop_starts(mesh)
+    loopTotals = bp_data.read_loop_totals(mesh)
+    corners = np.arange(len(mesh.loops), dtype=np.int32) + 1
+    corners[loopStarts + loopTotals - 1] = loopStarts
+    return corners
+
+def split_edges(mesh, loopEdges, loopFaces, keepSharp: bool):
+    #Edges the corner fans don't cross: non-manifold, and with keepSharp marked
+    #sharp edges and edges of flat faces
+    split = np.bincount(loopEdges, minlength=len(mesh.edges)) != 2
+    if keepSharp:
+        sharpEdges = bp_data.read_attribute(mesh, "sharp_edge", np.bool_)
+        if sharpEdges is not None:
+            split |= sharpEdges
+
+        sharpFaces = bp_data.read_attribute(mesh, "sharp_face", np.bool_)
+        if sharpFaces is not None:
+            split[loopEdges[sharpFaces[loopFaces]]] = True
+
+    return split
+
+def corner_fans(mesh, loopEdges, loopFaces, keepSharp: bool = True):
+    #Corners of a vertex joined across every smooth edge share one fan (one normal)
+    loopVertices = bp_data.read_loop_vertices(mesh)
+    nextCorners = next_corners(mesh)
+    split = split_edges(mesh, loopEdges, loopFaces, keepSharp)
+
+    #Each corner touches its edge at its own vertex and at the next corner's vertex
+    edges = np.concatenate((loopEdges, loopEdges))
+    verts = np.concatenate((loopVertices, loopVertices[nextCorners]))
+    corners = np.concatenate((np.arange(len(loopEdges), dtype=np.int32), nextCorners))
+
+    smooth = ~split[edges]
+    keys = edges[smooth].astype(np.int64) * len(mesh.vertices) + verts[smooth]
+    corners = corners[smooth]
+
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    same = np.flatnonzero(keys[1:] == keys[:-1])
+    return bp_data.connected_components(len(loopEdges), corners[order[same]], corners[order[same + 1]])
+
+def weight_base(weight: int):
+    #The modifier's weight turned into the base its ranks are divided by, same mapping
+    if weight == 100:
+        return float(np.iinfo(np.int16).max)
+    if weight == 1:
+        return 1.0 / np.iinfo(np.int16).max
+    base = weight / 50.0
+    if (base - 1.0) * 25.0 > 1.0:
+        return (base - 1.0) * 25.0
+    return base
+
+def area_ranks(fans, areas, fanCount: int, thresh: float):
+    #Rank of every corner's face within its fan, largest area first. Like the modifier,
+    #the rank only goes up once an area differs from the last ranked one by more than
+    #thresh. Fans hold a handful of corners, so they are walked in lockstep
+    order = np.lexsort((-areas, fans))
+    sortedFans = fans[order]
+    sortedAreas = areas[order]
+    starts = np.flatnonzero(np.r_[True, sortedFans[1:] != sortedFans[:-1]])
+    position = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+
+    bySlot = np.argsort(position, kind='stable')
+    bounds = np.searchsorted(position[bySlot], np.arange(int(position.max(initial=-1)) + 2))
+    fanRanks = np.zeros(fanCount, dtype=np.int64)
+    anchors = np.zeros(fanCount, dtype=np.float64)
+    sortedRanks = np.zeros(len(order), dtype=np.int64)
+    for slot in range(len(bounds) - 1):
+        indices = bySlot[bounds[slot]:bounds[slot + 1]]
+        slotFans = sortedFans[indices]
+        slotAreas = sortedAreas[indices]
+        if slot == 0:
+            anchors[slotFans] = slotAreas
+        else:
+            changed = np.abs(anchors[slotFans] - slotAreas) > thresh
+            fanRanks[slotFans[changed]] += 1
+            anchors[slotFans[changed]] = slotAreas[changed]
+        sortedRanks[indices] = fanRanks[slotFans]
+
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = sortedRanks
+    return ranks
+
+def weighted_normals(mesh, weight: int = 100, keepSharp: bool = True, faceInfluence: bool = True, thresh: float = 0.01):
+    #Face area weighted corner normals, the WeightedNormal modifier's Face Area mode:
+    #each fan ranks its faces by area and divides their contribution by base ** rank
+    loopEdges = bp_data.read_loop_edges(mesh)
+    loopFaces = bp_data.loop_faces(bp_data.read_loop_totals(mesh))
+    fans = corner_fans(mesh, loopEdges, loopFaces, keepSharp)
+    fanCount = int(fans.max()) + 1 if len(fans) else 0
+
+    faceNormals = bp_data.read_face_normals(mesh)
+    areas = np.empty(len(mesh.polygons), dtype=np.float32)
+    mesh.polygons.foreach_get("area", areas)
+    areas = areas.astype(np.float64)
+
+    contributing = np.ones(len(loopFaces), dtype=np.bool_)
+    strength = bp_data.read_attribute(mesh, FACE_STRENGTH_ATTRIBUTE, np.int32) if faceInfluence else None
+    if strength is not None:
+        #Only the strongest faces around a fan count, like the modifier's face influence
+        cornerStrength = strength[loopFaces]
+        fanStrength = np.full(fanCount, np.iinfo(np.int32).min, dtype=np.int32)
+        np.maximum.at(fanStrength, fans, cornerStrength)
+        contributing = cornerStrength == fanStrength[fans]
+
+    #Ranks only count the faces that contribute, weaker faces reset nothing
+    cornerWeights = np.zeros(len(loopFaces), dtype=np.float64)
+    corners = np.flatnonzero(contributing)
+    cornerAreas = areas[loopFaces[corners]]
+    ranks = area_ranks(fans[corners], cornerAreas, fanCount, thresh)
+    with np.errstate(over='ignore'):
+        cornerWeights[corners] = cornerAreas / weight_base(weight) ** ranks
+    fanNormals = np.empty((fanCount, 3), dtype=np.float64)
+    for axis in range(3):
+        fanNormals[:, axis] = np.bincount(fans, weights=faceNormals[loopFaces, axis] * cornerWeights, minlength=fanCount)
+
+    normals = fanNormals[fans]
+    lengths = np.linalg.norm(normals, axis=1)
+    valid = lengths > 1e-12
+    normals[valid] /= lengths[valid, None]
+    normals[~valid] = faceNormals[loopFaces[~valid]]
+    return normals.astype(np.float32)
+
+def modifier_settings(obj):
+    mod = obj.modifiers.get(MODIFIER_NAME)
+    if mod is None:
+        return {"weight": 100, "keepSharp": True, "faceInfluence": True, "thresh": 10.0}
+    return {"weight": mod.weight, "keepSharp": mod.keep_sharp, "faceInfluence": mod.use_face_influence, "thresh": mod.thresh}
+
+def evaluate_stack(context, obj, vectorized: bool):
+    #Evaluated copy of the stack, without the live normals when numpy computes them
+    mod = obj.modifiers.get(MODIFIER_NAME)
+    visible = mod is not None and mod.show_viewport
+    if vectorized and visible:
+        mod.show_viewport = False
+
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = bpy.data.meshes.new_from_object(evaluated, preserve_all_data_layers=True, depsgraph=depsgraph)
+    finally:
+        if vectorized and visible:
+            mod.show_viewport = True
+
+    if vectorized:
+        settings = modifier_settings(obj)
+        mesh.normals_split_custom_set(weighted_normals(mesh, **settings))
+
+    return mesh
+
+def apply_object(obj, mesh):
+    #Swap in the baked mesh and drop the modifiers it already contains
+    source = obj.data
+    mesh.name = source.name
+    obj.data = mesh
+    for mod in list(obj.modifiers):
+        if mod.show_viewport or mod.name == MODIFIER_NAME:
+            obj.modifiers.remove(mod)
+
+    if source.users == 0:
+        bpy.data.meshes.remove(source)
+
+def bake_normals(self, context):
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    objects = [obj for obj in context.selected_objects if obj.type == 'MESH' and obj.modifiers.get(MODIFIER_NAME)]
+    objects = [obj for obj in objects if not bp_freeze.is_frozen(obj)]
+    if not objects:
+        self.report({'WARNING'}, "No selected unfrozen objects with Weighted Normals")
+        return {'CANCELLED'}
+
+    for obj in objects:
+        mesh = evaluate_stack(context, obj, self.vectorized)
+        if self.target == 'APPLY':
+            apply_object(obj, mesh)
+        else:
+            bp_freeze.freeze_object(obj, None, frozenMesh=mesh)
+
+    action = "Applied" if self.target == 'APPLY' else "Froze"
+    self.report({'INFO'}, f"{action} {len(objects)} objects with baked normals")
+    return {'FINISHED'}
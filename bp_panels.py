@@ -0,0 +1,165 @@
+import bpy
+import numpy as np
+
+from . import bp_data
+
+#Panel islands: faces connected without crossing a bp_panel_edge share an island ID.
+#The IDs are stored in the bp_panel_island face attribute so PanelSplit/Panelize and
+#the island tools read them instead of working the regions out on every evaluation.
+#Flag changes only re-label the islands touching the changed edges.
+
+ISLAND_ATTRIBUTE = "bp_panel_island"
+THICKNESS_GROUP = "BP_PanelThickness"
+
+#Mesh name -> topology key, panel flags, face pairs and islands of the last update
+_islands = {}
+
+def face_pairs(mesh):
+    faces = bp_data.loop_faces(bp_data.read_loop_totals(mesh))
+    return bp_data.edge_face_pairs(bp_data.read_loop_edges(mesh), faces)
+
+def panel_flags(mesh):
+    flags = bp_data.read_attribute(mesh, "bp_panel_edge", np.bool_)
+    return np.zeros(len(mesh.edges), dtype=np.bool_) if flags is None else flags
+
+def compute_islands(faceCount: int, pairs, flags):
+    edges, first, second = pairs
+    openEdges = ~flags[edges]
+    return bp_data.connected_components(faceCount, first[openEdges], second[openEdges])
+
+def relabel_islands(islands, pairs, flags, changedEdges):
+    #Only islands on either side of a changed edge can merge or split
+    edges, first, second = pairs
+    touched = np.isin(edges, changedEdges)
+    affected = np.unique(np.concatenate((islands[first[touched]], islands[second[touched]])))
+    if len(affected) == 0:
+        return islands
+
+    faceMask = np.isin(islands, affected)
+    faces = np.flatnonzero(faceMask)
+    local = np.full(len(islands), -1, dtype=np.int32)
+    local[faces] = np.arange(len(faces), dtype=np.int32)
+
+    #Open edges never cross from an affected island into an untouched one
+    keep = ~flags[edges] & faceMask[first]
+    labels = bp_data.connected_components(len(faces), local[first[keep]], local[second[keep]])
+
+    result = islands.copy()
+    result[faces] = labels + islands.max() + 1
+    _, result = np.unique(result, return_inverse=True)
+    return result.astype(np.int32).reshape(-1)
+
+def update_islands(mesh):
+    #Object mode only, edit mode data would overwrite the attribute
+    flags = panel_flags(mesh)
+    topology = bp_data.topology_fingerprint(mesh)
+    cached = _islands.get(mesh.name)
+
+    if cached is not None and cached["topology"] == topology and ISLAND_ATTRIBUTE in mesh.attributes:
+        changedEdges = np.flatnonzero(cached["flags"] != flags)
+        if len(changedEdges) == 0:
+            return cached["islands"]
+
+        pairs = cached["pairs"]
+        islands = relabel_islands(cached["islands"], pairs, flags, changedEdges)
+    else:
+        pairs = face_pairs(mesh)
+        islands = compute_islands(len(mesh.polygons), pairs, flags)
+
+    bp_data.ensure_attribute(mesh, ISLAND_ATTRIBUTE, 'INT', domain='FACE')
+    bp_data.write_attribute(mesh, ISLAND_ATTRIBUTE, islands)
+    mesh.update()
+
+    _islands[mesh.name] = {
+        "topology": topology,
+        "flags": flags,
+        "pairs": pairs,
+        "islands": islands,
+    }
+    return islands
+
+def island_faces(mesh, islands):
+    #Faces of every island that has at least one selected face
+    selected = np.empty(len(mesh.polygons), dtype=np.bool_)
+    mesh.polygons.foreach_get("select", selected)
+    return np.isin(islands, np.unique(islands[selected]))
+
+# ---------------- Operators -----------------
+def select_panel_islands(self, context):
+    objects = [obj for obj in context.selected_objects if obj.type == 'MESH'] or [context.active_object]
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    islandCount = 0
+    for obj in objects:
+        mesh = obj.data
+        islands = update_islands(mesh)
+        faceSelect = island_faces(mesh, islands)
+        islandCount += len(np.unique(islands[faceSelect]))
+
+        #Flush to edges and vertices so the selection holds in every select mode
+        loopSelect = np.repeat(faceSelect, bp_data.read_loop_totals(mesh))
+        edgeSelect = np.zeros(len(mesh.edges), dtype=np.bool_)
+        edgeSelect[bp_data.read_loop_edges(mesh)[loopSelect]] = True
+        vertSelect = np.zeros(len(mesh.vertices), dtype=np.bool_)
+        vertSelect[bp_data.read_loop_vertices(mesh)[loopSelect]] = True
+
+        mesh.polygons.foreach_set("select", faceSelect)
+        mesh.edges.foreach_set("select", edgeSelect)
+        mesh.vertices.foreach_set("select", vertSelect)
+
+    bpy.ops.object.mode_set(mode='EDIT')
+    self.report({'INFO'}, f"Selected {islandCount} panel islands")
+    return {'FINISHED'}
+
+def read_group_weights(obj, group):
+    weights = np.zeros(len(obj.data.vertices), dtype=np.float32)
+    for vert in obj.data.vertices:
+        for element in vert.groups:
+            if element.group == group.index:
+                weights[vert.index] = element.weight
+    return weights
+
+def write_group_weights(group, weights):
+    #One call per distinct weight, islands share a handful of thickness values
+    for weight in np.unique(weights):
+        group.add(np.flatnonzero(weights == weight).tolist(), float(weight), 'REPLACE')
+
+def set_island_thickness(self, context):
+    obj = context.active_object
+    mod = obj.modifiers.get(" BP_Panelize") if obj is not None else None
+    if mod is None:
+        self.report({'WARNING'}, "Active object has no Panelize modifier")
+        return {'CANCELLED'}
+
+    bpy.ops.object.mode_set(mode='OBJECT')
+    mesh = obj.data
+    faceMask = island_faces(mesh, update_islands(mesh))
+    if not faceMask.any():
+        bpy.ops.object.mode_set(mode='EDIT')
+        self.report({'WARNING'}, "No faces selected")
+        return {'CANCELLED'}
+
+    #Solidify scales its thickness by the group weight, so the modifier holds the
+    #thickest island and every island stores its share of it
+    group = obj.vertex_groups.get(THICKNESS_GROUP)
+    if group is None:
+        group = obj.vertex_groups.new(name=THICKNESS_GROUP)
+        weights = np.ones(len(mesh.vertices), dtype=np.float32)
+    else:
+        weights = read_group_weights(obj, group)
+
+    if self.thickness > mod.thickness:
+        weights *= mod.thickness / self.thickness
+        mod.thickness = self.thickness
+
+    #Vertices on a panel edge belong to both islands, PanelSplit gives both sides this weight
+    loopMask = np.repeat(faceMask, bp_data.read_loop_totals(mesh))
+    weights[bp_data.read_loop_vertices(mesh)[loopMask]] = self.thickness / mod.thickness if mod.thickness > 0 else 0.0
+    write_group_weights(group, weights)
+
+    mod.vertex_group = THICKNESS_GROUP
+    mod.thickness_vertex_group = 0.0
+
+    bpy.ops.object.mode_set(mode='EDIT')
+    self.report({'INFO'}, f"Set panel thickness to {self.thickness:.4f}")
+    return {'FINISHED'}
@@ -0,0 +1,134 @@
+import bpy
+import time
+
+from . import bp_freeze
+
+#Chunked batch jobs. Per-object operations on big selections run from a timer in
+#short time slices so Blender keeps drawing, with progress in the status bar and the
+#sidebar. Cancelling stops between two objects, every object is either fully processed
+#or untouched, and one undo step covers the whole job once it ends.
+
+#Selections up to this size still run right away inside the operator
+QUEUE_THRESHOLD = 32
+
+#Seconds of work per slice and pause between slices
+SLICE_SECONDS = 0.05
+SLICE_INTERVAL = 0.01
+
+class BatchJob:
+    def __init__(self, label: str, names, step, settings, setup=None):
+        self.label = label
+        self.names = names
+        self.step = step
+        self.settings = settings
+        self.setup = setup
+        self.index = 0
+        self.failed = 0
+        self.started = False
+        self.cancelled = False
+
+#Jobs waiting to run, the first one is running
+_queue = []
+
+#Label, processed, total and outcome of the last finished job, for the sidebar
+last_job = None
+
+#Set while a macro replays, its steps must finish in order
+inline = False
+
+def should_queue(objects):
+    if inline:
+        return False
+    return len(objects) > QUEUE_THRESHOLD or bool(_queue)
+
+def queue_job(label: str, objects, step, settings, setup=None):
+    #Names only, objects can be deleted while the job waits
+    job = BatchJob(label, [obj.name for obj in objects], step, settings, setup)
+    _queue.append(job)
+    if not bpy.app.timers.is_registered(_run_slice):
+        bpy.app.timers.register(_run_slice, first_interval=0.0)
+    return job
+
+def current_job():
+    return _queue[0] if _queue else None
+
+def cancel():
+    #The running job stops after its current object, waiting ones never start
+    for job in _queue:
+        job.cancelled = True
+
+def on_load_post():
+    #Queued names belong to the file that was closed
+    _queue.clear()
+
+def status_text(job):
+    return f"{job.label}: {job.index}/{len(job.names)} objects  |  Cancel from the Blockout Pro sidebar"
+
+def show_status(text):
+    for window in bpy.context.window_manager.windows:
+        window.workspace.status_text_set(text)
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+def snapshot_object(obj):
+    return {mod.name: (mod.show_viewport, mod.show_render) for mod in obj.modifiers}
+
+def rollback_object(obj, snapshot):
+    #Drop the modifiers a failed step added and restore the visibility it changed,
+    #attributes it created are the empty BP defaults and stay
+    for mod in list(obj.modifiers):
+        if mod.name not in snapshot:
+            obj.modifiers.remove(mod)
+        else:
+            mod.show_viewport, mod.show_render = snapshot[mod.name]
+
+def finish_job(job):
+    global last_job
+    _queue.pop(0)
+
+    #Timer work isn't recorded by itself, one step for the whole job
+    outcome = "cancelled" if job.cancelled else "done"
+    if job.started:
+        bpy.ops.ed.undo_push(message=f"{job.label} ({outcome})" if job.cancelled else job.label)
+
+    last_job = (job.label, job.index, len(job.names), outcome, job.failed)
+    print(f"{job.label}: {outcome}, {job.index}/{len(job.names)} objects, {job.failed} failed")
+
+def _run_slice():
+    job = current_job()
+    if job is None:
+        show_status(None)
+        return None
+
+    start = time.perf_counter()
+    with bp_freeze.window_override():
+        if not job.started and not job.cancelled:
+            #Mode switch and shared setup once per job, not once per object
+            if bpy.context.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
+            if job.setup is not None:
+                job.setup(job.settings)
+            job.started = True
+
+        while job.index < len(job.names) and not job.cancelled:
+            obj = bpy.data.objects.get(job.names[job.index])
+            job.index += 1
+            if obj is not None:
+                snapshot = snapshot_object(obj)
+                try:
+                    job.step(job.settings, obj)
+                except Exception as e:
+                    job.failed += 1
+                    print(f"{job.label} failed on {obj.name}, rolled back: {e}")
+                    rollback_object(obj, snapshot)
+
+            if time.perf_counter() - start > SLICE_SECONDS:
+                break
+
+        if job.cancelled or job.index >= len(job.names):
+            finish_job(job)
+
+    job = current_job()
+    show_status(status_text(job) if job is not None else None)
+    return SLICE_INTERVAL if job is not None else None
@@ -0,0 +1,46 @@
+import numpy as np
+
+from . import bp_data
+
+#Flag region vertex group. Holds the vertices of every face touching a constrained
+#fillet or panel edge, so the stages cleaning up after those flags (BP_Weld) only
+#process that part of the mesh. Rewritten in bulk whenever the flags change.
+
+REGION_GROUP = "BP_FlagRegion"
+REGION_ATTRIBUTES = ("bp_bevel_fillet_constrained", "bp_panel_edge")
+
+def region_mask(mesh):
+    flagged = np.zeros(len(mesh.edges), dtype=np.bool_)
+    for attribute_name in REGION_ATTRIBUTES:
+        values = bp_data.read_attribute(mesh, attribute_name, np.bool_)
+        if values is not None:
+            flagged |= values
+
+    #Grow from the flagged edges to the faces using them and all their corners
+    loopFaces = bp_data.loop_faces(bp_data.read_loop_totals(mesh))
+    faces = np.zeros(len(mesh.polygons), dtype=np.bool_)
+    faces[loopFaces[flagged[bp_data.read_loop_edges(mesh)]]] = True
+
+    mask = np.zeros(len(mesh.vertices), dtype=np.bool_)
+    mask[bp_data.read_loop_vertices(mesh)[faces[loopFaces]]] = True
+    mask[bp_data.read_edge_vertices(mesh)[flagged].reshape(-1)] = True
+    return mask
+
+def update_region(obj):
+    #Object mode only, vertex groups can't be written while in edit mode
+    if obj.type != 'MESH' or obj.mode == 'EDIT':
+        return False
+
+    mask = region_mask(obj.data)
+    group = obj.vertex_groups.get(REGION_GROUP)
+    if group is None:
+        group = obj.vertex_groups.new(name=REGION_GROUP)
+
+    #Cleared and refilled in two bulk calls, a remembered mask would go stale on undo,
+    #topology edits and file loads and leave the weld without its region
+    group.remove(list(range(len(obj.data.vertices))))
+    added = np.flatnonzero(mask)
+    if len(added):
+        group.add(added.tolist(), 1.0, 'REPLACE')
+
+    return True
@@ -0,0 +1,281 @@
+import bpy
+import itertools
+import math
+
+import numpy as np
+
+from . import bp_cost
+from . import bp_data
+from . import bp_functions
+
+#Stack order optimizer. The leading BP stages (SubD, both fillets, panels) can run in
+#any order, but stages that multiply geometry feed every stage after them. Candidate
+#orders are ranked by the cost estimator, the promising ones evaluated and timed, and
+#the fastest one whose output matches the current stack is kept. Stages with nothing
+#to do on the object are folded out of the stack the same way, and folded back in as
+#soon as the object gets flags or levels for them.
+
+#Stage units, modifiers that only work together always move together
+STAGE_UNITS = (
+    ("SubD", (" BP_SubD",)),
+    ("Constrained Fillets", (" BP_Bevel_Constrained", " BP_Weld")),
+    ("Weighted Fillets", (" BP_Bevel_Weighted",)),
+    ("Panels", (" BP_PanelSplit", " BP_Panelize")),
+)
+
+#An order has to be this much faster to replace the current one, timings are noisy
+MIN_GAIN = 0.05
+
+#Modifier names of units folded out of the stack, restored before every optimization
+FOLDED_KEY = "bp_folded_stages"
+
+#Largest corner normal and UV deviation for two orders to count as the same result
+NORMAL_ANGLE = math.radians(0.5)
+UV_TOLERANCE = 1e-4
+
+#Corners are compared at a point a quarter of the way from their vertex to the face
+#center, corners of different faces around one vertex stay apart
+CORNER_INSET = 0.25
+
+def stack_units(obj):
+    #Units in stack order from the first BP modifier on, up to the first one that has
+    #to stay where it is. Returns the units and the index the block starts at
+    mods = obj.modifiers
+    units = {names[0]: (label, names) for label, names in STAGE_UNITS}
+
+    start = next((index for index, mod in enumerate(mods) if "BP" in mod.name), len(mods))
+    index = start
+    found = []
+    while index < len(mods) and mods[index].name in units:
+        label, names = units[mods[index].name]
+        if tuple(mod.name for mod in mods[index:index + len(names)]) != names:
+            break
+        found.append((label, names))
+        index += len(names)
+
+    return found, start
+
+def restore_folded(obj):
+    for name in obj.get(FOLDED_KEY, []):
+        mod = obj.modifiers.get(name)
+        if mod is not None:
+            mod.show_viewport = True
+            mod.show_render = True
+
+    if FOLDED_KEY in obj:
+        del obj[FOLDED_KEY]
+
+def is_redundant(mod, flags):
+    #Stages that leave the mesh as it is: no levels or no flagged edges to work on
+    if mod.type == 'NODES' and mod.name == " BP_SubD":
+        return int(mod.get("Socket_4", 1)) == 0
+    if mod.type == 'NODES' and mod.name == " BP_PanelSplit":
+        return flags.get("bp_panel_edge", 0) == 0
+    if mod.type == 'BEVEL' and mod.limit_method == 'WEIGHT':
+        return flags.get(mod.edge_weight or "bevel_weight_edge", 0) == 0
+    return False
+
+def set_units_visible(obj, units, visible: bool):
+    for _, names in units:
+        for name in names:
+            obj.modifiers[name].show_viewport = visible
+            obj.modifiers[name].show_render = visible
+
+def place_units(units, order, folded):
+    #Folded units keep their slot in the stack, the others fill the rest in order
+    remaining = iter(order)
+    return [unit if unit in folded else next(remaining) for unit in units]
+
+def apply_order(obj, units, start: int):
+    for offset, name in enumerate(name for _, names in units for name in names):
+        obj.modifiers.move(obj.modifiers.find(name), start + offset)
+
+def candidate_orders(obj, units, limit: int):
+    #Every order of the units, cheapest estimate first, current order always included
+    base = bp_cost.read_base(obj)
+    stages = {stage["name"]: stage for stage in bp_cost.read_stack(obj)}
+    moving = set(name for _, names in units for name in names)
+    rest = [stage for name, stage in stages.items() if name not in moving]
+
+    ranked = []
+    for order in itertools.permutations(units):
+        ordered = [stages[name] for _, names in order for name in names if name in stages]
+        ranked.append((bp_cost.triangles(bp_cost.estimate(base, ordered + rest)), list(order)))
+
+    ranked.sort(key=lambda entry: entry[0])
+    orders = [order for _, order in ranked[:limit]]
+    if list(units) not in orders:
+        orders.append(list(units))
+    return orders
+
+# ---------------- Evaluation -----------------
+def evaluated_shape(context, obj):
+    depsgraph = context.evaluated_depsgraph_get()
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        positions = bp_data.read_positions(mesh).astype(np.float64)
+        centers = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("center", centers)
+        centers = centers.reshape(-1, 3).astype(np.float64)
+
+        loopVerts = positions[bp_data.read_loop_vertices(mesh)]
+        loopCenters = centers[bp_data.loop_faces(bp_data.read_loop_totals(mesh))]
+        normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", normals)
+
+        uvs = {}
+        for layer in mesh.uv_layers:
+            values = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+            layer.data.foreach_get("uv", values)
+            uvs[layer.name] = values.reshape(-1, 2)
+
+        return {
+            "counts": bp_data.mesh_counts(mesh),
+            "positions": positions,
+            "centers": centers,
+            "corners": loopVerts + (loopCenters - loopVerts) * CORNER_INSET,
+            "normals": normals.reshape(-1, 3),
+            "uvs": uvs,
+        }
+    finally:
+        evaluated.to_mesh_clear()
+
+def matches_both_ways(source, target, tolerance: float):
+    return (bp_data.match_points(source, target, tolerance) >= 0).all() and (bp_data.match_points(target, source, tolerance) >= 0).all()
+
+def corners_match(reference, shape, tolerance: float):
+    #Corner normals and UVs of every corner against its counterpart, these can change
+    #with the order (sharp edges, seams, Auto-UV) while all positions stay put
+    matches = bp_data.match_points(shape["corners"], reference["corners"], tolerance)
+    if (matches < 0).any() or (bp_data.match_points(reference["corners"], shape["corners"], tolerance) < 0).any():
+        return False
+
+    dots = np.einsum("ij,ij->i", reference["normals"], shape["normals"][matches])
+    if len(dots) and dots.min() < math.cos(NORMAL_ANGLE):
+        return False
+
+    if reference["uvs"].keys() != shape["uvs"].keys():
+        return False
+    return all(np.abs(uvs - shape["uvs"][name][matches]).max(initial=0.0) <= UV_TOLERANCE for name, uvs in reference["uvs"].items())
+
+def equivalent(reference, shape, tolerance: float):
+    #Element order changes with the stage order, so compare where vertices, faces and
+    #corners end up instead of the topology fingerprint
+    if reference["counts"] != shape["counts"]:
+        return False
+    if not matches_both_ways(reference["positions"], shape["positions"], tolerance):
+        return False
+    if not matches_both_ways(reference["centers"], shape["centers"], tolerance):
+        return False
+    return corners_match(reference, shape, tolerance)
+
+def measure(context, obj, repeats: int):
+    seconds = bp_cost.time_evaluation(context, obj, repeats)
+    return seconds, evaluated_shape(context, obj)
+
+def optimize_object(self, context, obj):
+    #Returns evaluation seconds before and after and the number of folded units
+    restore_folded(obj)
+    units, start = stack_units(obj)
+    originalSeconds, reference = measure(context, obj, self.repeats)
+    if not units:
+        return originalSeconds, originalSeconds, 0
+
+    bestSeconds = originalSeconds
+    allUnits = units
+    folded = []
+
+    if self.foldStages:
+        flags = bp_data.flagged_edge_counts(obj.data)
+        redundant = [unit for unit in units if obj.modifiers[unit[1][0]].show_viewport and is_redundant(obj.modifiers[unit[1][0]], flags)]
+        if redundant:
+            set_units_visible(obj, redundant, False)
+            seconds, shape = measure(context, obj, self.repeats)
+            if equivalent(reference, shape, self.tolerance):
+                folded = redundant
+                bestSeconds = seconds
+                units = [unit for unit in units if unit not in redundant]
+            else:
+                set_units_visible(obj, redundant, True)
+
+    bestOrder = units
+    if len(units) > 1:
+        for order in candidate_orders(obj, units, self.maxCandidates):
+            if order == units:
+                continue
+
+            apply_order(obj, place_units(allUnits, order, folded), start)
+            seconds, shape = measure(context, obj, self.repeats)
+            if seconds < bestSeconds * (1.0 - MIN_GAIN) and equivalent(reference, shape, self.tolerance):
+                bestSeconds = seconds
+                bestOrder = order
+
+        apply_order(obj, place_units(allUnits, bestOrder, folded), start)
+
+    if folded:
+        obj[FOLDED_KEY] = [name for _, names in folded for name in names]
+
+    return originalSeconds, bestSeconds, len(folded)
+
+# ---------------- Automatic unfolding -----------------
+_pending = set()
+
+def needs_unfold(obj):
+    #Any folded stage that would change the mesh again
+    flags = bp_data.flagged_edge_counts(obj.data)
+    heads = set(names[0] for _, names in STAGE_UNITS)
+    for name in obj.get(FOLDED_KEY, []):
+        mod = obj.modifiers.get(name)
+        if mod is not None and name in heads and not is_redundant(mod, flags):
+            return True
+    return False
+
+def _unfold_pending():
+    names = list(_pending)
+    _pending.clear()
+
+    for name in names:
+        obj = bpy.data.objects.get(name)
+        if obj is None or FOLDED_KEY not in obj or obj.mode == 'EDIT':
+            continue
+        if needs_unfold(obj):
+            print("Flags or levels changed on " + name + ", unfolding BP stages")
+            restore_folded(obj)
+
+    return None
+
+def on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        data = update.id.original
+        if not isinstance(data, bpy.types.Object) or not update.is_updated_geometry:
+            continue
+        if FOLDED_KEY not in data or data.mode == 'EDIT':
+            continue
+
+        #Deferred to a timer, modifiers can't be changed from inside the handler
+        if not _pending:
+            bpy.app.timers.register(_unfold_pending, first_interval=0.0)
+        _pending.add(data.name)
+
+# ---------------- Operators -----------------
+def optimize_stack(self, context):
+    objects = [obj for obj in bp_functions.getSelectedObjects(self) if bp_cost.has_bp_stack(obj)]
+    if not objects:
+        self.report({'WARNING'}, "No selected objects with BP modifiers")
+        return {'CANCELLED'}
+
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    before = 0.0
+    after = 0.0
+    folded = 0
+    for obj in objects:
+        objBefore, objAfter, objFolded = optimize_object(self, context, obj)
+        before += objBefore
+        after += objAfter
+        folded += objFolded
+
+    self.report({'INFO'}, f"Optimized {len(objects)} objects, evaluation {before * 1000:.1f} ms -> {after * 1000:.1f} ms, folded {folded} idle stages")
+    return {'FINISHED'}
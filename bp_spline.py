@@ -0,0 +1,222 @@
+import bpy
+import numpy as np
+
+from . import bp_chains
+from . import bp_data
+
+#Spline fillet stage. Chains of flagged edges are traced once into a curve object,
+#and a node group fillets and sweeps that curve instead of converting the mesh to
+#curves on every evaluation. The traced paths are cached per object: flag or
+#topology changes re-trace them, plain vertex moves only refresh the point positions.
+
+NODEGROUP_NAME = "BP_SplineFilletCurves"
+MODIFIER_NAME = " BP_SplineFilletCurves"
+CURVE_SUFFIX = "_bp_spline"
+
+#Object key holding the flagged edge attribute the curves follow
+SPLINE_KEY = "bp_spline_fillet"
+
+#Object name -> fingerprint, traced paths and the positions last written
+_paths = {}
+
+# ---------------- Tracing -----------------
+def walk_chain(chainEdges):
+    #Order the vertices of one chain, ends have one neighbour inside the chain
+    neighbours = {}
+    for a, b in chainEdges.tolist():
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+
+    ends = [vert for vert, linked in neighbours.items() if len(linked) == 1]
+    cyclic = not ends
+    start = ends[0] if ends else int(chainEdges[0, 0])
+
+    path = [start]
+    previous = None
+    current = start
+    while True:
+        nextVerts = [vert for vert in neighbours[current] if vert != previous]
+        if not nextVerts or nextVerts[0] == start:
+            break
+        previous, current = current, nextVerts[0]
+        path.append(current)
+
+    return path, cyclic
+
+def trace_paths(mesh, attribute_name: str):
+    index = bp_chains.build_index(mesh, attribute_name)
+    edgeVerts = bp_data.read_edge_vertices(mesh)[index["edges"]]
+
+    #Group the flagged edges by chain once instead of masking per chain
+    order = np.argsort(index["chains"], kind='stable')
+    bounds = np.searchsorted(index["chains"][order], np.arange(index["count"] + 1))
+
+    return [walk_chain(edgeVerts[order[bounds[chain]:bounds[chain + 1]]]) for chain in range(index["count"])]
+
+def curve_fingerprint(mesh, attribute_name: str):
+    return bp_data.topology_fingerprint(mesh, (attribute_name,))
+
+# ---------------- Curve object -----------------
+def curve_object(obj):
+    name = obj.name + CURVE_SUFFIX
+    curveObj = bpy.data.objects.get(name)
+    if curveObj is None:
+        curve = bpy.data.curves.get(name) or bpy.data.curves.new(name, 'CURVE')
+        curve.dimensions = '3D'
+        curveObj = bpy.data.objects.new(name, curve)
+    return curveObj
+
+def write_points(curve, paths, positions):
+    for spline, (path, _) in zip(curve.splines, paths):
+        points = np.ones((len(path), 4), dtype=np.float32)
+        points[:, :3] = positions[path]
+        spline.points.foreach_set("co", points.reshape(-1))
+    curve.update_tag()
+
+def rebuild_curve(curve, paths, positions):
+    curve.splines.clear()
+    for path, cyclic in paths:
+        spline = curve.splines.new('POLY')
+        spline.points.add(len(path) - 1)
+        spline.use_cyclic_u = cyclic
+    write_points(curve, paths, positions)
+
+def update_curves(obj):
+    #Edit mode data isn't flushed yet, the curves follow once it is
+    attribute_name = obj.get(SPLINE_KEY)
+    if attribute_name is None or obj.mode == 'EDIT':
+        return False
+
+    mesh = obj.data
+    curve = curve_object(obj).data
+    positions = bp_data.read_positions(mesh)
+    fingerprint = curve_fingerprint(mesh, attribute_name)
+    cached = _paths.get(obj.name)
+
+    if cached is None or cached["fingerprint"] != fingerprint or len(curve.splines) != len(cached["paths"]):
+        paths = trace_paths(mesh, attribute_name)
+        rebuild_curve(curve, paths, positions)
+    elif not np.array_equal(cached["positions"], positions):
+        paths = cached["paths"]
+        write_points(curve, paths, positions)
+    else:
+        return False
+
+    _paths[obj.name] = {
+        "fingerprint": fingerprint,
+        "paths": paths,
+        "positions": positions,
+    }
+    return True
+
+# ---------------- Node group -----------------
+def set_poly_mode(fillet):
+    #Poly is the mode that takes a segment count, the node property became a menu input
+    #in newer builds. Bezier would silently ignore the Segments setting, so never fall back
+    if hasattr(fillet, "mode"):
+        fillet.mode = 'POLY'
+        return
+
+    modeInput = fillet.inputs.get("Mode")
+    if modeInput is None:
+        raise RuntimeError("Fillet Curve node has no Poly mode, spline fillet segments can't be set")
+    modeInput.default_value = 'Poly'
+
+def ensure_nodegroup():
+    group = bpy.data.node_groups.get(NODEGROUP_NAME)
+    if group is not None:
+        return group
+
+    group = bpy.data.node_groups.new(NODEGROUP_NAME, 'GeometryNodeTree')
+    interface = group.interface
+    interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    interface.new_socket("Curves", in_out='INPUT', socket_type='NodeSocketObject')
+    interface.new_socket("Radius", in_out='INPUT', socket_type='NodeSocketFloat').default_value = 0.01
+    interface.new_socket("Fillet Radius", in_out='INPUT', socket_type='NodeSocketFloat').default_value = 0.05
+    interface.new_socket("Fillet Count", in_out='INPUT', socket_type='NodeSocketInt').default_value = 4
+    interface.new_socket("Resolution", in_out='INPUT', socket_type='NodeSocketInt').default_value = 8
+    interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
+    nodes = group.nodes
+    links = group.links
+    groupInput = nodes.new('NodeGroupInput')
+    groupOutput = nodes.new('NodeGroupOutput')
+
+    #Curves are stored in the modified object's local space
+    objectInfo = nodes.new('GeometryNodeObjectInfo')
+    objectInfo.transform_space = 'ORIGINAL'
+
+    fillet = nodes.new('GeometryNodeFilletCurve')
+    try:
+        set_poly_mode(fillet)
+    except RuntimeError:
+        #No half-built group left behind for the next call to pick up
+        bpy.data.node_groups.remove(group)
+        raise
+    circle = nodes.new('GeometryNodeCurvePrimitiveCircle')
+    curveToMesh = nodes.new('GeometryNodeCurveToMesh')
+    join = nodes.new('GeometryNodeJoinGeometry')
+
+    links.new(groupInput.outputs["Curves"], objectInfo.inputs["Object"])
+    links.new(objectInfo.outputs["Geometry"], fillet.inputs["Curve"])
+    links.new(groupInput.outputs["Fillet Radius"], fillet.inputs["Radius"])
+    links.new(groupInput.outputs["Fillet Count"], fillet.inputs["Count"])
+    links.new(groupInput.outputs["Radius"], circle.inputs["Radius"])
+    links.new(groupInput.outputs["Resolution"], circle.inputs["Resolution"])
+    links.new(fillet.outputs["Curve"], curveToMesh.inputs["Curve"])
+    links.new(circle.outputs["Curve"], curveToMesh.inputs["Profile Curve"])
+    links.new(groupInput.outputs["Geometry"], join.inputs["Geometry"])
+    links.new(curveToMesh.outputs["Mesh"], join.inputs["Geometry"])
+    links.new(join.outputs["Geometry"], groupOutput.inputs["Geometry"])
+
+    for i, node in enumerate((groupInput, objectInfo, fillet, curveToMesh, join, groupOutput)):
+        node.location = (i * 200, 0)
+    circle.location = (400, -250)
+
+    return group
+
+def set_group_input(mod, name: str, value):
+    #Modifier inputs are keyed by socket identifier, not by name
+    for item in mod.node_group.interface.items_tree:
+        if item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.name == name:
+            mod[item.identifier] = value
+            return
+
+def configure_modifier(obj, mod, attribute_name: str, radius: float, segments: int):
+    obj[SPLINE_KEY] = attribute_name
+    update_curves(obj)
+
+    set_group_input(mod, "Curves", curve_object(obj))
+    set_group_input(mod, "Radius", radius)
+    #Corners round off over a few tube radii
+    set_group_input(mod, "Fillet Radius", radius * 5.0)
+    set_group_input(mod, "Fillet Count", segments)
+    obj.update_tag()
+
+# ---------------- Automatic updates -----------------
+_pending = set()
+
+def _update_pending():
+    names = list(_pending)
+    _pending.clear()
+
+    for name in names:
+        obj = bpy.data.objects.get(name)
+        if obj is not None and obj.modifiers.get(MODIFIER_NAME) is not None:
+            update_curves(obj)
+
+    return None
+
+def on_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        data = update.id.original
+        if not isinstance(data, bpy.types.Object) or not update.is_updated_geometry:
+            continue
+        if SPLINE_KEY not in data or data.mode == 'EDIT':
+            continue
+
+        #Deferred to a timer, curve data can't be written from inside the handler.
+        #Writing the curve updates the object again, the position compare ends that loop
+        if not _pending:
+            bpy.app.timers.register(_update_pending, first_interval=0.0)
+        _pending.add(data.name)
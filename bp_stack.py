@@ -0,0 +1,109 @@
+import time
+
+from . import bp_inventory
+from . import bp_panels
+
+#Scene stack settings. Editing a setting pushes it to the matching modifier of every
+#linked BP object in one pass, skipping modifiers that already hold the value.
+#Objects marked local keep their own settings.
+
+LOCAL_KEY = "bp_stack_local"
+
+#Scene setting -> (modifier, modifier attribute or node socket) it drives
+SETTING_TARGETS = {
+    "edge_chamfer_size": [(" BP_EdgeChamfer", "width")],
+    "edge_chamfer_segments": [(" BP_EdgeChamfer", "segments")],
+    "weighted_fillet_size": [(" BP_Bevel_Weighted", "width")],
+    "weighted_fillet_segments": [(" BP_Bevel_Weighted", "segments")],
+    "constrained_fillet_segments": [(" BP_Bevel_Constrained", "segments")],
+    "panel_thickness": [(" BP_Panelize", "thickness")],
+    "subd_levels": [(" BP_SubD", "Socket_4")],
+}
+
+#Scene setting -> OBJECT_OT_add_modifiers property it presets
+OPERATOR_SETTINGS = {
+    "edge_chamfer_size": "edgeChamferSize",
+    "edge_chamfer_segments": "edgeChamferSegments",
+    "weighted_fillet_size": "weightedFilletSize",
+    "weighted_fillet_segments": "weightedFilletSegments",
+    "constrained_fillet_segments": "constrainedFilletSegments",
+    "panel_thickness": "panelThickness",
+    "subd_levels": "subdLevels",
+}
+
+#Targets the per-island panel thickness owns, the modifier holds the thickest island
+#and the vertex group weights are relative to it
+ISLAND_TARGETS = {(" BP_Panelize", "thickness")}
+
+#Objects touched and milliseconds spent by the last propagation, for the sidebar
+last_propagation = (0, 0.0)
+
+def is_linked(obj):
+    return not obj.get(LOCAL_KEY, False)
+
+def linked_objects(scene):
+    #Straight from the inventory, only objects that have a BP stack
+    bp_inventory.ensure(scene)
+    return [obj for obj, entry in bp_inventory.entries(scene) if entry["stages"] and is_linked(obj)]
+
+def write_value(mod, attribute: str, value):
+    #Node group sockets are ID properties, everything else a plain RNA property
+    if mod.type == 'NODES':
+        if mod.get(attribute) == value:
+            return False
+        mod[attribute] = value
+        return True
+
+    current = getattr(mod, attribute)
+    if isinstance(current, float) and abs(current - value) < 1e-7 or current == value:
+        return False
+    setattr(mod, attribute, value)
+    return True
+
+def propagate(scene, settings):
+    global last_propagation
+    start = time.perf_counter()
+
+    props = scene.bp_stack_props
+    targets = [(name, attribute, getattr(props, setting)) for setting in settings for name, attribute in SETTING_TARGETS[setting]]
+
+    changed = 0
+    for obj in linked_objects(scene):
+        objChanged = False
+        hasIslands = obj.vertex_groups.get(bp_panels.THICKNESS_GROUP) is not None
+        for name, attribute, value in targets:
+            if hasIslands and (name, attribute) in ISLAND_TARGETS:
+                continue
+            mod = obj.modifiers.get(name)
+            if mod is not None and write_value(mod, attribute, value):
+                objChanged = True
+
+        if objChanged:
+            #Socket values set as ID properties don't tag the object by themselves
+            obj.update_tag()
+            changed += 1
+
+    last_propagation = (changed, (time.perf_counter() - start) * 1000.0)
+    return changed
+
+def preset_operator(operator, scene):
+    props = scene.bp_stack_props
+    for setting, name in OPERATOR_SETTINGS.items():
+        setattr(operator, name, getattr(props, setting))
+
+# ---------------- Operators -----------------
+def link_objects(self, context):
+    objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+    for obj in objects:
+        if self.link:
+            if LOCAL_KEY in obj:
+                del obj[LOCAL_KEY]
+        else:
+            obj[LOCAL_KEY] = True
+
+    if self.link:
+        propagate(context.scene, SETTING_TARGETS)
+
+    action = "Linked" if self.link else "Unlinked"
+    self.report({'INFO'}, f"{action} {len(objects)} objects")
+    return {'FINISHED'}
@@ -0,0 +1,199 @@
+import bpy
+import math
+import numpy as np
+
+from . import bp_data
+from . import bp_panels
+from . import bp_region
+
+#Spatial flag transfer. After a topology change the edge indices no longer line up,
+#so flags are carried over by position instead: each target edge takes the values of
+#the source edge with the nearest midpoint within the tolerance, running the same way.
+#Matching is done in bulk on grid cells rather than one tree query per edge.
+#Mirroring is the same match against the mesh's own edges reflected across a plane.
+
+AXES = {'X': 0, 'Y': 1, 'Z': 2}
+
+#Name setup_modifier gives the SmartMirror modifier
+SMART_MIRROR = " BP_SmartMirror"
+
+def source_layers(mesh):
+    layers = {}
+    for attribute_name, dtype in bp_data.BP_EDGE_ATTRIBUTES.items():
+        values = bp_data.read_attribute(mesh, attribute_name, dtype)
+        if values is not None:
+            layers[attribute_name] = values
+    return layers
+
+def match_edges(source, target, tolerance: float, angle: float, sourceMatrix=None, targetMatrix=None):
+    sourcePoints, sourceDirs = bp_data.edge_midpoints(source, sourceMatrix)
+    targetPoints, targetDirs = bp_data.edge_midpoints(target, targetMatrix)
+    return bp_data.match_points(sourcePoints, targetPoints, tolerance, sourceDirs, targetDirs, math.cos(angle))
+
+def update_linked_layers(mesh, edges, attribute_names):
+    #Native layers on the given edges set from the flags, cleared where no flag is left.
+    #freestyle_edge is shared by both fillets, so it is rebuilt from both
+    linkedNames = set(bp_data.LINKED_ATTRIBUTES[name] for name in attribute_names if name in bp_data.LINKED_ATTRIBUTES)
+    for linkedName in sorted(linkedNames):
+        flagged = np.zeros(len(edges), dtype=np.bool_)
+        for attribute_name, target in bp_data.LINKED_ATTRIBUTES.items():
+            values = bp_data.read_attribute(mesh, attribute_name, bp_data.BP_EDGE_ATTRIBUTES[attribute_name]) if target == linkedName else None
+            if values is not None:
+                flagged |= values[edges] > 0
+
+        bp_data.ensure_attribute(mesh, linkedName, 'BOOLEAN')
+        linked = bp_data.read_attribute(mesh, linkedName, np.bool_)
+        linked[edges] = flagged
+        bp_data.write_attribute(mesh, linkedName, linked)
+
+def transfer_layers(mesh, layers, matches):
+    #Matched edges take the source values, unmatched ones keep what they had
+    matched = matches >= 0
+    sources = matches[matched]
+    for attribute_name, values in layers.items():
+        dataType = bp_data.BP_EDGE_ATTRIBUTE_TYPES[attribute_name]
+        bp_data.ensure_attribute(mesh, attribute_name, dataType)
+        current = bp_data.read_attribute(mesh, attribute_name, values.dtype)
+        current[matched] = values[sources]
+        bp_data.write_attribute(mesh, attribute_name, current)
+
+    update_linked_layers(mesh, np.flatnonzero(matched), layers)
+    mesh.update()
+
+# ---------------- Mirroring -----------------
+def smart_mirror_modifier(obj):
+    mod = obj.modifiers.get(SMART_MIRROR)
+    if mod is not None and mod.type == 'MIRROR':
+        return mod
+    #Renamed or copied by hand
+    return next((mod for mod in obj.modifiers if mod.type == 'MIRROR' and "SmartMirror" in mod.name), None)
+
+def mirror_plane(obj, plane: str):
+    #Object space -> plane space, the SmartMirror helper or the object's own axes
+    if plane == 'HELPER':
+        mod = smart_mirror_modifier(obj)
+        helper = mod.mirror_object if mod is not None else None
+        if helper is None:
+            return None
+        return np.array(helper.matrix_world.inverted() @ obj.matrix_world, dtype=np.float64)
+    return np.identity(4)
+
+def mirror_matrix(toPlane, axis: int):
+    flip = np.identity(4)
+    flip[axis, axis] = -1.0
+    return np.linalg.inv(toPlane) @ flip @ toPlane
+
+def receiving_edges(sides, direction: str):
+    #Edges taking flags from their mirror, the source side is left as it is
+    if direction == 'POSITIVE':
+        return sides < 0
+    if direction == 'NEGATIVE':
+        return sides > 0
+    return np.ones(len(sides), dtype=np.bool_)
+
+def mirror_layers(mesh, matches, receiving, direction: str):
+    targets = np.flatnonzero(receiving & (matches >= 0))
+    sources = matches[targets]
+
+    layers = source_layers(mesh)
+    for attribute_name, values in layers.items():
+        mirrored = values.copy()
+        #Both ways keeps whichever side is flagged
+        if direction == 'BOTH':
+            mirrored[targets] = np.maximum(values[targets], values[sources])
+        else:
+            mirrored[targets] = values[sources]
+        if np.array_equal(mirrored, values):
+            continue
+        bp_data.write_attribute(mesh, attribute_name, mirrored)
+
+    update_linked_layers(mesh, targets, layers)
+    mesh.update()
+
+def mirror_object(obj, axis: int, plane: str, direction: str, tolerance: float, angle: float):
+    toPlane = mirror_plane(obj, plane)
+    if toPlane is None:
+        return None
+
+    mesh = obj.data
+    points, directions = bp_data.edge_midpoints(mesh)
+    mirrored, mirroredDirections = bp_data.edge_midpoints(mesh, mirror_matrix(toPlane, axis))
+    matches = bp_data.match_points(mirrored, points, tolerance, mirroredDirections, directions, math.cos(angle))
+
+    #Side of the plane per edge, edges on the plane map onto themselves
+    sides = (points @ toPlane[:3, :3].T + toPlane[:3, 3])[:, axis]
+    sides[np.abs(sides) <= tolerance] = 0.0
+
+    receiving = receiving_edges(sides, direction)
+    mirror_layers(mesh, matches, receiving, direction)
+    return int(np.count_nonzero(receiving & (matches >= 0))), int(np.count_nonzero(receiving & (matches < 0)))
+
+# ---------------- Operators -----------------
+def transfer_flags(self, context):
+    source = context.active_object
+    if source is None or source.type != 'MESH':
+        self.report({'WARNING'}, "Active object must be a mesh")
+        return {'CANCELLED'}
+
+    targets = [obj for obj in context.selected_objects if obj.type == 'MESH' and obj.data != source.data]
+    if not targets:
+        self.report({'WARNING'}, "Select target meshes and make the source active")
+        return {'CANCELLED'}
+
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    layers = source_layers(source.data)
+    if not layers:
+        self.report({'WARNING'}, "Source has no BP flags")
+        return {'CANCELLED'}
+
+    sourceMatrix = source.matrix_world if self.worldSpace else None
+    matched = 0
+    unmatched = 0
+    for obj in targets:
+        matches = match_edges(source.data, obj.data, self.tolerance, self.angleTolerance, sourceMatrix, obj.matrix_world if self.worldSpace else None)
+        transfer_layers(obj.data, layers, matches)
+
+        bp_panels.update_islands(obj.data)
+        bp_region.update_region(obj)
+
+        count = int(np.count_nonzero(matches >= 0))
+        matched += count
+        unmatched += len(matches) - count
+
+    self.report({'INFO'}, f"Transferred flags to {len(targets)} meshes, {matched} edges matched, {unmatched} unmatched")
+    return {'FINISHED'}
+
+def mirror_flags(self, context):
+    objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+    if not objects:
+        self.report({'WARNING'}, "No meshes selected")
+        return {'CANCELLED'}
+
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    matched = 0
+    unmatched = 0
+    skipped = 0
+    for obj in objects:
+        counts = mirror_object(obj, AXES[self.axis], self.plane, self.direction, self.tolerance, self.angleTolerance)
+        if counts is None:
+            skipped += 1
+            continue
+
+        bp_panels.update_islands(obj.data)
+        bp_region.update_region(obj)
+        matched += counts[0]
+        unmatched += counts[1]
+
+    if skipped == len(objects):
+        self.report({'WARNING'}, "No selected object has a SmartMirror modifier with a mirror object")
+        return {'CANCELLED'}
+
+    message = f"Mirrored flags across {self.axis}, {matched} edges matched, {unmatched} unmatched"
+    if skipped:
+        message += f", {skipped} objects without a SmartMirror helper"
+    self.report({'INFO'}, message)
+    return {'FINISHED'}